@@ -0,0 +1,72 @@
+# 묶음 업로드 경로(save_detection_batch_results) 처리량: 프레임마다 저장 vs 한 묶음 저장 (SQLite 임시 DB)
+# python -m benchmarks.batch_ingest
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from tests.sqlite_compat import StatementCounter, create_session_factory, create_schema, create_test_engine, seed
+
+from service.detections_service import DetectionService
+from service.frame_dedup import recent_frames
+
+FRAMES = 2000
+BATCH_SIZES = (1, 50, 500)
+OBJECTS_PER_FRAME = 5
+TRASHCANS = 20
+
+
+def make_items(rnd: random.Random) -> list[dict]:
+    now = datetime.now()
+    return [
+        {
+            "data": {
+                "camera_id": index % TRASHCANS + 1,
+                "frame_id": f"frame-{index}",
+                "detections": [
+                    {
+                        "class_id": rnd.randint(0, 3),
+                        "bbox": [rnd.random() * 640, rnd.random() * 480, rnd.random() * 640, rnd.random() * 480],
+                        "score": rnd.random(),
+                    }
+                    for _ in range(OBJECTS_PER_FRAME)
+                ],
+            },
+            "filename": f"frame-{index}.jpg",
+            "saved_path": None,
+            "received_at": now,
+        }
+        for index in range(FRAMES)
+    ]
+
+
+async def measure(batch_size: int) -> tuple[float, float]:
+    engine = create_test_engine()
+    await create_schema(engine)
+    session_factory = create_session_factory(engine)
+    await seed(session_factory, range(1, TRASHCANS + 1))
+    counter = StatementCounter(engine)
+    recent_frames._keys.clear()
+    service = DetectionService()
+    items = make_items(random.Random(0))
+    async with session_factory() as db:
+        started = time.perf_counter()
+        for start in range(0, FRAMES, batch_size):
+            results = await service.save_detection_batch_results(items[start:start + batch_size], db)
+            assert all(result["status"] == "saved" for result in results)
+        elapsed = time.perf_counter() - started
+    statements = counter.count
+    await engine.dispose()
+    return FRAMES / elapsed, statements / FRAMES
+
+
+async def main() -> None:
+    print(f"{FRAMES} frames, {OBJECTS_PER_FRAME} objects/frame, {TRASHCANS} trashcans")
+    print(f"{'batch':>6} {'frames/s':>9} {'stmts/frame':>12}")
+    for batch_size in BATCH_SIZES:
+        frames_per_second, statements_per_frame = await measure(batch_size)
+        print(f"{batch_size:>6} {frames_per_second:>9.0f} {statements_per_frame:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
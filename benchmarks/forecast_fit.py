@@ -0,0 +1,134 @@
+# 적재 속도 회귀: numpy 일괄 계산(fit_fill_rates) vs 쓰레기통별 파이썬 루프 1회 소요 시간
+# + DB 재적재(reload: 구간별 GROUP BY 조회 + 행렬 구성) 1회 소요 시간 (SQLite 임시 DB)
+# python -m benchmarks.forecast_fit
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import insert
+
+from tests.sqlite_compat import create_session_factory, create_schema, create_test_engine
+
+from db.entity import Detection, Trashcan
+from service.fill_forecast_service import FillForecaster, fit_fill_rates
+
+TRASHCANS = (100, 1_000, 10_000)
+REPEAT = 3
+# 재적재 측정용 쓰레기통당 창 안의 탐지 수
+DETECTIONS_PER_TRASHCAN = 50
+
+
+def fit_loop(counts: np.ndarray) -> list[float]:
+    # 벡터화 전 방식: 쓰레기통마다 누적 개수를 만들고 최소제곱 기울기를 직접 계산
+    rows = counts.tolist()
+    buckets = len(rows[0]) if rows else 0
+    x_mean = (buckets - 1) / 2
+    x_var = sum((x - x_mean) ** 2 for x in range(buckets))
+    slopes = []
+    for row in rows:
+        cumulative = []
+        total = 0.0
+        for value in row:
+            total += value
+            cumulative.append(total)
+        y_mean = sum(cumulative) / buckets
+        covariance = sum((x - x_mean) * (y - y_mean) for x, y in enumerate(cumulative))
+        slopes.append(max(covariance / x_var, 0.0))
+    return slopes
+
+
+def timed(call) -> tuple[float, object]:
+    best = None
+    result = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+async def populate(session_factory, trashcans: int, window: timedelta) -> int:
+    rng = np.random.default_rng(trashcans)
+    now = datetime.now()
+    count = trashcans * DETECTIONS_PER_TRASHCAN
+    offsets = rng.uniform(0, window.total_seconds(), size=count).tolist()
+    object_counts = rng.integers(0, 6, size=count).tolist()
+    async with session_factory() as db:
+        await db.execute(
+            insert(Trashcan),
+            [
+                {
+                    "trashcan_id": trashcan_id,
+                    "trashcan_name": f"trashcan-{trashcan_id}",
+                    "trashcan_capacity": 100,
+                    "current_volume": 0,
+                    "trashcan_city": "Seoul",
+                    "address_detail": "",
+                    "trashcan_latitude": 37.5,
+                    "trashcan_longitude": 127.0,
+                    "is_online": True,
+                    "is_deleted": False,
+                    "last_connected_at": now,
+                }
+                for trashcan_id in range(1, trashcans + 1)
+            ],
+        )
+        await db.execute(
+            insert(Detection),
+            [
+                {
+                    "trashcan_id": index % trashcans + 1,
+                    "detected_at": now - timedelta(seconds=offset),
+                    "object_count": object_count,
+                }
+                for index, (offset, object_count) in enumerate(zip(offsets, object_counts))
+            ],
+        )
+        await db.commit()
+    return int(sum(object_counts))
+
+
+async def reload_timings() -> None:
+    forecaster = FillForecaster()
+    window = forecaster.bucket * (forecaster.buckets - 1)
+    print(f"reload: {DETECTIONS_PER_TRASHCAN} detections per trashcan in window, best of {REPEAT}")
+    print(f"{'trashcans':>10} {'detections':>11} {'reload ms':>10} {'fit ms':>8}")
+    for trashcans in TRASHCANS:
+        engine = create_test_engine()
+        await create_schema(engine)
+        session_factory = create_session_factory(engine)
+        objects = await populate(session_factory, trashcans, window)
+        best = None
+        async with session_factory() as db:
+            for _ in range(REPEAT):
+                forecaster = FillForecaster()
+                await forecaster.reload(db)
+                best = forecaster.last_reload_ms if best is None else min(best, forecaster.last_reload_ms)
+        assert forecaster._counts.shape == (trashcans, forecaster.buckets)
+        assert forecaster._counts.sum() == objects
+        forecaster.rates_per_hour()
+        print(
+            f"{trashcans:>10} {trashcans * DETECTIONS_PER_TRASHCAN:>11} {best:>10.2f} {forecaster.last_fit_ms:>8.2f}"
+        )
+        await engine.dispose()
+
+
+def main() -> None:
+    buckets = FillForecaster().buckets
+    rng = np.random.default_rng(0)
+    print(f"{buckets} buckets per trashcan, best of {REPEAT}")
+    print(f"{'trashcans':>10} {'loop ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for trashcans in TRASHCANS:
+        counts = rng.poisson(rng.uniform(0, 3, size=(trashcans, 1)), size=(trashcans, buckets)).astype(np.float64)
+        loop_ms, expected = timed(lambda: fit_loop(counts))
+        numpy_ms, slopes = timed(lambda: fit_fill_rates(counts))
+        assert np.allclose(slopes, expected)
+        print(f"{trashcans:>10} {loop_ms:>10.2f} {numpy_ms:>10.2f} {loop_ms / numpy_ms:>7.1f}x")
+    print()
+    asyncio.run(reload_timings())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# 동시 업로드 시 이미지 저장 처리량과 이벤트 루프 지연 (LocalImageStorage vs 이벤트 루프에서 통째로 쓰기)
+# python -m benchmarks.image_storage
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import UploadFile
+
+from service.image_storage import LocalImageStorage
+
+IMAGE_BYTES = 512 * 1024
+UPLOADS = 256
+CONCURRENCY = (1, 8, 32)
+
+
+def make_upload(index: int) -> UploadFile:
+    # FastAPI와 같이 SpooledTemporaryFile로 받은 업로드 (프레임마다 내용이 달라 중복 제거되지 않음)
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(index.to_bytes(8, "big") + os.urandom(IMAGE_BYTES - 8))
+    spooled.seek(0)
+    return UploadFile(file=spooled, filename=f"frame-{index}.jpg")
+
+
+async def save_in_loop(root: Path, file: UploadFile, trashcan_id: int) -> None:
+    # 비교용: 전체를 메모리로 읽은 뒤 이벤트 루프 스레드에서 바로 기록
+    data = await file.read()
+    target = root / str(trashcan_id) / (file.filename or "image.jpg")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(data)
+
+
+async def measure_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - started - 0.001)
+
+
+async def run(name: str, save, concurrency: int) -> None:
+    uploads = [make_upload(index) for index in range(UPLOADS)]
+    semaphore = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    lags: list[float] = []
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+
+    async def one(index: int, upload: UploadFile) -> None:
+        async with semaphore:
+            await save(upload, index % 16)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index, upload) for index, upload in enumerate(uploads)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    for upload in uploads:
+        upload.file.close()
+    megabytes = UPLOADS * IMAGE_BYTES / 1024 / 1024
+    print(
+        f"{name:>8} {concurrency:>11} {UPLOADS / elapsed:>9.0f} {megabytes / elapsed:>8.1f}"
+        f" {max(lags, default=0) * 1000:>12.2f}"
+    )
+
+
+async def main() -> None:
+    print(f"{'backend':>8} {'concurrency':>11} {'images/s':>9} {'MB/s':>8} {'max lag ms':>12}")
+    for concurrency in CONCURRENCY:
+        with tempfile.TemporaryDirectory() as root:
+            storage = LocalImageStorage(root)
+            await run("local", lambda upload, trashcan_id: storage.save(upload, trashcan_id), concurrency)
+        with tempfile.TemporaryDirectory() as root:
+            await run("in-loop", lambda upload, trashcan_id: save_in_loop(Path(root), upload, trashcan_id), concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+# 수신 저장(save_detections) 1회당 SQL 문 수와 소요 시간 (SQLite 임시 DB)
+# python -m benchmarks.ingest_roundtrips
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from tests.sqlite_compat import StatementCounter, create_session_factory, create_schema, create_test_engine, seed
+
+from models.request import BBox, DetectionCreate, DetectionObject
+from service.detections_service import DetectionService
+from service.frame_dedup import recent_frames
+
+BATCH_SIZES = (1, 10, 50, 200)
+# 기준값: trashcan 선잠금/multi-row insert 적용 전(프레임마다 INSERT 후 detail/daily_stats 반영) 같은 조건에서 측정한 SQL 문 수
+# 당시에는 trashcan_stats/trashcan_type_stats upsert가 없었으므로 지금 경로는 호출당 2개가 더 포함됨
+BASELINE_STATEMENTS = {1: 7, 10: 16, 50: 56, 200: 206}
+OBJECTS_PER_FRAME = 5
+TRASHCANS = 4
+ROUNDS = 20
+
+
+def make_payloads(rnd: random.Random, start: int, count: int) -> list[DetectionCreate]:
+    detected_at = datetime.now() - timedelta(minutes=1)
+    payloads = []
+    for offset in range(count):
+        objects = [
+            DetectionObject(
+                waste_type_id=rnd.randint(1, 4),
+                type_name="bench",
+                confidence=rnd.random(),
+                box=BBox(x1=rnd.random() * 640, y1=rnd.random() * 480, x2=rnd.random() * 640, y2=rnd.random() * 480),
+            )
+            for _ in range(OBJECTS_PER_FRAME)
+        ]
+        payloads.append(
+            DetectionCreate(
+                trashcan_id=(start + offset) % TRASHCANS + 1,
+                frame_id=f"frame-{start + offset}",
+                filename=None,
+                saved_path=None,
+                object_count=len(objects),
+                objects=objects,
+                detected_at=detected_at,
+            )
+        )
+    return payloads
+
+
+async def measure(batch_size: int) -> dict:
+    engine = create_test_engine()
+    await create_schema(engine)
+    session_factory = create_session_factory(engine)
+    await seed(session_factory, range(1, TRASHCANS + 1))
+    counter = StatementCounter(engine)
+    service = DetectionService()
+    rnd = random.Random(batch_size)
+    recent_frames._keys.clear()
+    statements = 0
+    elapsed = 0.0
+    async with session_factory() as db:
+        for round_index in range(ROUNDS):
+            payloads = make_payloads(rnd, round_index * batch_size, batch_size)
+            counter.reset()
+            started = time.perf_counter()
+            await service.save_detections(payloads, db)
+            elapsed += time.perf_counter() - started
+            statements += counter.count
+    await engine.dispose()
+    return {
+        "batch_size": batch_size,
+        "statements_per_call": statements / ROUNDS,
+        "ms_per_call": elapsed / ROUNDS * 1000,
+        "frames_per_s": batch_size * ROUNDS / elapsed,
+    }
+
+
+async def main() -> None:
+    print(f"{'batch':>6} {'baseline':>9} {'stmts/call':>11} {'ms/call':>9} {'frames/s':>9}")
+    for batch_size in BATCH_SIZES:
+        result = await measure(batch_size)
+        print(
+            f"{result['batch_size']:>6} {BASELINE_STATEMENTS[batch_size]:>9} {result['statements_per_call']:>11.1f}"
+            f" {result['ms_per_call']:>9.2f} {result['frames_per_s']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
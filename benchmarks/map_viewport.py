@@ -0,0 +1,78 @@
+# 지도 viewport 조회: 격자 인덱스 vs 전체 순회 1회 소요 시간 (메모리 내, DB 없음)
+# python -m benchmarks.map_viewport
+import random
+import time
+from collections import namedtuple
+
+import tests.sqlite_compat  # noqa: F401 (db.db import 전에 DB 환경 변수 기본값을 채움)
+
+from service.map_index import TrashcanGridIndex
+
+TRASHCANS = 100_000
+# 서울 전역 정도 범위(약 55km x 45km)
+AREA = (37.40, 126.75, 37.80, 127.25)
+CENTER = (37.5665, 126.978)
+# 1024x768px 화면 기준
+SCREEN_PX = (1024, 768)
+ZOOMS = (18, 16, 15, 13, 11)
+REPEAT = 20
+
+Row = namedtuple(
+    "Row",
+    "trashcan_id trashcan_name trashcan_latitude trashcan_longitude is_online fill_rate",
+)
+
+
+def rows() -> list[Row]:
+    rnd = random.Random(0)
+    min_lat, min_lng, max_lat, max_lng = AREA
+    return [
+        Row(
+            trashcan_id,
+            f"trashcan-{trashcan_id}",
+            rnd.uniform(min_lat, max_lat),
+            rnd.uniform(min_lng, max_lng),
+            rnd.random() < 0.9,
+            rnd.uniform(0, 100),
+        )
+        for trashcan_id in range(1, TRASHCANS + 1)
+    ]
+
+
+def viewport(zoom: int) -> tuple[float, float, float, float]:
+    deg_per_px = 360.0 / (2 ** zoom) / 256
+    half_lng = SCREEN_PX[0] / 2 * deg_per_px
+    half_lat = SCREEN_PX[1] / 2 * deg_per_px
+    return CENTER[0] - half_lat, CENTER[1] - half_lng, CENTER[0] + half_lat, CENTER[1] + half_lng
+
+
+def timed(index: TrashcanGridIndex, bbox, zoom: int) -> tuple[float, dict]:
+    best = None
+    result = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = index.query(*bbox, zoom)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+def main() -> None:
+    data = rows()
+    grid = TrashcanGridIndex(ttl=0)
+    grid.build(data)
+    # 칸 하나짜리 격자 = 매 조회마다 모든 점을 확인하는 전체 순회
+    scan = TrashcanGridIndex(cell_deg=360.0, ttl=0)
+    scan.build(data)
+    print(f"{TRASHCANS} trashcans, {grid.stats()['cells']} cells of {grid.cell_deg} deg, best of {REPEAT}")
+    print(f"{'zoom':>5} {'visible':>8} {'scan ms':>9} {'grid ms':>9} {'speedup':>8}")
+    for zoom in ZOOMS:
+        bbox = viewport(zoom)
+        scan_ms, expected = timed(scan, bbox, zoom)
+        grid_ms, result = timed(grid, bbox, zoom)
+        assert result["total"] == expected["total"]
+        print(f"{zoom:>5} {result['total']:>8} {scan_ms:>9.2f} {grid_ms:>9.2f} {scan_ms / grid_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
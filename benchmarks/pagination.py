@@ -0,0 +1,105 @@
+# 목록 깊은 페이지 조회: offset vs 커서(keyset) 페이지 1회 소요 시간 (SQLite 임시 DB)
+# python -m benchmarks.pagination
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from tests.sqlite_compat import create_session_factory, create_schema, create_test_engine
+
+from db.entity import Trashcan, TrashcanStats
+from service.pagination import encode_cursor
+from service.trashcan_list_service import TrashcanList
+
+TRASHCANS = 100_000
+PAGE_SIZE = 20
+DEPTHS = (0, 1_000, 10_000, 50_000, 99_000)
+REPEAT = 5
+
+
+async def populate(session_factory) -> None:
+    rnd = random.Random(0)
+    now = datetime.now()
+    async with session_factory() as db:
+        await db.execute(
+            insert(Trashcan),
+            [
+                {
+                    "trashcan_id": trashcan_id,
+                    "trashcan_name": f"trashcan-{trashcan_id}",
+                    "trashcan_capacity": 100,
+                    "current_volume": rnd.randint(0, 100),
+                    "trashcan_city": "Seoul",
+                    "address_detail": "",
+                    "trashcan_latitude": 37.5,
+                    "trashcan_longitude": 127.0,
+                    "is_online": True,
+                    "is_deleted": False,
+                    "last_connected_at": now,
+                }
+                for trashcan_id in range(1, TRASHCANS + 1)
+            ],
+        )
+        await db.execute(
+            insert(TrashcanStats),
+            [
+                {"trashcan_id": trashcan_id, "total_collected": rnd.randint(0, 10_000), "total_events": 1}
+                for trashcan_id in range(1, TRASHCANS + 1)
+            ],
+        )
+        await db.commit()
+
+
+async def timed(call) -> tuple[float, dict]:
+    best = None
+    result = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        result = await call()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+async def main() -> None:
+    engine = create_test_engine()
+    await create_schema(engine)
+    session_factory = create_session_factory(engine)
+    await populate(session_factory)
+    service = TrashcanList()
+    print(f"{TRASHCANS} trashcans, page size {PAGE_SIZE}, best of {REPEAT}")
+    print(f"{'endpoint':>10} {'depth':>7} {'offset ms':>10} {'cursor ms':>10}")
+    async with session_factory() as db:
+        for depth in DEPTHS:
+            offset_ms, page = await timed(
+                lambda: service.get_trashcans_list(db, depth, PAGE_SIZE, None, False)
+            )
+            cursor = encode_cursor([depth]) if depth else None
+            cursor_ms, keyset_page = await timed(
+                lambda: service.get_trashcans_list(db, 0, PAGE_SIZE, cursor, False)
+            )
+            assert page["items"] == keyset_page["items"]
+            print(f"{'list':>10} {depth:>7} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+        for depth in DEPTHS:
+            offset_ms, page = await timed(
+                lambda: service.sort_trashcans_list(db, "collected", "desc", None, None, depth, PAGE_SIZE, None, False)
+            )
+            cursor = None
+            if depth:
+                previous = await service.sort_trashcans_list(
+                    db, "collected", "desc", None, None, depth - 1, 1, None, False
+                )
+                last = previous["items"][-1]
+                cursor = encode_cursor([last["total_collected"], last["trashcan_id"]])
+            cursor_ms, keyset_page = await timed(
+                lambda: service.sort_trashcans_list(db, "collected", "desc", None, None, 0, PAGE_SIZE, cursor, False)
+            )
+            assert page["items"] == keyset_page["items"]
+            print(f"{'sorted':>10} {depth:>7} {offset_ms:>10.2f} {cursor_ms:>10.2f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
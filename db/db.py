@@ -1,7 +1,10 @@
 import os
+import time
 from dotenv import load_dotenv
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 # 핵심: SQLAlchemy 것이 아니라 SQLModel의 비동기 세션을 가져와야 함
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Annotated, List
@@ -19,16 +22,93 @@ for var in missing:
     if not os.getenv(var):
         raise ValueError(f"{var} 환경변수가 설정되지 않았습니다.")
 
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+DB_ECHO = _env_flag("DB_ECHO", False)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", True)
+DB_CREATE_ALL = _env_flag("DB_CREATE_ALL", True)
+DB_AUTO_MIGRATE = _env_flag("DB_AUTO_MIGRATE", True)
+
 DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PW}@{DB_IP}:{DB_PORT}/{DB_NAME}"
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+class PoolWaitStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        self.checkouts += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        if timed_out:
+            self.timeouts += 1
+
+
+pool_wait_stats = PoolWaitStats()
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    # 커넥션 획득(대기 + 신규 연결)에 걸린 시간을 기록
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            # 풀 대기 시간 초과만 집계, 연결 실패 등 다른 예외는 그대로 전달
+            timed_out = True
+            raise
+        finally:
+            pool_wait_stats.record(time.perf_counter() - started, timed_out)
+
+
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=DB_ECHO,
+    poolclass=TimedAsyncQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+)
+
+# sessionmaker에 SQLModel의 AsyncSession 클래스를 전달 (프로세스당 1회 생성)
+async_session_factory = sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
 
 async def get_db():
-    # sessionmaker에 SQLModel의 AsyncSession 클래스를 전달
-    async_session_factory = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
     async with async_session_factory() as session:
         yield session
 
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
+
+
+def get_pool_stats() -> dict:
+    pool = engine.sync_engine.pool
+    checkouts = pool_wait_stats.checkouts
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkouts": checkouts,
+        "timeouts": pool_wait_stats.timeouts,
+        "avg_wait_ms": round(pool_wait_stats.total_wait / checkouts * 1000, 3) if checkouts else 0.0,
+        "max_wait_ms": round(pool_wait_stats.max_wait * 1000, 3),
+    }
@@ -3,10 +3,13 @@ from typing import Annotated
 
 from fastapi import Depends, FastAPI, HTTPException, Query
 from sqlmodel import Field, Session, SQLModel, create_engine, select
-from sqlalchemy import Boolean, Column, text, DateTime
+from sqlalchemy import Boolean, Column, Integer, LargeBinary, String, text, DateTime, Index, UniqueConstraint
 
 class Trashcan(SQLModel, table=True):
     __tablename__ = "trashcan"
+    __table_args__ = (
+        Index("ix_trashcan_status", "is_deleted", "is_online", "last_connected_at"),
+    )
     trashcan_id: int | None = Field(default=None, primary_key=True)
     trashcan_name: str | None
     trashcan_capacity: int | None
@@ -25,20 +28,37 @@ class Trashcan(SQLModel, table=True):
 
 class Detection(SQLModel, table=True):
     __tablename__ = "detection"
+    __table_args__ = (
+        Index("ix_detection_trashcan_detected_at", "trashcan_id", "detected_at"),
+        Index("ix_detection_detected_at", "detected_at"),
+        # 재전송된 프레임 중복 저장 방지 (frame_id가 NULL인 행은 제약 없음)
+        Index("uq_detection_trashcan_frame", "trashcan_id", "frame_id", unique=True),
+    )
     detection_id: int | None = Field(default=None, primary_key=True)
     trashcan_id: int = Field(foreign_key="trashcan.trashcan_id")
+    frame_id: str | None = Field(default=None, max_length=64)
     image_name: str | None
     image_path: str | None
     detected_at: datetime | None
     object_count: int | None
+    # DETECTION_STORAGE_MODE=packed일 때 객체 목록 (service/detection_packing.py 형식), 이 경우 detection_detail 행 없음
+    objects_blob: bytes | None = Field(default=None, sa_column=Column(LargeBinary, nullable=True))
 
 class WasteType(SQLModel, table=True):
     __tablename__ = "wastetype"
+    __table_args__ = (
+        Index("uq_wastetype_class_id", "class_id", unique=True),
+    )
     waste_type_id: int | None = Field(default=None, primary_key=True)
     type_name: str
+    class_id: int | None = None
 
 class DetectionDetail(SQLModel, table=True):
     __tablename__ = "detection_detail"
+    __table_args__ = (
+        # detection_id 단독 조회는 FK 인덱스(MySQL이 자동 생성)를 사용
+        Index("ix_detection_detail_type_detection", "waste_type_id", "detection_id"),
+    )
     detail_id: int | None = Field(default=None, primary_key=True)
     detection_id: int = Field(foreign_key="detection.detection_id")
     waste_type_id: int = Field(foreign_key="wastetype.waste_type_id")
@@ -50,16 +70,63 @@ class DetectionDetail(SQLModel, table=True):
 
 class DailyStats(SQLModel, table=True):
     __tablename__ = "dailystats"
+    __table_args__ = (
+        UniqueConstraint("stats_date", "trashcan_city", "waste_type_id", name="uq_dailystats_date_city_type"),
+    )
     stats_id: int | None = Field(default=None, primary_key=True)
     stats_date: date
-    trashcan_city: str | None
+    # city가 없으면 ''로 저장 (NULL은 유니크 키에서 서로 다른 값으로 취급되어 같은 날짜/종류 행이 중복됨)
+    trashcan_city: str = Field(
+        default="",
+        sa_column=Column(String(255), nullable=False, server_default=text("''")),
+    )
     waste_type_id: int = Field(foreign_key="wastetype.waste_type_id")
     detection_count: int | None
 
+class TrashcanStats(SQLModel, table=True):
+    __tablename__ = "trashcan_stats"
+    trashcan_id: int = Field(foreign_key="trashcan.trashcan_id", primary_key=True)
+    total_collected: int = Field(default=0)
+    total_events: int = Field(default=0)
+    last_detected_at: datetime | None
+    # 마지막 수거(비움) 이후 누적, 수거 시 0으로 초기화 (이번 주기 개수는 trashcan.current_volume)
+    cycle_events: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default=text("0")))
+    last_collected_at: datetime | None = None
+    total_collections: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default=text("0")))
+    total_emptied_volume: int = Field(default=0, sa_column=Column(Integer, nullable=False, server_default=text("0")))
+
+class TrashcanTypeStats(SQLModel, table=True):
+    __tablename__ = "trashcan_type_stats"
+    trashcan_id: int = Field(foreign_key="trashcan.trashcan_id", primary_key=True)
+    waste_type_id: int = Field(foreign_key="wastetype.waste_type_id", primary_key=True)
+    detection_count: int = Field(default=0)
+
+class ArchivedTrashcanStats(SQLModel, table=True):
+    # 보존 기간이 지나 파일로 옮기고 삭제한 detection의 합계 (누적 통계 재계산 시 detection 합계에 더함)
+    __tablename__ = "archived_trashcan_stats"
+    trashcan_id: int = Field(foreign_key="trashcan.trashcan_id", primary_key=True)
+    total_collected: int = Field(default=0)
+    total_events: int = Field(default=0)
+    last_detected_at: datetime | None
+
+class ArchivedTrashcanTypeStats(SQLModel, table=True):
+    __tablename__ = "archived_trashcan_type_stats"
+    trashcan_id: int = Field(foreign_key="trashcan.trashcan_id", primary_key=True)
+    waste_type_id: int = Field(foreign_key="wastetype.waste_type_id", primary_key=True)
+    detection_count: int = Field(default=0)
+
 class TrashcanErrorLog(SQLModel, table=True):
     __tablename__ = "trashcan_error_log"
+    __table_args__ = (
+        Index("ix_error_log_lookup", "trashcan_id", "status_code", "message", "created_at"),
+        Index("ix_error_log_camera_lookup", "camera_id", "status_code", "created_at"),
+        Index("ix_error_log_recent", "trashcan_id", "last_occurred_at"),
+        # 보존 기간 지난 행 정리용
+        Index("ix_error_log_created_at", "created_at"),
+    )
     id: int | None = Field(default=None, primary_key=True)
-    trashcan_id: int = Field(foreign_key="trashcan.trashcan_id")
+    # 등록되지 않은 camera_id에서 온 에러는 trashcan_id 없이 camera_id만 기록
+    trashcan_id: int | None = Field(default=None, foreign_key="trashcan.trashcan_id")
     camera_id: int | None
     status_code: int
     message: str | None
@@ -69,4 +136,20 @@ class TrashcanErrorLog(SQLModel, table=True):
     created_at: datetime | None = Field(
         default=datetime.now(),
         sa_column=Column(DateTime, server_default=text("CURRENT_TIMESTAMP")),
-    )
\ No newline at end of file
+    )
+
+class CollectionEvent(SQLModel, table=True):
+    # 수거(비움) 이력, 추가만 하고 수정/삭제하지 않음
+    __tablename__ = "collection_event"
+    __table_args__ = (
+        Index("ix_collection_event_trashcan", "trashcan_id", "id"),
+    )
+    id: int | None = Field(default=None, primary_key=True)
+    trashcan_id: int = Field(foreign_key="trashcan.trashcan_id")
+    collected_at: datetime
+    cycle_started_at: datetime | None = None
+    volume_collected: int = Field(default=0)
+    cycle_events: int = Field(default=0)
+    trashcan_capacity: int | None = None
+    collected_by: str | None = Field(default=None, max_length=64)
+    note: str | None = Field(default=None, max_length=255)
@@ -0,0 +1,249 @@
+import logging
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, select, text, func
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import AddConstraint
+
+from db.entity import (
+    ArchivedTrashcanStats,
+    ArchivedTrashcanTypeStats,
+    CollectionEvent,
+    DailyStats,
+    Detection,
+    DetectionDetail,
+    Trashcan,
+    TrashcanErrorLog,
+    TrashcanStats,
+    WasteType,
+)
+
+logger = logging.getLogger(__name__)
+
+# create_all은 기존 테이블을 변경하지 않으므로 컬럼/인덱스 변경은 여기서 순서대로 적용
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False, server_default=func.now()),
+)
+
+
+def _index_names(conn: Connection, table_name: str) -> set[str]:
+    inspector = inspect(conn)
+    names = {index["name"] for index in inspector.get_indexes(table_name)}
+    names |= {
+        constraint["name"]
+        for constraint in inspector.get_unique_constraints(table_name)
+        if constraint.get("name")
+    }
+    return names
+
+
+def _column_names(conn: Connection, table_name: str) -> set[str]:
+    return {column["name"] for column in inspect(conn).get_columns(table_name)}
+
+
+def _ensure_column(conn: Connection, table, column_name: str) -> None:
+    if column_name in _column_names(conn, table.name):
+        return
+    column = table.c[column_name]
+    column_type = column.type.compile(dialect=conn.dialect)
+    nullable = "NULL" if column.nullable else "NOT NULL"
+    # NOT NULL 컬럼은 기존 행을 채울 server_default를 함께 지정
+    default = ""
+    if column.server_default is not None:
+        default = f" DEFAULT {column.server_default.arg.text}"
+    conn.execute(
+        text(f"ALTER TABLE {table.name} ADD COLUMN {column_name} {column_type} {nullable}{default}")
+    )
+
+
+def _ensure_nullable(conn: Connection, table, column_name: str) -> None:
+    # SQLite 등은 컬럼 변경을 지원하지 않으므로 MySQL에서만 적용
+    if conn.dialect.name not in ("mysql", "mariadb"):
+        return
+    current = next(
+        column for column in inspect(conn).get_columns(table.name) if column["name"] == column_name
+    )
+    if current["nullable"]:
+        return
+    column_type = table.c[column_name].type.compile(dialect=conn.dialect)
+    conn.execute(text(f"ALTER TABLE {table.name} MODIFY COLUMN {column_name} {column_type} NULL"))
+
+
+def _ensure_not_null(conn: Connection, table, column_name: str) -> None:
+    # SQLite 등은 컬럼 변경을 지원하지 않으므로 MySQL에서만 적용, 기존 NULL 값은 먼저 채워야 함
+    if conn.dialect.name not in ("mysql", "mariadb"):
+        return
+    current = next(
+        column for column in inspect(conn).get_columns(table.name) if column["name"] == column_name
+    )
+    if not current["nullable"]:
+        return
+    column = table.c[column_name]
+    column_type = column.type.compile(dialect=conn.dialect)
+    default = ""
+    if column.server_default is not None:
+        default = f" DEFAULT {column.server_default.arg.text}"
+    conn.execute(
+        text(f"ALTER TABLE {table.name} MODIFY COLUMN {column_name} {column_type} NOT NULL{default}")
+    )
+
+
+def _ensure_indexes(conn: Connection, table) -> None:
+    existing = _index_names(conn, table.name)
+    columns = _column_names(conn, table.name)
+    for index in table.indexes:
+        if index.name in existing:
+            continue
+        # 아직 추가되지 않은 컬럼의 인덱스는 해당 컬럼을 추가하는 마이그레이션에서 생성
+        if not {column.name for column in index.columns} <= columns:
+            continue
+        index.create(conn)
+
+
+def _ensure_unique_constraint(conn: Connection, table, name: str) -> None:
+    if name in _index_names(conn, table.name):
+        return
+    constraint = next(c for c in table.constraints if c.name == name)
+    conn.execute(AddConstraint(constraint))
+
+
+def _wastetype_class_id(conn: Connection) -> None:
+    _ensure_column(conn, WasteType.__table__, "class_id")
+    _ensure_indexes(conn, WasteType.__table__)
+
+
+def _dailystats_unique_key(conn: Connection) -> None:
+    # 중복 행을 하나로 합친 뒤 유니크 키 추가
+    if "uq_dailystats_date_city_type" in _index_names(conn, "dailystats"):
+        return
+    duplicates = """
+        SELECT MIN(stats_id) AS keep_id, stats_date, trashcan_city, waste_type_id,
+               SUM(detection_count) AS total
+        FROM dailystats
+        GROUP BY stats_date, trashcan_city, waste_type_id
+        HAVING COUNT(*) > 1
+    """
+    conn.execute(text(f"""
+        UPDATE dailystats d JOIN ({duplicates}) g ON d.stats_id = g.keep_id
+        SET d.detection_count = g.total
+    """))
+    conn.execute(text(f"""
+        DELETE d FROM dailystats d JOIN ({duplicates}) g
+          ON d.stats_date = g.stats_date
+         AND d.trashcan_city <=> g.trashcan_city
+         AND d.waste_type_id = g.waste_type_id
+         AND d.stats_id <> g.keep_id
+    """))
+    _ensure_unique_constraint(conn, DailyStats.__table__, "uq_dailystats_date_city_type")
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    for table in (
+        Trashcan.__table__,
+        Detection.__table__,
+        DetectionDetail.__table__,
+        TrashcanErrorLog.__table__,
+    ):
+        _ensure_indexes(conn, table)
+
+
+def _detection_frame_id(conn: Connection) -> None:
+    _ensure_column(conn, Detection.__table__, "frame_id")
+    _ensure_indexes(conn, Detection.__table__)
+
+
+def _error_log_nullable_trashcan(conn: Connection) -> None:
+    _ensure_nullable(conn, TrashcanErrorLog.__table__, "trashcan_id")
+
+
+def _collection_cycle(conn: Connection) -> None:
+    CollectionEvent.__table__.create(conn, checkfirst=True)
+    table = TrashcanStats.__table__
+    backfill = "cycle_events" not in _column_names(conn, table.name)
+    for column_name in ("cycle_events", "last_collected_at", "total_collections", "total_emptied_volume"):
+        _ensure_column(conn, table, column_name)
+    if backfill:
+        # 아직 수거 이력이 없으므로 현재 주기 = 전체 누적
+        conn.execute(text("UPDATE trashcan_stats SET cycle_events = total_events"))
+
+
+def _retention_archive(conn: Connection) -> None:
+    ArchivedTrashcanStats.__table__.create(conn, checkfirst=True)
+    ArchivedTrashcanTypeStats.__table__.create(conn, checkfirst=True)
+    _ensure_indexes(conn, TrashcanErrorLog.__table__)
+
+
+def _detection_objects_blob(conn: Connection) -> None:
+    _ensure_column(conn, Detection.__table__, "objects_blob")
+
+
+def _dailystats_city_not_null(conn: Connection) -> None:
+    # city가 NULL인 행을 같은 날짜/종류의 '' 행과 합친 뒤 NOT NULL로 변경
+    duplicates = conn.execute(text("""
+        SELECT MIN(stats_id) AS keep_id, stats_date, COALESCE(trashcan_city, '') AS city, waste_type_id,
+               SUM(detection_count) AS total
+        FROM dailystats
+        GROUP BY stats_date, COALESCE(trashcan_city, ''), waste_type_id
+        HAVING COUNT(*) > 1
+    """)).all()
+    for row in duplicates:
+        params = {
+            "keep_id": row.keep_id,
+            "stats_date": row.stats_date,
+            "city": row.city,
+            "waste_type_id": row.waste_type_id,
+            "total": row.total,
+        }
+        conn.execute(text("""
+            DELETE FROM dailystats
+            WHERE stats_date = :stats_date AND COALESCE(trashcan_city, '') = :city
+              AND waste_type_id = :waste_type_id AND stats_id <> :keep_id
+        """), params)
+        conn.execute(
+            text("UPDATE dailystats SET detection_count = :total WHERE stats_id = :keep_id"), params
+        )
+    conn.execute(text("UPDATE dailystats SET trashcan_city = '' WHERE trashcan_city IS NULL"))
+    _ensure_not_null(conn, DailyStats.__table__, "trashcan_city")
+
+
+MIGRATIONS = [
+    (1, "wastetype.class_id", _wastetype_class_id),
+    (2, "dailystats unique (stats_date, trashcan_city, waste_type_id)", _dailystats_unique_key),
+    (3, "hot path indexes", _hot_path_indexes),
+    (4, "detection.frame_id unique per trashcan", _detection_frame_id),
+    (5, "trashcan_error_log.trashcan_id nullable", _error_log_nullable_trashcan),
+    (6, "collection_event + trashcan_stats cycle counters", _collection_cycle),
+    (7, "archived detection totals + trashcan_error_log.created_at index", _retention_archive),
+    (8, "detection.objects_blob (packed storage mode)", _detection_objects_blob),
+    (9, "dailystats.trashcan_city NOT NULL DEFAULT ''", _dailystats_city_not_null),
+]
+
+
+def _pending_migrations(conn: Connection) -> list:
+    schema_migrations.create(conn, checkfirst=True)
+    applied = set(conn.execute(select(schema_migrations.c.version)).scalars().all())
+    return [migration for migration in MIGRATIONS if migration[0] not in applied]
+
+
+def _apply_migration(conn: Connection, version: int, name: str, migrate) -> None:
+    logger.info("applying migration %d: %s", version, name)
+    migrate(conn)
+    conn.execute(schema_migrations.insert().values(version=version, name=name))
+
+
+async def run_migrations(engine: AsyncEngine) -> list[int]:
+    # MySQL DDL은 암시적으로 커밋되어 여러 마이그레이션을 한 트랜잭션으로 묶을 수 없음
+    # 마이그레이션마다 별도 트랜잭션으로 적용하고 바로 기록 (중간에 실패해도 앞의 기록은 남고, 각 단계는 재실행해도 안전)
+    async with engine.begin() as conn:
+        pending = await conn.run_sync(_pending_migrations)
+    newly_applied = []
+    for version, name, migrate in pending:
+        async with engine.begin() as conn:
+            await conn.run_sync(_apply_migration, version, name, migrate)
+        newly_applied.append(version)
+    return newly_applied
@@ -3,21 +3,63 @@ import uvicorn
 from sqlmodel import SQLModel
 from fastapi.middleware.cors import CORSMiddleware
 import db.entity
-from db.db import engine
+from db.db import engine, async_session_factory, DB_CREATE_ALL, DB_AUTO_MIGRATE
+from db.migrations import run_migrations
 from routers.dashboard_router import dashboard
 from routers.trashcan_list_router import trashcans_list
 from routers.trashcan_detail_router import trashcans_detail
 from routers.trashcan_management_router import management
 from routers.trashcan_map_router import map
 from routers.detections_router import detections
+from routers.internal_router import internal
+from routers.metrics_router import metrics
+from routers.events_router import events
+from routers.collection_router import collection
+from service.metrics import MetricsMiddleware, instrument_engine
+from service.waste_type_registry import waste_type_registry
+from service.detection_ingest_queue import ingest_queue
+from service.trashcan_status_utils import liveness_monitor
+from service.error_log_coalescer import error_log_coalescer
+from service.connection_utils import fleet_health_checker
+from service.retention_service import retention_service
+from service.trashcan_stats_service import trashcan_stats_service
 
 app = FastAPI()
+# 라우트별 지연시간/쿼리 수 집계
+instrument_engine(engine)
 
 # 테이블 자동 생성
 @app.on_event("startup")
 async def on_startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+    if DB_CREATE_ALL:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+    # 기존 테이블 컬럼/인덱스 변경 적용
+    if DB_AUTO_MIGRATE:
+        await run_migrations(engine)
+    # class_id -> waste_type_id 매핑 미리 로드
+    async with async_session_factory() as session:
+        await waste_type_registry.refresh(session)
+        # 누적 통계 테이블이 비어 있으면 detection 이력으로 1회 채움
+        await trashcan_stats_service.backfill_if_empty(session)
+    if ingest_queue.enabled:
+        await ingest_queue.start()
+    await liveness_monitor.start()
+    await error_log_coalescer.start()
+    await fleet_health_checker.start()
+    await retention_service.start()
+
+# 큐에 남은 디텍션 저장 후 종료
+@app.on_event("shutdown")
+async def on_shutdown():
+    await retention_service.stop()
+    await trashcan_stats_service.stop()
+    await fleet_health_checker.stop()
+    await liveness_monitor.stop()
+    await ingest_queue.stop()
+    # 큐 저장 중 남은 에러 로그까지 반영한 뒤 종료
+    await error_log_coalescer.stop()
+    await engine.dispose()
 
 #CORS 설정
 app.add_middleware(
@@ -27,6 +69,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
 
 
 app.include_router(dashboard)
@@ -35,6 +78,10 @@ app.include_router(map)
 app.include_router(trashcans_list)
 app.include_router(trashcans_detail)
 app.include_router(detections)
+app.include_router(internal)
+app.include_router(metrics)
+app.include_router(events)
+app.include_router(collection)
 
 if __name__== "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
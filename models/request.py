@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class TrashcanModify(BaseModel):
     trashcan_id: int
@@ -44,10 +44,12 @@ class DetectionObject(BaseModel):
 
 class DetectionCreate(BaseModel):
     trashcan_id: int
-    filename: str
-    saved_path: str
+    frame_id: str | None = None
+    filename: str | None
+    saved_path: str | None
     object_count: int
     objects: list[DetectionObject]
+    detected_at: datetime | None = None
 
 class DetectionMetadataItem(BaseModel):
     class_id: int
@@ -56,6 +58,12 @@ class DetectionMetadataItem(BaseModel):
 
 class DetectionMetadata(BaseModel):
     camera_id: int
-    frame_id: str | None = None
+    frame_id: str | None = Field(default=None, max_length=64)
     detections: list[DetectionMetadataItem] = []
-    timestamp: str | None = None
\ No newline at end of file
+    timestamp: str | None = None
+
+
+class CollectionEventCreate(BaseModel):
+    collected_at: datetime | None = None
+    collected_by: str | None = Field(default=None, max_length=64)
+    note: str | None = Field(default=None, max_length=255)
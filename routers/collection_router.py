@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException, Query
+from db.db import SessionDep
+from models.request import CollectionEventCreate
+from service.collection_route_service import CollectionRouteService, ROUTE_DEFAULT_THRESHOLD, ROUTE_MAX_BINS
+from service.collection_service import CollectionService
+from service.map_index import map_index
+
+collection = APIRouter(prefix="/collection")
+service = CollectionRouteService()
+event_service = CollectionService()
+
+@collection.get("/route")
+async def get_collection_route(
+    db: SessionDep,
+    depot_lat: float = Query(..., ge=-90, le=90),
+    depot_lng: float = Query(..., ge=-180, le=180),
+    threshold: float = Query(ROUTE_DEFAULT_THRESHOLD, ge=0),
+    limit: int | None = Query(None, ge=1, le=ROUTE_MAX_BINS),
+):
+    return await service.get_collection_route(db, depot_lat, depot_lng, threshold, limit)
+
+@collection.get("/nearest")
+async def get_nearest_trashcans(
+    db: SessionDep,
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    k: int = Query(10, ge=1, le=200),
+    min_fill_rate: float | None = Query(None, ge=0),
+):
+    await map_index.ensure_loaded(db)
+    return {"items": map_index.nearest(lat, lng, k, min_fill_rate)}
+
+#수거 기록 (current_volume 초기화)
+@collection.post("/trashcans/{trashcan_id}/events")
+async def record_collection(trashcan_id: int, data: CollectionEventCreate, db: SessionDep):
+    try:
+        result = await event_service.record_collection(trashcan_id, data, db)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Trashcan not found")
+    return result
+
+@collection.get("/trashcans/{trashcan_id}/events")
+async def get_collection_events(
+    trashcan_id: int,
+    db: SessionDep,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None),
+):
+    try:
+        result = await event_service.get_collection_events(trashcan_id, db, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Trashcan not found")
+    return result
@@ -4,6 +4,8 @@ from fastapi import APIRouter, HTTPException, Query
 
 from db.db import SessionDep
 from service.dashboard_service import DashboardService
+from service.response_cache import dashboard_cache
+from service.fill_forecast_service import fill_forecaster
 
 dashboard = APIRouter(prefix="/dashboard")
 service = DashboardService()
@@ -11,20 +13,62 @@ service = DashboardService()
 
 @dashboard.get("/detections")
 async def get_total_detection_count(db: SessionDep):
-    result = await service.get_total_detection(db)
+    result = await dashboard_cache.get_or_load(
+        "dashboard:detections",
+        lambda: service.get_total_detection(db),
+    )
     return result
 
 @dashboard.get("/trashcans/full")
 async def get_full_trashcans(db: SessionDep):
-    result = await service.get_full_trashcans(db)
+    result = await dashboard_cache.get_or_load(
+        "dashboard:trashcans_full",
+        lambda: service.get_full_trashcans(db),
+    )
     return result
 
+@dashboard.get("/trashcans/forecast")
+async def get_trashcans_forecast(
+    db: SessionDep,
+    sort: Literal["time_to_full", "fill_rate", "rate"] = Query("time_to_full"),
+    order: Literal["asc", "desc"] = Query("asc"),
+    limit: int | None = Query(None, ge=1, le=10000),
+):
+    return await fill_forecaster.get_forecast(db, sort, order, limit)
+
 @dashboard.get("/charts")
 async def get_charts(
     db: SessionDep,
     period: Literal["week", "month", "year"] = Query("week"),
 ):
-    result = await service.get_stats_charts(db, period)
+    result = await dashboard_cache.get_or_load(
+        f"dashboard:charts:{period}",
+        lambda: service.get_stats_charts(db, period),
+    )
+    return result
+
+@dashboard.get("/charts/series")
+async def get_chart_series(
+    db: SessionDep,
+    period: Literal["week", "month", "year"] = Query("week"),
+    bucket: Literal["day", "week", "month"] | None = Query(None),
+    by_city: bool = Query(False),
+):
+    result = await dashboard_cache.get_or_load(
+        f"dashboard:series:{period}:{bucket}:{by_city}",
+        lambda: service.get_stats_series(db, period, bucket, by_city),
+    )
+    return result
+
+@dashboard.get("/summary")
+async def get_summary(
+    db: SessionDep,
+    period: Literal["week", "month", "year"] = Query("week"),
+):
+    result = await dashboard_cache.get_or_load(
+        f"dashboard:summary:{period}",
+        lambda: service.get_summary(db, period),
+    )
     return result
 
 @dashboard.get("/trashcans/error")
@@ -42,4 +86,3 @@ async def get_trashcan_error_logs(
     if result is None:
         raise HTTPException(status_code=404, detail="Trashcan not found")
     return result
-
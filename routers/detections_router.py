@@ -1,14 +1,34 @@
+import asyncio
 import json
+import os
+from datetime import datetime
 
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException
 from pydantic import ValidationError
 from db.db import SessionDep
 from models.request import DetectionMetadata
 from service.detections_service import DetectionService
+from service.detection_ingest_queue import ingest_queue, INGEST_RETRY_AFTER
+from service.image_storage import image_storage
+from service.frame_dedup import recent_frames
+
+DETECT_BATCH_MAX_ITEMS = int(os.getenv("DETECT_BATCH_MAX_ITEMS", "500"))
 
 detections = APIRouter(prefix="/detect")
 service = DetectionService()
 
+
+def _validation_message(exc: ValidationError) -> str:
+    error_messages = []
+    for err in exc.errors():
+        loc = err.get("loc", [])
+        loc_str = ".".join(str(part) for part in loc)
+        msg = err.get("msg", "validation error")
+        input_value = err.get("input")
+        error_messages.append(f"{loc_str}: {msg} (input={input_value})")
+    return "; ".join(error_messages) if error_messages else "metadata validation error"
+
+
 @detections.post("/result", status_code=204)
 async def receive_detection(
     db: SessionDep,
@@ -27,29 +47,52 @@ async def receive_detection(
         trashcan_id = None
         if camera_id is not None:
             trashcan_id = await service.get_trashcan_id(camera_id, db)
-        error_messages = []
-        for err in exc.errors():
-            loc = err.get("loc", [])
-            loc_str = ".".join(str(part) for part in loc)
-            msg = err.get("msg", "validation error")
-            input_value = err.get("input")
-            error_messages.append(f"{loc_str}: {msg} (input={input_value})")
-        message = "; ".join(error_messages) if error_messages else "metadata validation error"
         await service.save_trashcan_error_log(
             trashcan_id,
             camera_id,
             422,
-            message,
+            _validation_message(exc),
             None,
             db,
         )
         raise HTTPException(status_code=422, detail=exc.errors())
     payload = parsed.model_dump()
+    if ingest_queue.enabled:
+        queue_full = HTTPException(
+            status_code=503,
+            detail="Detection queue is full",
+            headers={"Retry-After": str(INGEST_RETRY_AFTER)},
+        )
+        # 최근 저장된 프레임 재전송은 큐에 넣지 않고 바로 성공 처리
+        if recent_frames.seen(payload.get("camera_id"), payload.get("frame_id")):
+            return None
+        if ingest_queue.is_full():
+            raise queue_full
+        # 알 수 없는 카메라면 이미지를 저장하기 전에 거절 (남는 파일이 없도록)
+        camera_id = payload.get("camera_id")
+        if await service.get_trashcan_id(camera_id, db) is None:
+            message = service._unknown_trashcan_message(camera_id)
+            await service.save_trashcan_error_log(None, camera_id, 400, message, payload.get("timestamp"), db)
+            raise HTTPException(status_code=400, detail=message)
+        received_at = datetime.now()
+        stored = await image_storage.save(file, camera_id, received_at)
+        accepted = ingest_queue.enqueue(
+            {
+                "data": payload,
+                "filename": file.filename,
+                "saved_path": stored.path,
+                "received_at": received_at,
+            }
+        )
+        if not accepted:
+            raise queue_full
+        return None
     camera_id = payload.get("camera_id")
     trashcan_id = await service.get_trashcan_id(camera_id, db)
     try:
         await service.detection_mapping(payload, file, db, trashcan_id=trashcan_id) 
     except HTTPException as exc:
+        await db.rollback()
         await service.save_trashcan_error_log(
             trashcan_id,
             camera_id,
@@ -60,6 +103,7 @@ async def receive_detection(
         )
         raise
     except Exception as exc:
+        await db.rollback()
         await service.save_trashcan_error_log(
             trashcan_id,
             camera_id,
@@ -71,4 +115,81 @@ async def receive_detection(
         raise
     return None
 
+@detections.post("/results/batch")
+async def receive_detection_batch(
+    db: SessionDep,
+    files: list[UploadFile] = File(...),
+    metadata: str = Form(...),
+):
+    # 오프라인 동안 쌓인 프레임 재전송용: files[i] <-> metadata[i]
+    try:
+        raw_items = json.loads(metadata)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="metadata must be a JSON array")
+    if not isinstance(raw_items, list):
+        raise HTTPException(status_code=422, detail="metadata must be a JSON array")
+    if len(raw_items) != len(files):
+        raise HTTPException(
+            status_code=422,
+            detail=f"files({len(files)}) and metadata({len(raw_items)}) count mismatch",
+        )
+    if len(raw_items) > DETECT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"batch size exceeds {DETECT_BATCH_MAX_ITEMS}",
+        )
+
+    results: list[dict | None] = [None] * len(raw_items)
+    valid = []
+    for index, raw in enumerate(raw_items):
+        frame_id = raw.get("frame_id") if isinstance(raw, dict) else None
+        try:
+            parsed = DetectionMetadata.model_validate(raw)
+        except ValidationError as exc:
+            camera_id = raw.get("camera_id") if isinstance(raw, dict) else None
+            message = _validation_message(exc)
+            await service.save_trashcan_error_log(
+                await service.get_trashcan_id(camera_id, db),
+                camera_id,
+                422,
+                message,
+                None,
+                db,
+            )
+            results[index] = {"index": index, "frame_id": frame_id, "status": "invalid", "detail": message}
+            continue
+        if recent_frames.seen(parsed.camera_id, parsed.frame_id):
+            results[index] = {"index": index, "frame_id": frame_id, "status": "duplicate", "detail": None}
+            continue
+        valid.append((index, parsed.model_dump()))
+
+    if valid:
+        received_at = datetime.now()
+        stored = await asyncio.gather(
+            *(
+                image_storage.save(files[index], payload.get("camera_id"), received_at)
+                for index, payload in valid
+            )
+        )
+        items = [
+            {
+                "data": payload,
+                "filename": files[index].filename,
+                "saved_path": image.path,
+                "received_at": received_at,
+            }
+            for (index, payload), image in zip(valid, stored)
+        ]
+        saved = await service.save_detection_batch_results(items, db)
+        for (index, payload), result in zip(valid, saved):
+            results[index] = {"index": index, "frame_id": payload.get("frame_id"), **result}
 
+    saved_count = sum(1 for result in results if result["status"] == "saved")
+    duplicate_count = sum(1 for result in results if result["status"] == "duplicate")
+    return {
+        "total": len(results),
+        "saved": saved_count,
+        "duplicate": duplicate_count,
+        "failed": len(results) - saved_count - duplicate_count,
+        "items": results,
+    }
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from service.event_bus import EVENT_TYPES, event_bus
+
+events = APIRouter(prefix="/events")
+
+@events.get("/stream")
+async def stream_events(
+    types: str | None = Query(None, description="쉼표로 구분한 이벤트 종류 (기본: 전체)"),
+):
+    selected = None
+    if types:
+        selected = {value.strip() for value in types.split(",") if value.strip()}
+        unknown = selected - set(EVENT_TYPES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown event types: {', '.join(sorted(unknown))}")
+    return StreamingResponse(
+        event_bus.stream(selected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException
+
+from db.db import get_pool_stats
+from service.detection_ingest_queue import ingest_queue
+from service.error_log_coalescer import error_log_coalescer
+from service.event_bus import event_bus
+from service.fill_forecast_service import fill_forecaster
+from service.frame_dedup import recent_frames
+from service.map_index import map_index
+from service.response_cache import dashboard_cache
+from service.retention_service import retention_service
+from service.trashcan_status_utils import liveness_monitor
+
+internal = APIRouter(prefix="/internal")
+
+@internal.get("/db/pool")
+async def get_db_pool_stats():
+    return get_pool_stats()
+
+@internal.get("/error-logs")
+async def get_error_log_coalescer_stats():
+    return error_log_coalescer.stats()
+
+@internal.get("/retention")
+async def get_retention_stats():
+    return retention_service.stats()
+
+#보존 기간 지난 데이터 파일로 옮긴 뒤 삭제 (1회, 백그라운드 실행)
+@internal.post("/retention/run", status_code=202)
+async def run_retention():
+    if not await retention_service.start_run():
+        raise HTTPException(status_code=409, detail="Retention already running")
+    return {"started": True}
+
+@internal.get("/ingest-queue")
+async def get_ingest_queue_stats():
+    return ingest_queue.stats()
+
+@internal.get("/frame-dedup")
+async def get_frame_dedup_stats():
+    return recent_frames.stats()
+
+@internal.get("/dashboard-cache")
+async def get_dashboard_cache_stats():
+    return dashboard_cache.stats()
+
+@internal.get("/liveness")
+async def get_liveness_stats():
+    return liveness_monitor.stats()
+
+@internal.get("/events")
+async def get_event_stats():
+    return event_bus.stats()
+
+@internal.get("/map-index")
+async def get_map_index_stats():
+    return map_index.stats()
+
+@internal.get("/forecast")
+async def get_forecast_stats():
+    return fill_forecaster.stats()
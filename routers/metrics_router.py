@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from db.db import get_pool_stats
+from service.metrics import metrics_registry
+from service.detection_ingest_queue import ingest_queue
+from service.response_cache import dashboard_cache
+from service.event_bus import event_bus
+
+metrics = APIRouter()
+
+@metrics.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    pool = get_pool_stats()
+    queue = ingest_queue.stats()
+    cache = dashboard_cache.stats()
+    feed = event_bus.stats()
+    # 누적 횟수는 counter(_total), 현재 값은 gauge
+    counters = {
+        "db_pool_checkouts_total": pool["checkouts"],
+        "db_pool_timeouts_total": pool["timeouts"],
+        "ingest_queue_rejected_total": queue["rejected"],
+        "ingest_queue_failed_total": queue["failed"],
+        "ingest_queue_failed_batches_total": queue["failed_batches"],
+        "ingest_queue_dropped_total": queue["dropped"],
+        "dashboard_cache_hits_total": cache["hits"],
+        "dashboard_cache_misses_total": cache["misses"],
+        "event_dropped_subscribers_total": feed["dropped_subscribers"],
+    }
+    gauges = {
+        "db_pool_checked_out": pool["checked_out"],
+        "db_pool_overflow": pool["overflow"],
+        "db_pool_max_wait_ms": pool["max_wait_ms"],
+        "ingest_queue_depth": queue["depth"],
+        "dashboard_cache_hit_ratio": cache["hit_ratio"],
+        "event_subscribers": feed["subscribers"],
+    }
+    return PlainTextResponse(
+        metrics_registry.render(gauges, counters),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from db.db import SessionDep
 from service.connection_utils import check_trashcan_connection
 from service.trashcan_detail_service import TrashcanDetail
+from service.waste_type_registry import waste_type_registry
 
 trashcans_detail = APIRouter(prefix="/trashcans_detail")
 service = TrashcanDetail()
@@ -21,8 +25,35 @@ async def get_trashcan(trashcan_id: int, db: SessionDep):
 
 #쓰레기 상세 데이터
 @trashcans_detail.get("/{trashcan_id}/waste-detail")
-async def get_trashcan_waste_detail(trashcan_id: int, db: SessionDep):
-    result = await service.get_waste_detail(trashcan_id, db)
+async def get_trashcan_waste_detail(
+    trashcan_id: int,
+    db: SessionDep,
+    waste_type: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None),
+    start: datetime | None = Query(None),
+    end: datetime | None = Query(None),
+    stream: bool = Query(False),
+):
+    if stream:
+        if not await service.trashcan_exists(trashcan_id, db):
+            raise HTTPException(status_code=404, detail="Trashcan not found")
+        waste_type_id = None
+        if waste_type is not None:
+            await waste_type_registry.ensure_loaded(db)
+            waste_type_id = waste_type_registry.waste_type_id(waste_type)
+            if waste_type_id is None:
+                raise HTTPException(status_code=400, detail=f"Unknown waste_type: {waste_type}")
+        return StreamingResponse(
+            service.stream_waste_detail(trashcan_id, waste_type_id, start, end),
+            media_type="application/x-ndjson",
+        )
+    try:
+        result = await service.get_waste_detail(
+            trashcan_id, db, waste_type, limit, cursor, start, end
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     if result is None:
         raise HTTPException(status_code=404, detail="Trashcan not found")
     return result
@@ -8,8 +8,14 @@ service = TrashcanList()
 
 #목록 조회
 @trashcans_list.get("/trashcans")
-async def list_trashcans(db: SessionDep, offset: int = 0, limit: int = 20):
-    results = await service.get_trashcans_list(db, offset, limit)
+async def list_trashcans(
+    db: SessionDep,
+    offset: int = 0,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
+):
+    results = await service.get_trashcans_list(db, offset, limit, cursor, include_total)
     return results
 
 #정렬/검색
@@ -23,9 +29,11 @@ async def sort_trashcans(
     city: str | None = Query(None),
     name: str | None = Query(None),
     offset: int = 0,
-    limit: int = 20,
+    limit: int = Query(20, ge=1, le=200),
+    cursor: str | None = Query(None),
+    include_total: bool = Query(True),
 ):
     results = await service.sort_trashcans_list(
-        db, sort_by, order, city, name, offset, limit
+        db, sort_by, order, city, name, offset, limit, cursor, include_total
     )
     return results
@@ -1,9 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from models.request import TrashcanModify
 from models.request import TrashcanCreate
 from db.db import SessionDep
 from service.trashcan_management_service import TrashcanManagementService
-from service.connection_utils import check_trashcan_connection
+from service.connection_utils import check_trashcan_connection, check_fleet_health
+from service.waste_type_registry import waste_type_registry
+from service.trashcan_stats_service import trashcan_stats_service
 
 management = APIRouter(prefix="/management")
 service = TrashcanManagementService()
@@ -13,6 +15,11 @@ async def get_trashcans(db: SessionDep):
     results = await service.get_trashcans(db)
     return results
 
+@management.get("/trashcans/health")
+async def get_fleet_health(db: SessionDep):
+    result = await check_fleet_health(db)
+    return result
+
 @management.get("/trashcans/{trashcan_id}/health")
 async def get_trashcan_health(trashcan_id: int, db: SessionDep):
     result = await check_trashcan_connection(trashcan_id, db)
@@ -40,4 +47,25 @@ async def create_trashcan(trashcan: TrashcanCreate, db: SessionDep):
 @management.get("/trashcans/deleted")
 async def get_deleted_trashcans(db: SessionDep):
     results = await service.get_deleted_trashcans(db)
-    return results
\ No newline at end of file
+    return results
+
+@management.post("/waste-types/refresh")
+async def refresh_waste_types(db: SessionDep):
+    await waste_type_registry.refresh(db)
+    return {"refreshed": True, "waste_types": waste_type_registry.type_names}
+
+#누적 통계 재계산 (1회, 백그라운드 실행)
+@management.post("/stats/rebuild", status_code=202)
+async def rebuild_trashcan_stats():
+    if not await trashcan_stats_service.start_rebuild():
+        raise HTTPException(status_code=409, detail="Stats rebuild already running")
+    return {"started": True}
+
+@management.get("/stats/rebuild")
+async def get_trashcan_stats_rebuild():
+    return trashcan_stats_service.rebuild_status()
+
+@management.get("/stats/check")
+async def check_trashcan_stats(db: SessionDep):
+    result = await trashcan_stats_service.check_consistency(db)
+    return result
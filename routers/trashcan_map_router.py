@@ -1,4 +1,4 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from db.db import SessionDep
 from service.trashcan_map_service import TrashcanMapService
 
@@ -8,4 +8,18 @@ service = TrashcanMapService()
 @map.get("/trashcans")
 async def get_trashcans(db: SessionDep):
     results = await service.get_trashcans_map(db)
-    return results
\ No newline at end of file
+    return results
+
+@map.get("/trashcans/viewport")
+async def get_trashcans_viewport(
+    db: SessionDep,
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lng: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lng: float = Query(..., ge=-180, le=180),
+    zoom: int = Query(..., ge=0, le=22),
+):
+    try:
+        return await service.get_trashcans_viewport(db, min_lat, min_lng, max_lat, max_lng, zoom)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
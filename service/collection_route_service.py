@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+
+import numpy as np
+from sqlmodel import select
+from sqlalchemy import func
+
+from db.db import SessionDep
+from db.entity import Trashcan
+from service.geo_utils import haversine_matrix_km
+
+# 경로 계산 전체(거리 행렬 + 초기 경로 + 2-opt) 시간 한도(ms)
+# 행렬/초기 경로는 항상 끝까지 만들고, 한도를 넘으면 2-opt 개선만 멈추고 현재 경로 반환
+ROUTE_TIME_BUDGET_MS = float(os.getenv("ROUTE_TIME_BUDGET_MS", "80"))
+ROUTE_DEFAULT_THRESHOLD = float(os.getenv("ROUTE_DEFAULT_THRESHOLD", "80"))
+# 거리 행렬 크기 제한, 초과하면 적재율 높은 순으로 잘라서 경로 계산
+ROUTE_MAX_BINS = int(os.getenv("ROUTE_MAX_BINS", "3000"))
+
+
+def nearest_neighbour_route(distances: np.ndarray) -> np.ndarray:
+    # 0번(차고지)에서 출발해 가장 가까운 미방문 지점을 차례로 방문, 마지막에 차고지로 복귀
+    count = len(distances)
+    visited = np.zeros(count, dtype=bool)
+    visited[0] = True
+    route = [0]
+    current = 0
+    for _ in range(count - 1):
+        current = int(np.argmin(np.where(visited, np.inf, distances[current])))
+        visited[current] = True
+        route.append(current)
+    route.append(0)
+    return np.asarray(route, dtype=np.int64)
+
+
+def two_opt(distances: np.ndarray, route: np.ndarray, deadline: float) -> tuple[np.ndarray, int, bool]:
+    # 두 구간(a-b, c-d)을 a-c, b-d로 바꿔 거리가 줄면 사이 구간을 뒤집음, 개선이 없을 때까지 반복
+    # i마다 가능한 모든 j의 이득을 한 번에 계산해 가장 큰 것을 적용
+    passes = 0
+    improved = True
+    last = len(route) - 1
+    while improved:
+        improved = False
+        passes += 1
+        for i in range(last - 2):
+            if time.perf_counter() > deadline:
+                return route, passes, False
+            a, b = route[i], route[i + 1]
+            c, d = route[i + 2:last], route[i + 3:last + 1]
+            gain = distances[a, b] + distances[c, d] - distances[a, c] - distances[b, d]
+            best = int(np.argmax(gain))
+            if gain[best] > 1e-9:
+                j = i + 2 + best
+                route[i + 1:j + 1] = route[i + 1:j + 1][::-1].copy()
+                improved = True
+    return route, passes, True
+
+
+def plan_route(lats: np.ndarray, lngs: np.ndarray, budget_ms: float) -> tuple[np.ndarray, np.ndarray, int, bool]:
+    # 0번(차고지) 포함 좌표로 방문 순서와 구간 거리 계산, CPU 작업이므로 이벤트 루프 밖 스레드에서 호출
+    deadline = time.perf_counter() + budget_ms / 1000
+    distances = haversine_matrix_km(lats, lngs)
+    route = nearest_neighbour_route(distances)
+    route, passes, converged = two_opt(distances, route, deadline)
+    legs = distances[route[:-1], route[1:]]
+    return route, legs, passes, converged
+
+
+class CollectionRouteService:
+    async def get_collection_route(
+        self,
+        db: SessionDep,
+        depot_lat: float,
+        depot_lng: float,
+        threshold: float = ROUTE_DEFAULT_THRESHOLD,
+        limit: int | None = None,
+    ):
+        started = time.perf_counter()
+        fill_rate = (
+            (func.coalesce(Trashcan.current_volume, 0) * 100.0)
+            / func.nullif(Trashcan.trashcan_capacity, 0)
+        ).label("fill_rate")
+        stmt = (
+            select(
+                Trashcan.trashcan_id,
+                Trashcan.trashcan_name,
+                Trashcan.trashcan_latitude,
+                Trashcan.trashcan_longitude,
+                fill_rate,
+            )
+            .where(Trashcan.is_deleted == False)
+            .where(Trashcan.trashcan_latitude != None)
+            .where(Trashcan.trashcan_longitude != None)
+            .where(fill_rate >= threshold)
+            .order_by(fill_rate.desc(), Trashcan.trashcan_id.asc())
+        )
+        # 적재율이 높은 순으로 limit개만 경로에 포함
+        stmt = stmt.limit(min(limit or ROUTE_MAX_BINS, ROUTE_MAX_BINS))
+        rows = (await db.execute(stmt)).all()
+        query_ms = (time.perf_counter() - started) * 1000
+
+        depot = {"latitude": depot_lat, "longitude": depot_lng}
+        if not rows:
+            return {
+                "depot": depot,
+                "threshold": threshold,
+                "count": 0,
+                "total_distance_km": 0.0,
+                "return_distance_km": 0.0,
+                "optimized": True,
+                "two_opt_passes": 0,
+                "time_budget_ms": ROUTE_TIME_BUDGET_MS,
+                "query_ms": round(query_ms, 2),
+                "compute_ms": 0.0,
+                "items": [],
+            }
+
+        lats = np.array([depot_lat] + [float(row.trashcan_latitude) for row in rows])
+        lngs = np.array([depot_lng] + [float(row.trashcan_longitude) for row in rows])
+        compute_started = time.perf_counter()
+        # N x N 행렬과 2-opt 반복이 도는 동안 다른 요청이 막히지 않도록 스레드에서 계산
+        route, legs, passes, converged = await asyncio.to_thread(plan_route, lats, lngs, ROUTE_TIME_BUDGET_MS)
+
+        items = []
+        for order, (node, leg) in enumerate(zip(route[1:-1], legs[:-1]), start=1):
+            row = rows[node - 1]
+            items.append(
+                {
+                    "order": order,
+                    "trashcan_id": row.trashcan_id,
+                    "trashcan_name": row.trashcan_name,
+                    "trashcan_latitude": float(row.trashcan_latitude),
+                    "trashcan_longitude": float(row.trashcan_longitude),
+                    "fill_rate": round(float(row.fill_rate), 2),
+                    "leg_distance_km": round(float(leg), 3),
+                }
+            )
+        return {
+            "depot": depot,
+            "threshold": threshold,
+            "count": len(items),
+            "total_distance_km": round(float(legs.sum()), 3),
+            "return_distance_km": round(float(legs[-1]), 3),
+            "optimized": converged,
+            "two_opt_passes": passes,
+            "time_budget_ms": ROUTE_TIME_BUDGET_MS,
+            "query_ms": round(query_ms, 2),
+            "compute_ms": round((time.perf_counter() - compute_started) * 1000, 2),
+            "items": items,
+        }
@@ -0,0 +1,174 @@
+from datetime import datetime
+
+from sqlmodel import select
+from sqlalchemy import insert, update
+
+from db.db import SessionDep
+from db.entity import CollectionEvent, Trashcan, TrashcanStats
+from models.request import CollectionEventCreate
+from service.event_bus import event_bus
+from service.map_index import map_index
+from service.pagination import decode_cursor, encode_cursor
+from service.response_cache import dashboard_cache
+
+
+class CollectionService:
+    def __init__(self):
+        pass
+
+    async def record_collection(self, trashcan_id: int, data: CollectionEventCreate, db: SessionDep):
+        # 수거 이력 추가 + current_volume/주기 카운터 초기화를 한 트랜잭션으로 처리
+        # trashcan -> trashcan_stats 순서로 잠가 디텍션 저장(save_detections)과 같은 순서를 유지
+        collected_at = data.collected_at or datetime.now()
+        if collected_at.tzinfo is not None:
+            collected_at = collected_at.astimezone(tz=None).replace(tzinfo=None)
+
+        trashcan = (
+            await db.execute(
+                select(
+                    Trashcan.trashcan_id,
+                    Trashcan.current_volume,
+                    Trashcan.trashcan_capacity,
+                )
+                .where(Trashcan.trashcan_id == trashcan_id)
+                .where(Trashcan.is_deleted == False)
+                .with_for_update()
+            )
+        ).first()
+        if trashcan is None:
+            await db.rollback()
+            return None
+        stats = (
+            await db.execute(
+                select(
+                    TrashcanStats.cycle_events,
+                    TrashcanStats.last_collected_at,
+                )
+                .where(TrashcanStats.trashcan_id == trashcan_id)
+                .with_for_update()
+            )
+        ).first()
+        cycle_started_at = stats.last_collected_at if stats else None
+        if cycle_started_at is not None and collected_at < cycle_started_at:
+            await db.rollback()
+            raise ValueError("collected_at is earlier than the last collection")
+
+        volume = trashcan.current_volume or 0
+        cycle_events = int(stats.cycle_events or 0) if stats else 0
+        try:
+            result = await db.execute(
+                insert(CollectionEvent).values(
+                    trashcan_id=trashcan_id,
+                    collected_at=collected_at,
+                    cycle_started_at=cycle_started_at,
+                    volume_collected=volume,
+                    cycle_events=cycle_events,
+                    trashcan_capacity=trashcan.trashcan_capacity,
+                    collected_by=data.collected_by,
+                    note=data.note,
+                )
+            )
+            await db.execute(
+                update(Trashcan)
+                .where(Trashcan.trashcan_id == trashcan_id)
+                .values(current_volume=0)
+            )
+            if stats is None:
+                await db.execute(
+                    insert(TrashcanStats).values(
+                        trashcan_id=trashcan_id,
+                        total_collected=0,
+                        total_events=0,
+                        cycle_events=0,
+                        last_collected_at=collected_at,
+                        total_collections=1,
+                        total_emptied_volume=volume,
+                    )
+                )
+            else:
+                await db.execute(
+                    update(TrashcanStats)
+                    .where(TrashcanStats.trashcan_id == trashcan_id)
+                    .values(
+                        cycle_events=0,
+                        last_collected_at=collected_at,
+                        total_collections=TrashcanStats.total_collections + 1,
+                        total_emptied_volume=TrashcanStats.total_emptied_volume + volume,
+                    )
+                )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+        await dashboard_cache.invalidate("dashboard:")
+        map_index.invalidate()
+        item = {
+            "id": result.inserted_primary_key[0],
+            "trashcan_id": trashcan_id,
+            "collected_at": collected_at,
+            "cycle_started_at": cycle_started_at,
+            "volume_collected": volume,
+            "cycle_events": cycle_events,
+            "trashcan_capacity": trashcan.trashcan_capacity,
+            "collected_by": data.collected_by,
+            "note": data.note,
+        }
+        if event_bus.has_subscribers:
+            event_bus.publish("collection", item)
+            event_bus.publish(
+                "fill_rate",
+                {
+                    "trashcan_id": trashcan_id,
+                    "current_volume": 0,
+                    "capacity": trashcan.trashcan_capacity,
+                    "fill_rate": 0.0 if trashcan.trashcan_capacity else None,
+                },
+            )
+        return item
+
+    async def get_collection_events(
+        self,
+        trashcan_id: int,
+        db: SessionDep,
+        limit: int = 50,
+        cursor: str | None = None,
+    ):
+        # 최신순, id 기준 keyset 페이지
+        exists = (
+            await db.execute(
+                select(Trashcan.trashcan_id)
+                .where(Trashcan.trashcan_id == trashcan_id)
+                .where(Trashcan.is_deleted == False)
+            )
+        ).first()
+        if exists is None:
+            return None
+        stmt = (
+            select(CollectionEvent)
+            .where(CollectionEvent.trashcan_id == trashcan_id)
+            .order_by(CollectionEvent.id.desc())
+        )
+        if cursor:
+            last_id = decode_cursor(cursor, (int,))[0]
+            stmt = stmt.where(CollectionEvent.id < last_id)
+        rows = (await db.execute(stmt.limit(limit + 1))).scalars().all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            "trashcan_id": trashcan_id,
+            "items": [
+                {
+                    "id": row.id,
+                    "collected_at": row.collected_at,
+                    "cycle_started_at": row.cycle_started_at,
+                    "volume_collected": row.volume_collected,
+                    "cycle_events": row.cycle_events,
+                    "trashcan_capacity": row.trashcan_capacity,
+                    "collected_by": row.collected_by,
+                    "note": row.note,
+                }
+                for row in rows
+            ],
+            "next_cursor": encode_cursor([rows[-1].id]) if has_more else None,
+        }
@@ -1,47 +1,65 @@
 import asyncio
+import os
 from datetime import datetime
-import platform
-import subprocess
 from urllib.parse import urlparse
 
 from sqlmodel import select
+from sqlalchemy import and_, case, or_, update
 
-from db.db import SessionDep
+from db.db import SessionDep, async_session_factory
 from db.entity import Trashcan
+from service.background_task import PeriodicTask
+from service.event_bus import event_bus
 
+HEALTH_CHECK_PORT = int(os.getenv("HEALTH_CHECK_PORT", "80"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "3"))
+HEALTH_CHECK_CONCURRENCY = int(os.getenv("HEALTH_CHECK_CONCURRENCY", "100"))
+HEALTH_CHECK_INTERVAL_SECONDS = int(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "0"))
 
-def _normalize_host(raw: str) -> str | None:
+
+def _normalize_target(raw: str | None) -> tuple[str, int] | None:
     if not raw:
         return None
     value = raw.strip()
     if not value:
         return None
     if "://" not in value:
-        parsed = urlparse(f"http://{value}")
+        parsed = urlparse(f"//{value}")
     else:
         parsed = urlparse(value)
-    return parsed.hostname or value
+    host = parsed.hostname
+    if not host:
+        return None
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if port is None:
+        if parsed.scheme == "https":
+            port = 443
+        elif parsed.scheme == "http":
+            port = 80
+        else:
+            port = HEALTH_CHECK_PORT
+    return host, port
 
 
-def ping_server(url: str, timeout: int = 3) -> bool:
-    host = _normalize_host(url)
-    if not host:
+async def probe_server(url: str | None, timeout: float = HEALTH_CHECK_TIMEOUT) -> bool:
+    target = _normalize_target(url)
+    if not target:
         return False
-    system = platform.system().lower()
-    if system.startswith("win"):
-        cmd = ["ping", "-n", "1", "-w", str(timeout * 1000), host]
-    else:
-        cmd = ["ping", "-c", "1", "-W", str(timeout), host]
+    host, port = target
     try:
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=False,
-        )
-        return result.returncode == 0
-    except Exception:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        # 연결 거부(RST)는 호스트는 켜져 있어도 수신 서비스가 내려간 상태이므로 오프라인으로 판단
         return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
 
 
 async def check_trashcan_connection(trashcan_id: int, db: SessionDep) -> dict:
@@ -53,18 +71,124 @@ async def check_trashcan_connection(trashcan_id: int, db: SessionDep) -> dict:
             "status": "error",
             "message": "Server URL not found",
         }
+    await db.commit()
 
-    reachable = await asyncio.to_thread(ping_server, trashcan.server_url)
+    reachable = await probe_server(trashcan.server_url)
+    was_online = bool(trashcan.is_online)
     if reachable:
         trashcan.is_online = True
         trashcan.last_connected_at = datetime.now()
         await db.commit()
+        if not was_online:
+            event_bus.publish(
+                "status",
+                {"trashcan_id": trashcan_id, "is_online": True, "last_connected_at": trashcan.last_connected_at},
+            )
         return {"trashcan_id": trashcan_id, "status": "ok", "message": "Server is healthy"}
 
     trashcan.is_online = False
     await db.commit()
+    if was_online:
+        event_bus.publish("status", {"trashcan_id": trashcan_id, "is_online": False})
     return {
         "trashcan_id": trashcan_id,
         "status": "error",
         "message": "Failed to connect to server",
     }
+
+
+async def check_fleet_health(
+    db: SessionDep,
+    concurrency: int = HEALTH_CHECK_CONCURRENCY,
+    timeout: float = HEALTH_CHECK_TIMEOUT,
+) -> dict:
+    stmt = (
+        select(Trashcan.trashcan_id, Trashcan.server_url, Trashcan.is_online)
+        .where(Trashcan.is_deleted == False)
+        .where(Trashcan.server_url != None)
+    )
+    rows = (await db.execute(stmt)).all()
+    # 조회 트랜잭션은 여기서 끝냄, 응답을 기다리는 동안 스냅샷/커넥션을 잡고 있지 않음
+    await db.commit()
+    started_at = datetime.now()
+
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def probe(row) -> tuple[int, bool]:
+        async with semaphore:
+            return row.trashcan_id, await probe_server(row.server_url, timeout)
+
+    results = await asyncio.gather(*(probe(row) for row in rows))
+    checked_ids = [trashcan_id for trashcan_id, _ in results]
+    online_ids = [trashcan_id for trashcan_id, reachable in results if reachable]
+
+    #상태가 바뀐 쓰레기통만 일괄 업데이트 (점검이 끝난 뒤 UPDATE만 짧은 트랜잭션으로 실행)
+    # 점검 중에 다른 요청이 상태를 바꿨거나 디텍션이 들어온 쓰레기통은 덮어쓰지 않음
+    online_set = set(online_ids)
+    was_online = {row.trashcan_id: bool(row.is_online) for row in rows}
+    went_online = [trashcan_id for trashcan_id in online_ids if not was_online[trashcan_id]]
+    went_offline = [
+        trashcan_id for trashcan_id in checked_ids if was_online[trashcan_id] and trashcan_id not in online_set
+    ]
+    if went_online or went_offline:
+        now = datetime.now()
+        is_reachable = Trashcan.trashcan_id.in_(went_online)
+        await db.execute(
+            update(Trashcan)
+            .where(
+                or_(
+                    and_(is_reachable, Trashcan.is_online.is_not(True)),
+                    and_(
+                        Trashcan.trashcan_id.in_(went_offline),
+                        Trashcan.is_online == True,
+                        or_(Trashcan.last_connected_at == None, Trashcan.last_connected_at < started_at),
+                    ),
+                )
+            )
+            .values(
+                is_online=case((is_reachable, True), else_=False),
+                last_connected_at=case((is_reachable, now), else_=Trashcan.last_connected_at),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    for trashcan_id in went_online:
+        event_bus.publish("status", {"trashcan_id": trashcan_id, "is_online": True})
+    for trashcan_id in went_offline:
+        event_bus.publish("status", {"trashcan_id": trashcan_id, "is_online": False})
+    return {
+        "checked": len(checked_ids),
+        "online": len(online_ids),
+        "offline": len(checked_ids) - len(online_ids),
+        "items": [
+            {
+                "trashcan_id": trashcan_id,
+                "status": "ok" if trashcan_id in online_set else "error",
+            }
+            for trashcan_id in checked_ids
+        ],
+    }
+
+
+class FleetHealthChecker:
+    def __init__(self, interval: int = HEALTH_CHECK_INTERVAL_SECONDS):
+        self.task = PeriodicTask("fleet-health-check", interval, self.run_once)
+        self.last_result: dict | None = None
+        self.last_run_at: datetime | None = None
+
+    async def start(self) -> None:
+        await self.task.start()
+
+    async def stop(self) -> None:
+        await self.task.stop()
+
+    async def run_once(self) -> dict:
+        async with async_session_factory() as db:
+            result = await check_fleet_health(db)
+        self.last_result = {key: value for key, value in result.items() if key != "items"}
+        self.last_run_at = datetime.now()
+        return result
+
+
+fleet_health_checker = FleetHealthChecker()
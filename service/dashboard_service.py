@@ -1,9 +1,9 @@
 from datetime import date, timedelta, datetime
 
 from sqlmodel import select
-from sqlalchemy import case, func, desc, exists
-from db.entity import DetectionDetail, WasteType, Trashcan, DailyStats, TrashcanErrorLog, Detection
-from service.trashcan_status_utils import mark_offline_if_stale
+from sqlalchemy import case, func, desc, exists, literal, null, union_all
+from db.entity import WasteType, Trashcan, DailyStats, TrashcanErrorLog, TrashcanStats
+from service.waste_type_registry import waste_type_registry
 from db.db import SessionDep
 
 class DashboardService:
@@ -19,32 +19,34 @@ class DashboardService:
         return (await db.execute(stmt)).first() is not None
 
     async def get_total_detection(self, db: SessionDep):
-        total_objects_stmt = select(func.count(DetectionDetail.detail_id))
-        total_objects = (await db.execute(total_objects_stmt)).scalar() or 0
-
-        total_events_stmt = select(func.count(Detection.detection_id))
-        total_events = (await db.execute(total_events_stmt)).scalar() or 0
-
+        # 종류별 합계(DailyStats)와 총 탐지 횟수(trashcan_stats)를 한 번에 조회
         type_stmt = (
             select(
-                WasteType.type_name,
-                func.count(DetectionDetail.detail_id).label("type_count"),
+                literal("type").label("kind"),
+                WasteType.type_name.label("type_name"),
+                func.coalesce(func.sum(DailyStats.detection_count), 0).label("total"),
             )
-            .join(DetectionDetail, DetectionDetail.waste_type_id == WasteType.waste_type_id)
+            .join(WasteType, WasteType.waste_type_id == DailyStats.waste_type_id)
             .group_by(WasteType.type_name)
-            .order_by(WasteType.type_name.asc())
         )
-        type_rows = (await db.execute(type_stmt)).all()
+        events_stmt = select(
+            literal("events").label("kind"),
+            null().label("type_name"),
+            func.coalesce(func.sum(TrashcanStats.total_events), 0).label("total"),
+        )
+        rows = (await db.execute(union_all(type_stmt, events_stmt))).all()
 
-        items_by_type = {
-            "MetalCan": 0,
-            "PetBottle": 0,
-            "Plastic": 0,
-            "Styrofoam": 0,
-        }
-        for row in type_rows:
+        await waste_type_registry.ensure_loaded(db)
+        items_by_type = waste_type_registry.empty_counts()
+        total_objects = 0
+        total_events = 0
+        for row in rows:
+            if row.kind == "events":
+                total_events = int(row.total or 0)
+                continue
+            total_objects += int(row.total or 0)
             if row.type_name in items_by_type:
-                items_by_type[row.type_name] += int(row.type_count or 0)
+                items_by_type[row.type_name] += int(row.total or 0)
 
         return {
             "total_objects": int(total_objects),
@@ -82,7 +84,7 @@ class DashboardService:
             for row in rows
         ]
 
-    async def get_stats_charts(self, db: SessionDep, period: str):
+    def _period_range(self, period: str) -> tuple[date, date]:
         today = date.today()
         if period == "month":
             start_date = date(today.year, today.month, 1)
@@ -90,64 +92,131 @@ class DashboardService:
             start_date = date(today.year, 1, 1)
         else:
             start_date = today - timedelta(days=today.weekday())
+        return start_date, today
 
-        total_stmt = (
-            select(func.coalesce(func.sum(DailyStats.detection_count), 0))
-            .where(DailyStats.stats_date >= start_date)
-            .where(DailyStats.stats_date <= today)
-        )
-        total_count = (await db.execute(total_stmt)).scalar() or 0
-
-        type_stmt = (
+    async def get_stats_charts(self, db: SessionDep, period: str):
+        # 기간 내 종류 x 지역 합계를 한 번에 조회한 뒤 전체/종류별/지역별로 합산
+        start_date, today = self._period_range(period)
+        stmt = (
             select(
                 WasteType.type_name,
-                func.coalesce(func.sum(DailyStats.detection_count), 0).label("type_count"),
+                DailyStats.trashcan_city,
+                func.coalesce(func.sum(DailyStats.detection_count), 0).label("total"),
             )
             .join(WasteType, WasteType.waste_type_id == DailyStats.waste_type_id)
             .where(DailyStats.stats_date >= start_date)
             .where(DailyStats.stats_date <= today)
-            .group_by(WasteType.type_name)
-            .order_by(WasteType.type_name.asc())
+            .group_by(WasteType.type_name, DailyStats.trashcan_city)
         )
-        type_rows = (await db.execute(type_stmt)).all()
+        rows = (await db.execute(stmt)).all()
 
-        items_by_type = {
-            "MetalCan": 0,
-            "PetBottle": 0,
-            "Plastic": 0,
-            "Styrofoam": 0,
-        }
-        for row in type_rows:
+        await waste_type_registry.ensure_loaded(db)
+        items_by_type = waste_type_registry.empty_counts()
+        items_by_city = {}
+        total_count = 0
+        for row in rows:
+            count = int(row.total or 0)
+            total_count += count
             if row.type_name in items_by_type:
-                items_by_type[row.type_name] += int(row.type_count or 0)
+                items_by_type[row.type_name] += count
+            key = row.trashcan_city or "unknown"
+            items_by_city[key] = items_by_city.get(key, 0) + count
+
+        return {
+            "period": period,
+            "start_date": start_date,
+            "end_date": today,
+            "total_count": int(total_count),
+            "items_by_type": items_by_type,
+            "items_by_city": dict(sorted(items_by_city.items())),
+        }
 
-        city_stmt = (
+    def _bucket_start(self, value: date, bucket: str) -> date:
+        if bucket == "month":
+            return date(value.year, value.month, 1)
+        if bucket == "week":
+            return value - timedelta(days=value.weekday())
+        return value
+
+    def _bucket_starts(self, start_date: date, end_date: date, bucket: str) -> list[date]:
+        starts = []
+        current = self._bucket_start(start_date, bucket)
+        while current <= end_date:
+            starts.append(current)
+            if bucket == "month":
+                current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+            elif bucket == "week":
+                current += timedelta(days=7)
+            else:
+                current += timedelta(days=1)
+        return starts
+
+    async def get_stats_series(
+        self,
+        db: SessionDep,
+        period: str,
+        bucket: str | None = None,
+        by_city: bool = False,
+    ):
+        # 일자 x 종류(x 지역) GROUP BY 한 번으로 구간별 배열을 만들고 빈 구간은 0으로 채움
+        start_date, today = self._period_range(period)
+        if bucket is None:
+            bucket = "month" if period == "year" else "day"
+
+        columns = [DailyStats.stats_date, WasteType.type_name]
+        if by_city:
+            columns.append(DailyStats.trashcan_city)
+        stmt = (
             select(
-                DailyStats.trashcan_city,
-                func.coalesce(func.sum(DailyStats.detection_count), 0).label("city_count"),
+                *columns,
+                func.coalesce(func.sum(DailyStats.detection_count), 0).label("total"),
             )
+            .join(WasteType, WasteType.waste_type_id == DailyStats.waste_type_id)
             .where(DailyStats.stats_date >= start_date)
             .where(DailyStats.stats_date <= today)
-            .group_by(DailyStats.trashcan_city)
-            .order_by(DailyStats.trashcan_city.asc())
+            .group_by(*columns)
         )
-        city_rows = (await db.execute(city_stmt)).all()
-        items_by_city = {}
-        for row in city_rows:
-            key = row.trashcan_city or "unknown"
-            items_by_city[key] = int(row.city_count or 0)
+        rows = (await db.execute(stmt)).all()
 
-        return {
+        starts = self._bucket_starts(start_date, today, bucket)
+        index = {bucket_start: i for i, bucket_start in enumerate(starts)}
+
+        await waste_type_registry.ensure_loaded(db)
+        series = {name: [0] * len(starts) for name in waste_type_registry.type_names}
+        city_series = {}
+        for row in rows:
+            position = index.get(self._bucket_start(row.stats_date, bucket))
+            if position is None:
+                continue
+            count = int(row.total or 0)
+            if row.type_name in series:
+                series[row.type_name][position] += count
+            if by_city:
+                city = row.trashcan_city or "unknown"
+                per_type = city_series.setdefault(
+                    city, {name: [0] * len(starts) for name in series}
+                )
+                if row.type_name in per_type:
+                    per_type[row.type_name][position] += count
+
+        result = {
             "period": period,
+            "bucket": bucket,
             "start_date": start_date,
             "end_date": today,
-            "total_count": int(total_count),
-            "items_by_type": items_by_type,
-            "items_by_city": items_by_city,
+            "timestamps": [bucket_start.isoformat() for bucket_start in starts],
+            "series": series,
         }
+        if by_city:
+            result["by_city"] = dict(sorted(city_series.items()))
+        return result
+
+    async def get_summary(self, db: SessionDep, period: str):
+        totals = await self.get_total_detection(db)
+        charts = await self.get_stats_charts(db, period)
+        return {"totals": totals, "charts": charts}
 
     async def get_unconnected_trashcans_list(self, db: SessionDep):
-        await mark_offline_if_stale(db, minutes=5)
         cutoff = datetime.now() - timedelta(minutes=1)
         error_exists = exists(
             select(TrashcanErrorLog.id).where(
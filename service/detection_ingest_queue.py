@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import os
+import time
+
+from db.db import async_session_factory
+from service.detections_service import DetectionService
+
+# sync: 요청 안에서 바로 저장 / queue: 큐에 넣고 백그라운드에서 묶음 저장
+DETECTION_INGEST_MODE = os.getenv("DETECTION_INGEST_MODE", "sync")
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "10000"))
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "500"))
+INGEST_FLUSH_INTERVAL_MS = int(os.getenv("INGEST_FLUSH_INTERVAL_MS", "50"))
+INGEST_RETRY_AFTER = int(os.getenv("INGEST_RETRY_AFTER", "1"))
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class DetectionIngestQueue:
+    def __init__(
+        self,
+        enabled: bool = DETECTION_INGEST_MODE == "queue",
+        maxsize: int = INGEST_QUEUE_SIZE,
+        batch_size: int = INGEST_BATCH_SIZE,
+        flush_interval_ms: int = INGEST_FLUSH_INTERVAL_MS,
+    ):
+        self.enabled = enabled
+        self.maxsize = maxsize
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+        self._service = DetectionService()
+        self.enqueued = 0
+        self.rejected = 0
+        self.saved = 0
+        self.failed = 0
+        # 묶음 저장 자체가 예외로 끝나 프레임 단위 재시도도 못 한 묶음/프레임 수 (failed에도 포함)
+        self.failed_batches = 0
+        self.dropped = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.last_flush_ms = 0.0
+
+    def is_full(self) -> bool:
+        return self._queue is not None and self._queue.full()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._closing = False
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # 새 요청은 거절하고 남은 항목을 모두 저장한 뒤 종료
+        if self._task is None:
+            return
+        self._closing = True
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def enqueue(self, item: dict) -> bool:
+        if self._queue is None or self._closing:
+            self.rejected += 1
+            return False
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            if self._queue.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.flush_interval)
+            batch = [first]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if stop:
+                return
+
+    async def _flush(self, batch: list[dict]) -> None:
+        started = time.perf_counter()
+        saved = 0
+        try:
+            async with async_session_factory() as db:
+                saved = await self._service.save_detection_batch(batch, db)
+        except Exception:
+            logger.exception("detection batch flush failed (%d items)", len(batch))
+            self.failed_batches += 1
+            self.dropped += len(batch)
+        self.saved += saved
+        self.failed += len(batch) - saved
+        self.batches += 1
+        self.last_batch_size = len(batch)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+    def stats(self) -> dict:
+        return {
+            "mode": "queue" if self.enabled else "sync",
+            "depth": self.depth,
+            "capacity": self.maxsize,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "saved": self.saved,
+            "failed": self.failed,
+            "failed_batches": self.failed_batches,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
+
+
+ingest_queue = DetectionIngestQueue()
@@ -0,0 +1,95 @@
+import os
+import struct
+
+import numpy as np
+
+# rows: 객체마다 detection_detail 한 행 (기본) / packed: 프레임의 객체를 detection.objects_blob 한 칸에 저장
+DETECTION_STORAGE_MODE = os.getenv("DETECTION_STORAGE_MODE", "rows")
+
+PACK_VERSION = 1
+# 헤더: 버전(uint16), 객체 수(uint16)
+_HEADER = struct.Struct("<HH")
+# 객체당 float32 x 4(bbox) + float16(score) + uint8(waste_type_id) = 19바이트
+PACKED_OBJECT_BYTES = 4 * 4 + 2 + 1
+# MySQL BLOB(64KB) 한 칸에 들어가는 최대 객체 수, 넘으면 detection_detail 행으로 저장
+MAX_PACKED_OBJECTS = (0xFFFF - 4) // PACKED_OBJECT_BYTES
+MAX_PACKED_WASTE_TYPE_ID = 0xFF
+
+
+class PackedObjects:
+    # blob을 복사하지 않는 numpy 뷰 (boxes: (n, 4) float32, scores: (n,) float16, waste_type_ids: (n,) uint8)
+    __slots__ = ("boxes", "scores", "waste_type_ids")
+
+    def __init__(self, boxes: np.ndarray, scores: np.ndarray, waste_type_ids: np.ndarray):
+        self.boxes = boxes
+        self.scores = scores
+        self.waste_type_ids = waste_type_ids
+
+    def __len__(self) -> int:
+        return len(self.waste_type_ids)
+
+    def type_counts(self, minlength: int = 0) -> np.ndarray:
+        return np.bincount(self.waste_type_ids, minlength=minlength)
+
+    def to_details(self) -> list[dict]:
+        # detection_detail 행과 같은 키 (detail_id 없음)
+        return [
+            {
+                "waste_type_id": int(waste_type_id),
+                "confidence": float(score),
+                "bbox_x1": float(box[0]),
+                "bbox_y1": float(box[1]),
+                "bbox_x2": float(box[2]),
+                "bbox_y2": float(box[3]),
+            }
+            for box, score, waste_type_id in zip(
+                self.boxes.tolist(), self.scores.tolist(), self.waste_type_ids.tolist()
+            )
+        ]
+
+
+def can_pack(objects) -> bool:
+    return len(objects) <= MAX_PACKED_OBJECTS and all(
+        0 <= obj.waste_type_id <= MAX_PACKED_WASTE_TYPE_ID for obj in objects
+    )
+
+
+def pack_objects(objects) -> bytes:
+    # 열 단위로 [bbox float32][score float16][waste_type_id uint8] 순서, 헤더가 4바이트라 float 배열 정렬이 유지됨
+    if not can_pack(objects):
+        raise ValueError("objects cannot be packed")
+    count = len(objects)
+    boxes = np.array(
+        [(obj.box.x1, obj.box.y1, obj.box.x2, obj.box.y2) for obj in objects], dtype="<f4"
+    ).reshape(count, 4)
+    scores = np.array([obj.confidence for obj in objects], dtype="<f2")
+    waste_type_ids = np.array([obj.waste_type_id for obj in objects], dtype=np.uint8)
+    return _HEADER.pack(PACK_VERSION, count) + boxes.tobytes() + scores.tobytes() + waste_type_ids.tobytes()
+
+
+def unpack_objects(blob: bytes) -> PackedObjects:
+    version, count = _HEADER.unpack_from(blob)
+    if version != PACK_VERSION or len(blob) != _HEADER.size + count * PACKED_OBJECT_BYTES:
+        raise ValueError("invalid packed objects")
+    offset = _HEADER.size
+    boxes = np.frombuffer(blob, dtype="<f4", count=count * 4, offset=offset).reshape(count, 4)
+    offset += count * 16
+    scores = np.frombuffer(blob, dtype="<f2", count=count, offset=offset)
+    offset += count * 2
+    waste_type_ids = np.frombuffer(blob, dtype=np.uint8, count=count, offset=offset)
+    return PackedObjects(boxes, scores, waste_type_ids)
+
+
+def unpack_many(blobs: list[bytes]) -> tuple[np.ndarray, PackedObjects]:
+    # 여러 detection의 blob을 한 배열로 합침, 반환 index는 객체별 원래 blob 위치 (분석/집계용)
+    parts = [unpack_objects(blob) for blob in blobs]
+    if not parts:
+        return np.zeros(0, dtype=np.int64), PackedObjects(
+            np.zeros((0, 4), dtype="<f4"), np.zeros(0, dtype="<f2"), np.zeros(0, dtype=np.uint8)
+        )
+    index = np.repeat(np.arange(len(parts)), [len(part) for part in parts])
+    return index, PackedObjects(
+        np.concatenate([part.boxes for part in parts]),
+        np.concatenate([part.scores for part in parts]),
+        np.concatenate([part.waste_type_ids for part in parts]),
+    )
@@ -1,61 +1,44 @@
-from datetime import datetime, date, timedelta
+from collections import Counter
+from datetime import datetime
 from sqlmodel import select
-from sqlalchemy import desc
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from db.db import SessionDep
-from db.entity import Detection, DetectionDetail, DailyStats, Trashcan, WasteType, TrashcanErrorLog
+from db.entity import Detection, DetectionDetail, DailyStats, Trashcan, TrashcanStats, TrashcanTypeStats
 from models.request import DetectionCreate, DetectionObject, BBox
+from service.waste_type_registry import waste_type_registry
+from service.image_storage import image_storage
+from service.response_cache import dashboard_cache
+from service.frame_dedup import recent_frames
+from service.error_log_coalescer import error_log_coalescer
+from service.event_bus import event_bus
+from service.fill_forecast_service import fill_forecaster
+from service.detection_packing import DETECTION_STORAGE_MODE, can_pack, pack_objects
 from fastapi import HTTPException
 
-def class_id_to_type_name(class_id: int) -> str | None:
-    mapping = {
-        0: "MetalCan",
-        1: "PetBottle",
-        2: "Plastic",
-        3: "Styrofoam",
-    }
-    return mapping.get(class_id)
-
 class DetectionService:
-    async def _ensure_trashcan_exists(self, trashcan_id: int, db: SessionDep) -> bool:
-        stmt = (
-            select(Trashcan.trashcan_id)
-            .where(Trashcan.trashcan_id == trashcan_id)
-            .where(Trashcan.is_deleted == False)
-        )
-        return (await db.execute(stmt)).first() is not None
+    def _unknown_trashcan_message(self, camera_id) -> str:
+        return f"알 수 없는 trashcan_id / 받은 camera_id: {camera_id}"
 
-    async def detection_mapping(
+    def build_detection_payload(
         self,
         data,
-        file,
-        db: SessionDep,
-        trashcan_id: int | None = None,
-    ):
-        # camera_id -> trashcan_id 조회
-        if trashcan_id is None:
-            camera_id = data.get("camera_id")
-            trashcan_id = await self.get_trashcan_id(camera_id, db)
-        if trashcan_id is None:
-            camera_id = data.get("camera_id")
-            raise HTTPException(
-                status_code=400,
-                detail=f"알 수 없는 trashcan_id / 받은 camera_id: {camera_id}",
-            )
-        await self.update_trashcan_online(trashcan_id, db)
-
+        trashcan_id: int,
+        filename: str | None,
+        saved_path: str | None,
+        detected_at: datetime | None = None,
+    ) -> DetectionCreate:
+        # waste_type_registry.ensure_loaded 이후에 호출해야 함
         objects = []
         for d in data.get("detections", []):
             class_id = d.get("class_id")
             bbox = d.get("bbox", [0,0,0,0])
             score = d.get("score", 0.0)
 
-            type_name = class_id_to_type_name(class_id)
-            if type_name is None:
+            resolved = waste_type_registry.resolve(class_id)
+            if resolved is None:
                 continue
-
-            waste_type_id = await self.get_waste_type_id(type_name, db)
-            if waste_type_id is None:
-                continue 
+            waste_type_id, type_name = resolved
 
             obj = DetectionObject(
                 waste_type_id=waste_type_id,
@@ -70,17 +53,116 @@ class DetectionService:
             )
             objects.append(obj)
 
-        payload = DetectionCreate(
+        return DetectionCreate(
             trashcan_id=trashcan_id,
-            filename=file.filename,
-            saved_path=f"detect_img/{file.filename}",
+            frame_id=data.get("frame_id"),
+            filename=filename,
+            saved_path=saved_path,
             object_count=len(objects),
             objects=objects,
+            detected_at=detected_at,
         )
 
+    async def detection_mapping(
+        self,
+        data,
+        file,
+        db: SessionDep,
+        trashcan_id: int | None = None,
+    ):
+        # camera_id -> trashcan_id 조회
+        if trashcan_id is None:
+            camera_id = data.get("camera_id")
+            trashcan_id = await self.get_trashcan_id(camera_id, db)
+        if trashcan_id is None:
+            camera_id = data.get("camera_id")
+            raise HTTPException(
+                status_code=400,
+                detail=self._unknown_trashcan_message(camera_id),
+            )
+        # 이미 저장된 프레임 재전송이면 이미지/통계 모두 건너뜀
+        if recent_frames.seen(trashcan_id, data.get("frame_id")):
+            return None
+        await waste_type_registry.ensure_loaded(db)
+        stored = await image_storage.save(file, trashcan_id)
+        payload = self.build_detection_payload(data, trashcan_id, file.filename, stored.path)
         await self.save_detection(payload, db)
         return None
 
+    async def save_detection_batch(self, items: list[dict], db: SessionDep) -> int:
+        # 중복 프레임은 실패가 아니므로 처리 완료로 셈
+        results = await self.save_detection_batch_results(items, db)
+        return sum(1 for result in results if result["status"] in ("saved", "duplicate"))
+
+    async def save_detection_batch_results(self, items: list[dict], db: SessionDep) -> list[dict]:
+        # 프레임 묶음 저장: {"data", "filename", "saved_path", "received_at"}
+        # 반환값은 items 순서대로 {"status", "detail"} (status: saved / duplicate / unknown_trashcan / error)
+        camera_ids = {
+            item["data"].get("camera_id")
+            for item in items
+            if item["data"].get("camera_id") is not None
+        }
+        known_ids = set()
+        if camera_ids:
+            stmt = select(Trashcan.trashcan_id).where(Trashcan.trashcan_id.in_(camera_ids))
+            known_ids = set((await db.execute(stmt)).scalars().all())
+        await waste_type_registry.ensure_loaded(db)
+
+        results: list[dict] = [{"status": "saved", "detail": None} for _ in items]
+        pending = []
+        for index, item in enumerate(items):
+            data = item["data"]
+            camera_id = data.get("camera_id")
+            if camera_id not in known_ids:
+                message = self._unknown_trashcan_message(camera_id)
+                await self.save_trashcan_error_log(
+                    None,
+                    camera_id,
+                    400,
+                    message,
+                    data.get("timestamp"),
+                    db,
+                )
+                results[index] = {"status": "unknown_trashcan", "detail": message}
+                continue
+            payload = self.build_detection_payload(
+                data,
+                camera_id,
+                item.get("filename"),
+                item.get("saved_path"),
+                item.get("received_at"),
+            )
+            pending.append((index, data, payload))
+        if not pending:
+            return results
+
+        try:
+            applied = await self.save_detections([payload for _, _, payload in pending], db)
+            for (index, _, _), saved in zip(pending, applied):
+                if not saved:
+                    results[index] = {"status": "duplicate", "detail": None}
+            return results
+        except Exception:
+            await db.rollback()
+
+        # 묶음 저장 실패 시 프레임 단위로 재시도하여 정상 프레임은 살림
+        for index, data, payload in pending:
+            try:
+                if not (await self.save_detections([payload], db))[0]:
+                    results[index] = {"status": "duplicate", "detail": None}
+            except Exception as exc:
+                await db.rollback()
+                await self.save_trashcan_error_log(
+                    payload.trashcan_id,
+                    data.get("camera_id"),
+                    500,
+                    str(exc),
+                    data.get("timestamp"),
+                    db,
+                )
+                results[index] = {"status": "error", "detail": str(exc)}
+        return results
+
     async def save_trashcan_error_log(
         self,
         trashcan_id: int | None,
@@ -90,62 +172,10 @@ class DetectionService:
         occurred_at: str | None,
         db: SessionDep,
     ) -> None:
-        if trashcan_id is not None:
-            if not await self._ensure_trashcan_exists(trashcan_id, db):
-                return
-        occurred_value = None
-        if occurred_at:
-            try:
-                normalized = occurred_at.replace("Z", "+00:00")
-                occurred_value = datetime.fromisoformat(normalized)
-            except ValueError:
-                occurred_value = None
-        effective_time = occurred_value or datetime.now()
-        if effective_time.tzinfo is not None:
-            effective_time = effective_time.astimezone(tz=None).replace(tzinfo=None)
-        base_stmt = (
-            select(TrashcanErrorLog)
-            .where(TrashcanErrorLog.status_code == status_code)
-            .where(TrashcanErrorLog.message == message)
-        )
-        if trashcan_id is not None:
-            base_stmt = base_stmt.where(TrashcanErrorLog.trashcan_id == trashcan_id)
-        else:
-            base_stmt = base_stmt.where(TrashcanErrorLog.trashcan_id.is_(None))
-            base_stmt = base_stmt.where(TrashcanErrorLog.camera_id == camera_id)
-        last_log = (
-            await db.execute(
-                base_stmt.order_by(
-                    desc(TrashcanErrorLog.created_at),
-                    desc(TrashcanErrorLog.id),
-                ).limit(1)
-            )
-        ).scalar_one_or_none()
-        if last_log:
-            last_time = last_log.last_occurred_at or last_log.created_at
-            if last_time and last_time.tzinfo is not None:
-                last_time = last_time.astimezone(tz=None).replace(tzinfo=None)
-            if last_time and effective_time - last_time <= timedelta(minutes=1):
-                last_log.repeat_count = (last_log.repeat_count or 1) + 1
-                last_log.last_occurred_at = effective_time
-                await db.commit()
-                return
-        log = TrashcanErrorLog(
-            trashcan_id=trashcan_id,
-            camera_id=camera_id,
-            status_code=status_code,
-            message=message,
-            occurred_at=occurred_value,
-            last_occurred_at=effective_time,
-            repeat_count=1,
-        )
-        db.add(log)
-        await db.commit()
-        return
-
-    async def get_waste_type_id(self, type_name: str, db: SessionDep) -> int | None:
-        stmt = select(WasteType.waste_type_id).where(WasteType.type_name == type_name)
-        return (await db.execute(stmt)).scalar_one_or_none()
+        # 1분 구간 안의 같은 에러는 메모리에서 합산하고 백그라운드에서 일괄 저장
+        error_log_coalescer.record(trashcan_id, camera_id, status_code, message, occurred_at)
+        if not error_log_coalescer.enabled:
+            await error_log_coalescer.flush(db)
 
     async def get_trashcan_id(self, trashcan_id_value: int | str | None, db: SessionDep) -> int | None:
         if trashcan_id_value is None:
@@ -157,74 +187,316 @@ class DetectionService:
         stmt = select(Trashcan.trashcan_id).where(Trashcan.trashcan_id == trashcan_id)
         return (await db.execute(stmt)).scalar_one_or_none()
 
-    async def update_trashcan_online(self, trashcan_id: int, db: SessionDep) -> None:
-        stmt = select(Trashcan).where(Trashcan.trashcan_id == trashcan_id)
-        target = (await db.execute(stmt)).scalar_one_or_none()
-        if not target:
-            return
-        target.is_online = True
-        target.last_connected_at = datetime.now()
-        await db.commit()
-    
     async def save_detection(self, payload: DetectionCreate, db: SessionDep):
-        #detection 저장
-        detection = Detection(
-            trashcan_id=payload.trashcan_id,
-            image_name=payload.filename,
-            image_path=payload.saved_path,
-            detected_at=datetime.now(),
-            object_count=payload.object_count,
-        )
-        db.add(detection)
-        await db.commit()
-        await db.refresh(detection)
-
-        #detection_detail 저장
-        for obj in payload.objects:
-            detail = DetectionDetail(
-                detection_id=detection.detection_id,
-                waste_type_id=obj.waste_type_id,
-                confidence=obj.confidence,
-                bbox_x1=obj.box.x1,
-                bbox_y1=obj.box.y1,
-                bbox_x2=obj.box.x2,
-                bbox_y2=obj.box.y2,
-            )
-            db.add(detail)
-        await db.commit()
+        await self.save_detections([payload], db)
+
+    async def save_detections(self, payloads: list[DetectionCreate], db: SessionDep) -> list[bool]:
+        # 한 트랜잭션 안에서 프레임/객체 개수와 무관하게 고정된 수의 쿼리로 저장
+        # (단건 최대 9개, 묶음 최대 10개: 잠금, 중복 확인, MAX, detection/detail INSERT, trashcan UPDATE, 통계 upsert 3개, 묶음만 id 재조회)
+        # 반환값: payload별 저장 여부 (False = 이미 저장된 frame_id라 건너뜀)
+        applied = [False] * len(payloads)
+        if not payloads:
+            return applied
+        now = datetime.now()
+
+        # 같은 묶음 안의 재전송, 최근 저장된 프레임은 DB 조회 없이 건너뜀
+        candidates = []
+        batch_keys = set()
+        for index, payload in enumerate(payloads):
+            frame_key = recent_frames.key(payload.trashcan_id, payload.frame_id)
+            if frame_key is not None:
+                if frame_key in batch_keys or recent_frames.seen(*frame_key):
+                    continue
+                batch_keys.add(frame_key)
+            candidates.append((index, payload, frame_key))
+        if not candidates:
+            await db.commit()
+            return applied
+        trashcan_ids = sorted({payload.trashcan_id for _, payload, _ in candidates})
 
-        #trashcan 수거량 업데이트
-        target_trashcan = (
+        # trashcan 행 배타 잠금을 트랜잭션 첫 잠금으로 잡음 (trashcan_id 순서)
+        # detection INSERT의 FK 공유 잠금이 나중에 배타 잠금으로 올라가며 동시 수신/상태 갱신과 교착되지 않게 함
+        # 갱신 전 상태는 daily_stats의 city 키, 실시간 이벤트(온라인 전환/적재율) 계산에도 씀
+        before_rows = (
             await db.execute(
-                select(Trashcan).where(Trashcan.trashcan_id == payload.trashcan_id)
+                select(
+                    Trashcan.trashcan_id,
+                    Trashcan.trashcan_city,
+                    Trashcan.is_online,
+                    Trashcan.current_volume,
+                    Trashcan.trashcan_capacity,
+                )
+                .where(Trashcan.trashcan_id.in_(trashcan_ids))
+                .order_by(Trashcan.trashcan_id)
+                .with_for_update()
             )
-        ).scalar_one_or_none()
-        if target_trashcan:
-            target_trashcan.current_volume = (target_trashcan.current_volume or 0) + payload.object_count
+        ).all()
+
+        #이미 저장된 frame_id 제외 (잠금 이후 조회라 같은 trashcan의 동시 수신과 겹치지 않음)
+        frame_keys = [frame_key for _, _, frame_key in candidates if frame_key is not None]
+        if frame_keys:
+            stored_keys = set(
+                (
+                    await db.execute(
+                        select(Detection.trashcan_id, Detection.frame_id).where(
+                            Detection.trashcan_id.in_({trashcan_id for trashcan_id, _ in frame_keys}),
+                            Detection.frame_id.in_({frame_id for _, frame_id in frame_keys}),
+                        )
+                    )
+                ).all()
+            )
+            for _, _, frame_key in candidates:
+                if frame_key in stored_keys:
+                    recent_frames.db_duplicates += 1
+                    recent_frames.add(*frame_key)
+            candidates = [candidate for candidate in candidates if candidate[2] not in stored_keys]
+            if not candidates:
+                await db.commit()
+                return applied
+
+        #detection 저장 (multi-row insert)
+        packed_flags = [
+            DETECTION_STORAGE_MODE == "packed" and bool(payload.objects) and can_pack(payload.objects)
+            for _, payload, _ in candidates
+        ]
+        detection_rows = [
+            {
+                "trashcan_id": payload.trashcan_id,
+                "frame_id": payload.frame_id,
+                "image_name": payload.filename,
+                "image_path": payload.saved_path,
+                "detected_at": payload.detected_at or now,
+                "object_count": payload.object_count,
+                "objects_blob": pack_objects(payload.objects) if packed else None,
+            }
+            for (_, payload, _), packed in zip(candidates, packed_flags)
+        ]
+        max_before = (
+            await db.execute(select(func.max(Detection.detection_id)))
+        ).scalar_one_or_none() or 0
+        # (trashcan_id, frame_id) 중복만 아무 변경 없이 넘어가고, FK/길이 초과 등 다른 오류는 그대로 예외
+        detection_stmt = mysql_insert(Detection).values(detection_rows)
+        detection_stmt = detection_stmt.on_duplicate_key_update(
+            detection_id=func.last_insert_id(Detection.detection_id)
+        )
+        result = await db.execute(detection_stmt)
+        if len(candidates) == 1:
+            # 한 행이면 다시 읽지 않음, 중복이면 LAST_INSERT_ID(detection_id)로 기존 id(max_before 이하)가 돌아옴
+            detection_id = result.lastrowid
+            detection_ids = [detection_id if detection_id and detection_id > max_before else None]
+            if detection_ids[0] is None and candidates[0][2] is None:
+                raise RuntimeError("detection insert mismatch: frame without frame_id was not inserted")
+        else:
+            # 한 INSERT의 auto increment 값은 행 순서대로 증가 (잠금 중이라 같은 trashcan에 다른 트랜잭션 행 없음)
+            inserted_rows = (
+                await db.execute(
+                    select(Detection.detection_id, Detection.trashcan_id, Detection.frame_id)
+                    .where(
+                        Detection.detection_id > max_before,
+                        Detection.trashcan_id.in_(trashcan_ids),
+                    )
+                    .order_by(Detection.detection_id)
+                )
+            ).all()
+            detection_ids = self._match_inserted_rows(candidates, inserted_rows)
+
+        detail_rows = []
+        new_frame_keys = []
+        for (index, payload, frame_key), packed, detection_id in zip(candidates, packed_flags, detection_ids):
+            if detection_id is None:
+                recent_frames.db_duplicates += 1
+                recent_frames.add(*frame_key)
+                continue
+            applied[index] = True
+            if frame_key is not None:
+                new_frame_keys.append(frame_key)
+            if packed:
+                continue
+            for obj in payload.objects:
+                detail_rows.append(
+                    {
+                        "detection_id": detection_id,
+                        "waste_type_id": obj.waste_type_id,
+                        "confidence": obj.confidence,
+                        "bbox_x1": obj.box.x1,
+                        "bbox_y1": obj.box.y1,
+                        "bbox_x2": obj.box.x2,
+                        "bbox_y2": obj.box.y2,
+                    }
+                )
+        payloads = [payload for payload, saved in zip(payloads, applied) if saved]
+        if not payloads:
             await db.commit()
+            return applied
 
-        #trashcan_city 조회
-        trashcan_city = (
-            await db.execute(
-                select(Trashcan.trashcan_city).where(Trashcan.trashcan_id == payload.trashcan_id)
+        #detection_detail 저장 (multi-row insert)
+        if detail_rows:
+            await db.execute(insert(DetectionDetail), detail_rows)
+
+        #trashcan 온라인 상태 + 수거량 업데이트
+        volume_by_trashcan = Counter()
+        for payload in payloads:
+            volume_by_trashcan[payload.trashcan_id] += payload.object_count
+        has_objects = any(payload.objects for payload in payloads)
+        await db.execute(
+            update(Trashcan)
+            .where(Trashcan.trashcan_id.in_(volume_by_trashcan.keys()))
+            .values(
+                is_online=True,
+                last_connected_at=now,
+                current_volume=func.coalesce(Trashcan.current_volume, 0)
+                + case(volume_by_trashcan, value=Trashcan.trashcan_id, else_=0),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        #trashcan_stats 누적 (trashcan 기준 upsert)
+        rollup_by_trashcan = {}
+        type_counts = Counter()
+        for payload in payloads:
+            detected_at = payload.detected_at or now
+            collected, events, last_detected_at = rollup_by_trashcan.get(
+                payload.trashcan_id, (0, 0, detected_at)
+            )
+            rollup_by_trashcan[payload.trashcan_id] = (
+                collected + payload.object_count,
+                events + 1,
+                max(last_detected_at, detected_at),
+            )
+            for obj in payload.objects:
+                type_counts[(payload.trashcan_id, obj.waste_type_id)] += 1
+        rollup_stmt = mysql_insert(TrashcanStats).values(
+            [
+                {
+                    "trashcan_id": trashcan_id,
+                    "total_collected": collected,
+                    "total_events": events,
+                    "cycle_events": events,
+                    "last_detected_at": last_detected_at,
+                }
+                for trashcan_id, (collected, events, last_detected_at) in rollup_by_trashcan.items()
+            ]
+        )
+        rollup_stmt = rollup_stmt.on_duplicate_key_update(
+            total_collected=TrashcanStats.total_collected + rollup_stmt.inserted.total_collected,
+            total_events=TrashcanStats.total_events + rollup_stmt.inserted.total_events,
+            cycle_events=TrashcanStats.cycle_events + rollup_stmt.inserted.cycle_events,
+            last_detected_at=func.greatest(
+                func.coalesce(TrashcanStats.last_detected_at, rollup_stmt.inserted.last_detected_at),
+                rollup_stmt.inserted.last_detected_at,
+            ),
+        )
+        await db.execute(rollup_stmt)
+        if type_counts:
+            type_stmt = mysql_insert(TrashcanTypeStats).values(
+                [
+                    {
+                        "trashcan_id": trashcan_id,
+                        "waste_type_id": waste_type_id,
+                        "detection_count": count,
+                    }
+                    for (trashcan_id, waste_type_id), count in type_counts.items()
+                ]
+            )
+            type_stmt = type_stmt.on_duplicate_key_update(
+                detection_count=TrashcanTypeStats.detection_count + type_stmt.inserted.detection_count
             )
-        ).scalar_one()
-
-        #daily_stats 저장
-        for obj in payload.objects:
-            daily = select(DailyStats).where(
-                DailyStats.stats_date == date.today(),
-                DailyStats.trashcan_city == trashcan_city,
-                DailyStats.waste_type_id == obj.waste_type_id,
+            await db.execute(type_stmt)
+
+        #daily_stats 저장 (date/city/type 기준 upsert)
+        if has_objects:
+            # city가 없는 쓰레기통은 '' (dailystats.trashcan_city NOT NULL)
+            city_by_trashcan = {row.trashcan_id: row.trashcan_city or "" for row in before_rows}
+            stats_counts = Counter()
+            for payload in payloads:
+                stats_date = (payload.detected_at or now).date()
+                trashcan_city = city_by_trashcan.get(payload.trashcan_id, "")
+                for obj in payload.objects:
+                    stats_counts[(stats_date, trashcan_city, obj.waste_type_id)] += 1
+            stats_stmt = mysql_insert(DailyStats).values(
+                [
+                    {
+                        "stats_date": stats_date,
+                        "trashcan_city": trashcan_city,
+                        "waste_type_id": waste_type_id,
+                        "detection_count": count,
+                    }
+                    for (stats_date, trashcan_city, waste_type_id), count in stats_counts.items()
+                ]
+            )
+            stats_stmt = stats_stmt.on_duplicate_key_update(
+                detection_count=func.coalesce(DailyStats.detection_count, 0)
+                + stats_stmt.inserted.detection_count
             )
-            stats = (await db.execute(daily)).scalar_one_or_none()
-            if stats:
-                stats.detection_count = (stats.detection_count or 0) + 1
+            await db.execute(stats_stmt)
+        await db.commit()
+        for frame_key in new_frame_keys:
+            recent_frames.add(*frame_key)
+        dashboard_cache.invalidate_later("dashboard:")
+        for payload in payloads:
+            fill_forecaster.observe(payload.trashcan_id, payload.detected_at or now, payload.object_count)
+        if event_bus.has_subscribers:
+            self._publish_detection_events(payloads, before_rows, rollup_by_trashcan, now)
+        return applied
+
+    def _match_inserted_rows(self, candidates, inserted_rows) -> list[int | None]:
+        # INSERT 순서대로 새 detection_id를 대응, 중복으로 건너뛴 frame은 None
+        detection_ids = []
+        position = 0
+        for _, payload, frame_key in candidates:
+            row = inserted_rows[position] if position < len(inserted_rows) else None
+            if row is not None and row.trashcan_id == payload.trashcan_id and (
+                (row.trashcan_id, row.frame_id) == frame_key
+                if frame_key is not None
+                else row.frame_id is None
+            ):
+                detection_ids.append(row.detection_id)
+                position += 1
+            elif frame_key is not None:
+                detection_ids.append(None)
             else:
-                db.add(DailyStats(
-                    stats_date=date.today(),
-                    trashcan_city=trashcan_city,
-                    waste_type_id=obj.waste_type_id,
-                    detection_count=1,
-                ))
-        await db.commit()
\ No newline at end of file
+                raise RuntimeError("detection insert mismatch: frame without frame_id was not inserted")
+        if position != len(inserted_rows):
+            raise RuntimeError(
+                f"detection insert mismatch: expected {position}, found {len(inserted_rows)}"
+            )
+        return detection_ids
+
+    def _publish_detection_events(self, payloads, before_rows, rollup_by_trashcan, now: datetime) -> None:
+        counts_by_trashcan = {}
+        for payload in payloads:
+            counts = counts_by_trashcan.setdefault(payload.trashcan_id, Counter())
+            for obj in payload.objects:
+                counts[obj.type_name] += 1
+        for row in before_rows:
+            # 프레임이 모두 중복이었던 쓰레기통은 저장된 게 없으므로 알리지 않음
+            if row.trashcan_id not in rollup_by_trashcan:
+                continue
+            collected, events, last_detected_at = rollup_by_trashcan[row.trashcan_id]
+            event_bus.publish(
+                "detection",
+                {
+                    "trashcan_id": row.trashcan_id,
+                    "events": events,
+                    "objects": collected,
+                    "items_by_type": dict(counts_by_trashcan.get(row.trashcan_id, {})),
+                    "last_detected_at": last_detected_at,
+                },
+            )
+            if collected:
+                current_volume = (row.current_volume or 0) + collected
+                event_bus.publish(
+                    "fill_rate",
+                    {
+                        "trashcan_id": row.trashcan_id,
+                        "current_volume": current_volume,
+                        "capacity": row.trashcan_capacity,
+                        "fill_rate": round(current_volume * 100.0 / row.trashcan_capacity, 2)
+                        if row.trashcan_capacity else None,
+                    },
+                )
+            if not row.is_online:
+                event_bus.publish(
+                    "status",
+                    {"trashcan_id": row.trashcan_id, "is_online": True, "last_connected_at": now},
+                )
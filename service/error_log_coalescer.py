@@ -0,0 +1,267 @@
+import asyncio
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import desc, func, insert, select, update
+
+from db.db import SessionDep, async_session_factory
+from db.entity import Trashcan, TrashcanErrorLog
+from service.background_task import PeriodicTask
+from service.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+# 0이면 백그라운드 flush 없이 기록 즉시 DB에 반영
+ERROR_LOG_FLUSH_SECONDS = float(os.getenv("ERROR_LOG_FLUSH_SECONDS", "5"))
+ERROR_LOG_WINDOW = timedelta(minutes=1)
+
+
+def _parse_occurred_at(occurred_at: str | None) -> datetime | None:
+    if not occurred_at:
+        return None
+    try:
+        normalized = occurred_at.replace("Z", "+00:00")
+        return datetime.fromisoformat(normalized)
+    except ValueError:
+        return None
+
+
+def _naive_local(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(tz=None).replace(tzinfo=None)
+    return value
+
+
+class _PendingLog:
+    __slots__ = (
+        "trashcan_id", "camera_id", "status_code", "message", "occurred_at",
+        "first_time", "last_time", "count", "persisted", "row_id", "lookup",
+    )
+
+    def __init__(self, trashcan_id, camera_id, status_code, message, occurred_at, effective_time, lookup):
+        self.trashcan_id = trashcan_id
+        self.camera_id = camera_id
+        self.status_code = status_code
+        self.message = message
+        self.occurred_at = occurred_at
+        self.first_time = effective_time
+        self.last_time = effective_time
+        self.count = 1
+        self.persisted = 0
+        self.row_id: int | None = None
+        # 프로세스 시작 후 첫 구간이면 DB의 최근 행을 이어서 씀
+        self.lookup = lookup
+
+    @property
+    def dirty(self) -> bool:
+        return self.count > self.persisted
+
+
+class ErrorLogCoalescer:
+    # (trashcan_id, camera_id, status_code, message 해시)별로 1분 구간 안의 반복을 메모리에서 합산 후 일괄 저장
+    def __init__(self, interval: float = ERROR_LOG_FLUSH_SECONDS, window: timedelta = ERROR_LOG_WINDOW):
+        self.window = window
+        self.task = PeriodicTask("error-log-flush", interval, self.flush)
+        self._open: dict[tuple, _PendingLog] = {}
+        self._closed: list[_PendingLog] = []
+        # 주기 flush와 수동/종료 flush가 같은 항목을 두 번 저장하지 않도록 한 번에 하나만 실행
+        self._lock = asyncio.Lock()
+        self.recorded = 0
+        self.flushes = 0
+        self.inserted = 0
+        self.updated = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.task.running
+
+    async def start(self) -> None:
+        await self.task.start()
+
+    async def stop(self) -> None:
+        # 진행 중인 flush는 취소하지 않고 끝날 때까지 기다린 뒤 주기 작업을 멈추고 남은 로그 저장
+        async with self._lock:
+            await self.task.stop()
+        await self.flush()
+
+    def record(
+        self,
+        trashcan_id: int | None,
+        camera_id: int | None,
+        status_code: int,
+        message: str | None,
+        occurred_at: str | None,
+    ) -> None:
+        occurred_value = _parse_occurred_at(occurred_at)
+        effective_time = _naive_local(occurred_value or datetime.now())
+        raw = message.encode() if message is not None else b"\x00"
+        key = (trashcan_id, camera_id, status_code, hashlib.blake2b(raw, digest_size=16).digest())
+        self.recorded += 1
+
+        entry = self._open.get(key)
+        if entry is not None and effective_time - entry.last_time <= self.window:
+            entry.count += 1
+            entry.last_time = max(entry.last_time, effective_time)
+            return
+        if entry is not None and entry.dirty:
+            self._closed.append(entry)
+        event_bus.publish(
+            "error_log",
+            {
+                "trashcan_id": trashcan_id,
+                "camera_id": camera_id,
+                "status_code": status_code,
+                "message": message,
+                "occurred_at": effective_time,
+            },
+        )
+        self._open[key] = _PendingLog(
+            trashcan_id,
+            camera_id,
+            status_code,
+            message,
+            occurred_value,
+            effective_time,
+            lookup=entry is None,
+        )
+
+    async def flush(self, db: SessionDep | None = None) -> int:
+        async with self._lock:
+            if db is None:
+                async with async_session_factory() as session:
+                    return await self._flush(session)
+            return await self._flush(db)
+
+    async def _flush(self, db: SessionDep) -> int:
+        closed, self._closed = self._closed, []
+        entries = closed + [entry for entry in self._open.values() if entry.dirty]
+        if not entries:
+            self._prune()
+            return 0
+        # flush 도중 들어온 반복은 다음 flush에서 반영
+        snapshot = [(entry, entry.count, entry.last_time) for entry in entries]
+
+        row_ids = {}
+        written = 0
+        try:
+            trashcan_ids = {entry.trashcan_id for entry in entries if entry.trashcan_id is not None}
+            active_ids = set()
+            if trashcan_ids:
+                stmt = (
+                    select(Trashcan.trashcan_id)
+                    .where(Trashcan.trashcan_id.in_(trashcan_ids))
+                    .where(Trashcan.is_deleted == False)
+                )
+                active_ids = set((await db.execute(stmt)).scalars().all())
+
+            for entry, count, last_time in snapshot:
+                if entry.trashcan_id is not None and entry.trashcan_id not in active_ids:
+                    continue
+                delta = count - entry.persisted
+                row_id = entry.row_id
+                if row_id is None and entry.lookup:
+                    row_id = await self._continuable_row_id(entry, db)
+                if row_id is None:
+                    result = await db.execute(
+                        insert(TrashcanErrorLog).values(
+                            trashcan_id=entry.trashcan_id,
+                            camera_id=entry.camera_id,
+                            status_code=entry.status_code,
+                            message=entry.message,
+                            occurred_at=entry.occurred_at,
+                            last_occurred_at=last_time,
+                            repeat_count=delta,
+                        )
+                    )
+                    row_ids[id(entry)] = result.inserted_primary_key[0]
+                    self.inserted += 1
+                else:
+                    await db.execute(
+                        update(TrashcanErrorLog)
+                        .where(TrashcanErrorLog.id == row_id)
+                        .values(
+                            repeat_count=func.coalesce(TrashcanErrorLog.repeat_count, 1) + delta,
+                            last_occurred_at=last_time,
+                        )
+                    )
+                    row_ids[id(entry)] = row_id
+                    self.updated += 1
+                written += 1
+            await db.commit()
+        except BaseException:
+            # 취소(CancelledError)도 포함, 꺼낸 항목을 먼저 되돌려 다음 flush에서 다시 저장
+            self._closed = closed + self._closed
+            await db.rollback()
+            raise
+
+        for entry, count, _ in snapshot:
+            if entry.trashcan_id is not None and entry.trashcan_id not in active_ids:
+                # 삭제/미등록 쓰레기통 로그는 기존과 같이 버림
+                self.dropped += count - entry.persisted
+            entry.persisted = count
+            entry.lookup = False
+            entry.row_id = row_ids.get(id(entry), entry.row_id)
+        self.flushes += 1
+        self._prune()
+        return written
+
+    async def _continuable_row_id(self, entry: _PendingLog, db: SessionDep) -> int | None:
+        stmt = (
+            select(
+                TrashcanErrorLog.id,
+                TrashcanErrorLog.last_occurred_at,
+                TrashcanErrorLog.created_at,
+            )
+            .where(TrashcanErrorLog.status_code == entry.status_code)
+            .where(TrashcanErrorLog.message == entry.message)
+        )
+        if entry.trashcan_id is not None:
+            stmt = stmt.where(TrashcanErrorLog.trashcan_id == entry.trashcan_id)
+        else:
+            stmt = stmt.where(TrashcanErrorLog.trashcan_id.is_(None))
+            stmt = stmt.where(TrashcanErrorLog.camera_id == entry.camera_id)
+        row = (
+            await db.execute(
+                stmt.order_by(
+                    desc(TrashcanErrorLog.created_at),
+                    desc(TrashcanErrorLog.id),
+                ).limit(1)
+            )
+        ).first()
+        if row is None:
+            return None
+        last_time = _naive_local(row.last_occurred_at or row.created_at)
+        # 첫 발생 시각이 기존 행의 마지막 발생으로부터 1분 이내면 같은 행에 누적
+        if last_time and entry.first_time - last_time <= self.window:
+            return row.id
+        return None
+
+    def _prune(self) -> None:
+        # 구간이 끝났고 모두 저장된 키는 메모리에서 제거
+        cutoff = datetime.now() - self.window
+        stale = [
+            key for key, entry in self._open.items()
+            if not entry.dirty and entry.last_time < cutoff
+        ]
+        for key in stale:
+            del self._open[key]
+
+    def stats(self) -> dict:
+        return {
+            "running": self.task.running,
+            "interval_seconds": self.task.interval,
+            "open_keys": len(self._open),
+            "pending": sum(entry.count - entry.persisted for entry in self._open.values())
+            + sum(entry.count - entry.persisted for entry in self._closed),
+            "recorded": self.recorded,
+            "flushes": self.flushes,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "dropped": self.dropped,
+        }
+
+
+error_log_coalescer = ErrorLogCoalescer()
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+from datetime import datetime
+from itertools import count
+
+# 구독자별 최대 대기 이벤트 수, 넘치면 느린 구독자로 보고 연결을 끊음
+EVENT_BUFFER_SIZE = int(os.getenv("EVENT_BUFFER_SIZE", "256"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+
+EVENT_TYPES = ("detection", "fill_rate", "status", "error_log", "collection")
+
+
+class Subscriber:
+    def __init__(self, types: set[str] | None, maxsize: int):
+        self.types = types
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    def wants(self, event_type: str) -> bool:
+        return self.types is None or event_type in self.types
+
+
+class EventBus:
+    # 프로세스 내부 pub/sub: publish는 대기하지 않으며, 버퍼가 찬 구독자만 끊어 다른 구독자/수신 경로에 영향 없음
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self._subscribers: set[Subscriber] = set()
+        self._ids = count(1)
+        self.published = 0
+        self.delivered = 0
+        self.dropped_subscribers = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, types: set[str] | None = None) -> Subscriber:
+        subscriber = Subscriber(types, self.buffer_size)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event_type: str, data: dict) -> None:
+        if not self._subscribers:
+            return
+        event = {
+            "id": next(self._ids),
+            "type": event_type,
+            "data": data,
+            "published_at": datetime.now().isoformat(),
+        }
+        self.published += 1
+        for subscriber in list(self._subscribers):
+            if not subscriber.wants(event_type):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+                self.delivered += 1
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        # 밀린 이벤트는 버리고 resync 이벤트 하나만 남겨 클라이언트가 전체 조회 후 재구독하게 함
+        self._subscribers.discard(subscriber)
+        subscriber.dropped = True
+        self.dropped_subscribers += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(
+            {"id": next(self._ids), "type": "resync", "data": {"reason": "slow consumer"}}
+        )
+
+    async def stream(self, types: set[str] | None = None, heartbeat: float = EVENT_HEARTBEAT_SECONDS):
+        # SSE 형식으로 변환, 이벤트가 없으면 주기적으로 주석 줄을 보내 연결 유지
+        subscriber = self.subscribe(types)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                payload = json.dumps(event["data"], ensure_ascii=False, default=str)
+                yield f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+                if subscriber.dropped and subscriber.queue.empty():
+                    return
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "buffer_size": self.buffer_size,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped_subscribers": self.dropped_subscribers,
+        }
+
+
+event_bus = EventBus()
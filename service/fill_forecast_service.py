@@ -0,0 +1,235 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlmodel import select
+from sqlalchemy import func, literal_column
+
+from db.db import SessionDep
+from db.entity import Detection, Trashcan
+
+# 최근 며칠의 탐지 이력으로 적재 속도를 추정할지
+FORECAST_WINDOW_DAYS = int(os.getenv("FORECAST_WINDOW_DAYS", "14"))
+# 회귀에 쓰는 시간 구간 크기(분)
+FORECAST_BUCKET_MINUTES = int(os.getenv("FORECAST_BUCKET_MINUTES", "60"))
+# DB에서 전체 이력을 다시 읽는 주기(초), 그 사이에는 수신된 디텍션만 메모리에 반영
+FORECAST_RELOAD_SECONDS = int(os.getenv("FORECAST_RELOAD_SECONDS", "3600"))
+
+
+def fit_fill_rates(counts: np.ndarray) -> np.ndarray:
+    # counts: (쓰레기통 수, 구간 수) 구간별 탐지 개수
+    # 누적 개수 ~ 시간 에 대한 최소제곱 기울기(구간당 개수)를 모든 쓰레기통에 대해 한 번에 계산
+    buckets = counts.shape[1]
+    if buckets < 2:
+        return np.zeros(counts.shape[0])
+    cumulative = np.cumsum(counts, axis=1)
+    x = np.arange(buckets, dtype=np.float64)
+    x_centered = x - x.mean()
+    y_centered = cumulative - cumulative.mean(axis=1, keepdims=True)
+    slopes = (y_centered @ x_centered) / (x_centered @ x_centered)
+    return np.maximum(slopes, 0.0)
+
+
+class FillForecaster:
+    def __init__(
+        self,
+        window_days: int = FORECAST_WINDOW_DAYS,
+        bucket_minutes: int = FORECAST_BUCKET_MINUTES,
+        reload_seconds: int = FORECAST_RELOAD_SECONDS,
+    ):
+        self.bucket = timedelta(minutes=bucket_minutes)
+        self.buckets = max(int(timedelta(days=window_days) / self.bucket), 2)
+        self.reload_seconds = reload_seconds
+        self._rows: dict[int, int] = {}
+        self._counts = np.zeros((0, self.buckets))
+        self._origin: datetime | None = None
+        self._rates: np.ndarray | None = None
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+        self.reloads = 0
+        self.refits = 0
+        self.observed = 0
+        self.last_fit_ms = 0.0
+        self.last_reload_ms = 0.0
+
+    def _window_origin(self, now: datetime) -> datetime:
+        # 현재 시각이 속한 구간이 마지막 열이 되도록 시작 시각을 맞춤
+        minutes = int(self.bucket.total_seconds() // 60)
+        floored = now.replace(second=0, microsecond=0)
+        floored -= timedelta(minutes=(floored.hour * 60 + floored.minute) % minutes)
+        return floored - self.bucket * (self.buckets - 1)
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return time.monotonic() - self._loaded_at < self.reload_seconds
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    async def ensure_loaded(self, db: SessionDep) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            await self.reload(db)
+
+    async def reload(self, db: SessionDep) -> None:
+        started = time.perf_counter()
+        origin = self._window_origin(datetime.now())
+        bucket_minutes = int(self.bucket.total_seconds() // 60)
+        bucket_index = func.floor(
+            func.timestampdiff(literal_column("MINUTE"), origin, Detection.detected_at) / bucket_minutes
+        ).label("bucket_index")
+        stmt = (
+            select(
+                Detection.trashcan_id,
+                bucket_index,
+                func.sum(Detection.object_count).label("total"),
+            )
+            .where(Detection.detected_at >= origin)
+            # 바인드 파라미터가 들어간 식 대신 별칭으로 묶어야 ONLY_FULL_GROUP_BY에서 같은 식으로 인식됨
+            .group_by(Detection.trashcan_id, literal_column("bucket_index"))
+        )
+        rows = (await db.execute(stmt)).all()
+        trashcan_ids = (
+            await db.execute(select(Trashcan.trashcan_id).where(Trashcan.is_deleted == False))
+        ).scalars().all()
+
+        row_of = {trashcan_id: position for position, trashcan_id in enumerate(trashcan_ids)}
+        counts = np.zeros((len(row_of), self.buckets))
+        if rows:
+            ids = np.fromiter((row_of.get(row.trashcan_id, -1) for row in rows), dtype=np.int64, count=len(rows))
+            cols = np.fromiter((int(row.bucket_index) for row in rows), dtype=np.int64, count=len(rows))
+            totals = np.fromiter((float(row.total or 0) for row in rows), dtype=np.float64, count=len(rows))
+            valid = (ids >= 0) & (cols >= 0) & (cols < self.buckets)
+            np.add.at(counts, (ids[valid], cols[valid]), totals[valid])
+
+        self._rows = row_of
+        self._counts = counts
+        self._origin = origin
+        self._rates = None
+        self._loaded_at = time.monotonic()
+        self.reloads += 1
+        self.last_reload_ms = (time.perf_counter() - started) * 1000
+
+    def _advance(self, now: datetime) -> None:
+        # 구간이 넘어가면 오래된 열을 버리고 새 열을 0으로 채움
+        if self._origin is None:
+            return
+        shift = int((now - self._origin) / self.bucket) - (self.buckets - 1)
+        if shift <= 0:
+            return
+        if shift >= self.buckets:
+            self._counts[:] = 0
+        else:
+            self._counts[:, :-shift] = self._counts[:, shift:]
+            self._counts[:, -shift:] = 0
+        self._origin += self.bucket * shift
+        self._rates = None
+
+    def observe(self, trashcan_id: int, detected_at: datetime, object_count: int) -> None:
+        # 저장된 디텍션을 DB 재조회 없이 해당 구간에 더함
+        if self._origin is None or not object_count:
+            return
+        self._advance(max(detected_at, datetime.now()))
+        column = int((detected_at - self._origin) / self.bucket)
+        if column < 0 or column >= self.buckets:
+            return
+        row = self._rows.get(trashcan_id)
+        if row is None:
+            row = len(self._rows)
+            self._rows[trashcan_id] = row
+            self._counts = np.vstack([self._counts, np.zeros((1, self.buckets))])
+        self._counts[row, column] += object_count
+        self._rates = None
+        self.observed += 1
+
+    def rates_per_hour(self) -> dict[int, float]:
+        self._advance(datetime.now())
+        if self._rates is None:
+            started = time.perf_counter()
+            self._rates = fit_fill_rates(self._counts) * (3600 / self.bucket.total_seconds())
+            self.refits += 1
+            self.last_fit_ms = (time.perf_counter() - started) * 1000
+        return {trashcan_id: float(self._rates[row]) for trashcan_id, row in self._rows.items()}
+
+    async def get_forecast(
+        self,
+        db: SessionDep,
+        sort: str = "time_to_full",
+        order: str = "asc",
+        limit: int | None = None,
+    ):
+        await self.ensure_loaded(db)
+        rates = self.rates_per_hour()
+        stmt = (
+            select(
+                Trashcan.trashcan_id,
+                Trashcan.trashcan_name,
+                Trashcan.trashcan_capacity,
+                Trashcan.current_volume,
+            )
+            .where(Trashcan.is_deleted == False)
+        )
+        rows = (await db.execute(stmt)).all()
+        now = datetime.now()
+        items = []
+        for row in rows:
+            capacity = row.trashcan_capacity or 0
+            volume = row.current_volume or 0
+            rate = rates.get(row.trashcan_id, 0.0)
+            hours = None
+            if capacity > 0:
+                if volume >= capacity:
+                    hours = 0.0
+                elif rate > 0:
+                    hours = (capacity - volume) / rate
+            items.append(
+                {
+                    "trashcan_id": row.trashcan_id,
+                    "trashcan_name": row.trashcan_name,
+                    "fill_rate": round(volume * 100.0 / capacity, 2) if capacity else None,
+                    "rate_per_hour": round(rate, 4),
+                    "time_to_full_hours": round(hours, 2) if hours is not None else None,
+                    "predicted_full_at": now + timedelta(hours=hours) if hours is not None else None,
+                }
+            )
+
+        key = {
+            "time_to_full": "time_to_full_hours",
+            "fill_rate": "fill_rate",
+            "rate": "rate_per_hour",
+        }[sort]
+        # 값이 없는 항목(적재 속도 0 등)은 정렬 방향과 관계없이 마지막
+        present = [item for item in items if item[key] is not None]
+        missing = [item for item in items if item[key] is None]
+        present.sort(key=lambda item: (item[key], item["trashcan_id"]), reverse=order == "desc")
+        missing.sort(key=lambda item: item["trashcan_id"])
+        ordered = present + missing
+        if limit is not None:
+            ordered = ordered[:limit]
+        return {
+            "window_days": round(self.buckets * self.bucket.total_seconds() / 86400, 2),
+            "generated_at": now,
+            "items": ordered,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "trashcans": len(self._rows),
+            "buckets": self.buckets,
+            "bucket_minutes": int(self.bucket.total_seconds() // 60),
+            "window_start": self._origin,
+            "reloads": self.reloads,
+            "refits": self.refits,
+            "observed": self.observed,
+            "last_reload_ms": round(self.last_reload_ms, 2),
+            "last_fit_ms": round(self.last_fit_ms, 2),
+        }
+
+
+fill_forecaster = FillForecaster()
@@ -0,0 +1,50 @@
+import os
+from collections import OrderedDict
+
+INGEST_DEDUP_CACHE_SIZE = int(os.getenv("INGEST_DEDUP_CACHE_SIZE", "100000"))
+
+
+class RecentFrameCache:
+    # 최근 저장된 (trashcan_id, frame_id) LRU, DB 유니크 인덱스 앞단에서 재전송을 빠르게 걸러냄
+    def __init__(self, maxsize: int = INGEST_DEDUP_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._keys: OrderedDict[tuple[int, str], None] = OrderedDict()
+        self.hits = 0
+        self.db_duplicates = 0
+
+    @staticmethod
+    def key(trashcan_id, frame_id) -> tuple[int, str] | None:
+        if trashcan_id is None or not frame_id:
+            return None
+        try:
+            return int(trashcan_id), str(frame_id)
+        except (TypeError, ValueError):
+            return None
+
+    def seen(self, trashcan_id, frame_id) -> bool:
+        key = self.key(trashcan_id, frame_id)
+        if key is None or key not in self._keys:
+            return False
+        self._keys.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def add(self, trashcan_id, frame_id) -> None:
+        key = self.key(trashcan_id, frame_id)
+        if key is None or self.maxsize <= 0:
+            return
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        while len(self._keys) > self.maxsize:
+            self._keys.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._keys),
+            "capacity": self.maxsize,
+            "cache_hits": self.hits,
+            "db_duplicates": self.db_duplicates,
+        }
+
+
+recent_frames = RecentFrameCache()
@@ -0,0 +1,29 @@
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    # 대원 거리(km), 스칼라/배열 모두 가능 (배열끼리는 브로드캐스팅)
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    dlat = lat2 - lat1
+    dlng = np.radians(lng2) - np.radians(lng1)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_matrix_km(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    # n x n 거리 행렬, 단위 벡터 내적(행렬곱)으로 haversine 항 sin^2(d/2R) = (1 - cos)/2 를 한 번에 계산
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lng = np.radians(np.asarray(lngs, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    unit = np.stack([cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)], axis=1)
+    matrix = unit @ unit.T
+    np.subtract(1.0, matrix, out=matrix)
+    np.multiply(matrix, 0.5, out=matrix)
+    np.clip(matrix, 0.0, 1.0, out=matrix)
+    np.sqrt(matrix, out=matrix)
+    np.arcsin(matrix, out=matrix)
+    matrix *= 2 * EARTH_RADIUS_KM
+    return matrix
@@ -0,0 +1,104 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from fastapi import UploadFile
+
+IMAGE_STORAGE_BACKEND = os.getenv("IMAGE_STORAGE_BACKEND", "local")
+DETECT_IMG_DIR = os.getenv("DETECT_IMG_DIR", "detect_img")
+IMAGE_CHUNK_SIZE = 256 * 1024
+
+
+@dataclass
+class StoredImage:
+    path: str
+    sha256: str
+    size: int
+    deduplicated: bool
+
+
+class ImageStorage(ABC):
+    @abstractmethod
+    async def save(
+        self,
+        file: UploadFile,
+        trashcan_id: int | None,
+        captured_at: datetime | None = None,
+    ) -> StoredImage:
+        ...
+
+
+class LocalImageStorage(ImageStorage):
+    # <root>/YYYY/MM/DD/<trashcan_id>/<sha256>.<ext> 형태로 저장
+    def __init__(self, root: str = DETECT_IMG_DIR, chunk_size: int = IMAGE_CHUNK_SIZE):
+        self.root = Path(root)
+        self.chunk_size = chunk_size
+
+    async def save(
+        self,
+        file: UploadFile,
+        trashcan_id: int | None,
+        captured_at: datetime | None = None,
+    ) -> StoredImage:
+        # 디스크 I/O와 해시 계산은 이벤트 루프 밖(스레드 풀)에서 처리
+        return await asyncio.to_thread(
+            self._save_sync,
+            file.file,
+            file.filename,
+            trashcan_id,
+            captured_at or datetime.now(),
+        )
+
+    def _save_sync(self, source, filename: str | None, trashcan_id: int | None, captured_at: datetime) -> StoredImage:
+        suffix = Path(filename or "").suffix.lower() or ".jpg"
+        shard = Path(captured_at.strftime("%Y/%m/%d")) / (
+            str(trashcan_id) if trashcan_id is not None else "unknown"
+        )
+        target_dir = self.root / shard
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+        source.seek(0)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix=".upload-", suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = source.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    size += len(chunk)
+                    out.write(chunk)
+            name = f"{digest.hexdigest()}{suffix}"
+            target = target_dir / name
+            deduplicated = target.exists()
+            if deduplicated:
+                os.unlink(tmp_path)
+            else:
+                os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+        return StoredImage(
+            path=(self.root / shard / name).as_posix(),
+            sha256=digest.hexdigest(),
+            size=size,
+            deduplicated=deduplicated,
+        )
+
+
+def create_image_storage(backend: str = IMAGE_STORAGE_BACKEND) -> ImageStorage:
+    if backend == "local":
+        return LocalImageStorage()
+    raise ValueError(f"지원하지 않는 IMAGE_STORAGE_BACKEND: {backend}")
+
+
+image_storage = create_image_storage()
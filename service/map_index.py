@@ -0,0 +1,243 @@
+import asyncio
+import math
+import os
+import time
+
+import numpy as np
+from sqlmodel import select
+from sqlalchemy import func
+
+from db.db import SessionDep
+from db.entity import Trashcan
+from service.geo_utils import haversine_km
+
+# 격자 한 칸 크기(도), 0.01도 ≒ 1km
+MAP_GRID_CELL_DEG = float(os.getenv("MAP_GRID_CELL_DEG", "0.01"))
+# 적재율 반영 주기(초), 관리 API 변경은 즉시 무효화
+MAP_INDEX_TTL = int(os.getenv("MAP_INDEX_TTL", "30"))
+# 이 줌 이상이면 개별 좌표, 미만이면 클러스터
+MAP_CLUSTER_MAX_ZOOM = int(os.getenv("MAP_CLUSTER_MAX_ZOOM", "15"))
+# 화면 기준 클러스터 한 칸 크기(px, 256px 타일 기준)
+MAP_CLUSTER_CELL_PX = int(os.getenv("MAP_CLUSTER_CELL_PX", "64"))
+
+
+class TrashcanGridIndex:
+    # 삭제되지 않은 쓰레기통 좌표를 고정 크기 격자에 담아 viewport 조회 시 해당 칸만 확인
+    def __init__(self, cell_deg: float = MAP_GRID_CELL_DEG, ttl: int = MAP_INDEX_TTL):
+        self.cell_deg = cell_deg
+        self.ttl = ttl
+        self._points: dict[int, tuple] = {}
+        self._grid: dict[tuple[int, int], list[int]] = {}
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+        self.rebuilds = 0
+
+    def _cell(self, lat: float, lng: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        if self.ttl <= 0:
+            return True
+        return time.monotonic() - self._loaded_at < self.ttl
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    async def ensure_loaded(self, db: SessionDep) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            await self.refresh(db)
+
+    async def refresh(self, db: SessionDep) -> None:
+        fill_rate = (
+            (func.coalesce(Trashcan.current_volume, 0) * 100.0)
+            / func.nullif(Trashcan.trashcan_capacity, 0)
+        ).label("fill_rate")
+        stmt = (
+            select(
+                Trashcan.trashcan_id,
+                Trashcan.trashcan_name,
+                Trashcan.trashcan_latitude,
+                Trashcan.trashcan_longitude,
+                Trashcan.is_online,
+                fill_rate,
+            )
+            .where(Trashcan.is_deleted == False)
+            .where(Trashcan.trashcan_latitude != None)
+            .where(Trashcan.trashcan_longitude != None)
+        )
+        rows = (await db.execute(stmt)).all()
+        self.build(rows)
+
+    def build(self, rows) -> None:
+        points = {}
+        grid = {}
+        for row in rows:
+            lat = float(row.trashcan_latitude)
+            lng = float(row.trashcan_longitude)
+            rate = float(row.fill_rate) if row.fill_rate is not None else None
+            points[row.trashcan_id] = (
+                row.trashcan_id, row.trashcan_name, lat, lng, bool(row.is_online), rate,
+            )
+            grid.setdefault(self._cell(lat, lng), []).append(row.trashcan_id)
+        self._points = points
+        self._grid = grid
+        self._loaded_at = time.monotonic()
+        self.rebuilds += 1
+
+    def _in_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float):
+        min_row, min_col = self._cell(min_lat, min_lng)
+        max_row, max_col = self._cell(max_lat, max_lng)
+        cell_count = (max_row - min_row + 1) * (max_col - min_col + 1)
+        # 넓은 화면(낮은 줌)은 칸 수가 점 수보다 많아지므로 전체 순회가 더 빠름
+        if cell_count >= len(self._grid):
+            candidates = self._points.values()
+        else:
+            candidates = (
+                self._points[trashcan_id]
+                for row in range(min_row, max_row + 1)
+                for col in range(min_col, max_col + 1)
+                for trashcan_id in self._grid.get((row, col), ())
+            )
+        for point in candidates:
+            if min_lat <= point[2] <= max_lat and min_lng <= point[3] <= max_lng:
+                yield point
+
+    @staticmethod
+    def _point_item(point) -> dict:
+        trashcan_id, name, lat, lng, is_online, rate = point
+        return {
+            "trashcan_id": trashcan_id,
+            "trashcan_name": name,
+            "trashcan_latitude": lat,
+            "trashcan_longitude": lng,
+            "is_online": is_online,
+            "fill_rate": round(rate, 2) if rate is not None else None,
+        }
+
+    def query(
+        self,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        zoom: int,
+    ) -> dict:
+        points = self._in_bbox(min_lat, min_lng, max_lat, max_lng)
+        if zoom >= MAP_CLUSTER_MAX_ZOOM:
+            items = [self._point_item(point) for point in points]
+            return {"zoom": zoom, "total": len(items), "clusters": [], "points": items}
+
+        # 줌 레벨에 맞는 화면상 고정 픽셀 크기 칸으로 묶음
+        cluster_deg = 360.0 / (2 ** zoom) * (MAP_CLUSTER_CELL_PX / 256)
+        buckets: dict[tuple[int, int], list] = {}
+        for point in points:
+            key = (math.floor(point[2] / cluster_deg), math.floor(point[3] / cluster_deg))
+            bucket = buckets.get(key)
+            if bucket is None:
+                # [개수, 위도 합, 경도 합, 최대 적재율, 첫 번째 점]
+                buckets[key] = [1, point[2], point[3], point[5], point]
+                continue
+            bucket[0] += 1
+            bucket[1] += point[2]
+            bucket[2] += point[3]
+            if point[5] is not None and (bucket[3] is None or point[5] > bucket[3]):
+                bucket[3] = point[5]
+
+        clusters = []
+        singles = []
+        total = 0
+        for count, lat_sum, lng_sum, worst, first in buckets.values():
+            total += count
+            if count == 1:
+                singles.append(self._point_item(first))
+                continue
+            clusters.append(
+                {
+                    "count": count,
+                    "latitude": lat_sum / count,
+                    "longitude": lng_sum / count,
+                    "max_fill_rate": round(worst, 2) if worst is not None else None,
+                }
+            )
+        return {"zoom": zoom, "total": total, "clusters": clusters, "points": singles}
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int,
+        min_fill_rate: float | None = None,
+    ) -> list[dict]:
+        # 기준점이 속한 칸부터 바깥 고리로 넓혀 가며 후보를 모으고,
+        # k번째 거리가 아직 확인하지 않은 고리까지의 최소 거리 이하가 되면 종료
+        if not self._points or k <= 0:
+            return []
+        center_row, center_col = self._cell(lat, lng)
+        cell_km = self.cell_deg * 111.195
+        candidates: list[tuple] = []
+        ring = 0
+        while True:
+            if ring == 0:
+                cells = [(center_row, center_col)]
+            else:
+                top, bottom = center_row - ring, center_row + ring
+                left, right = center_col - ring, center_col + ring
+                cells = [(row, col) for row in (top, bottom) for col in range(left, right + 1)]
+                cells += [(row, col) for row in range(top + 1, bottom) for col in (left, right)]
+            for cell in cells:
+                for trashcan_id in self._grid.get(cell, ()):
+                    point = self._points[trashcan_id]
+                    if min_fill_rate is None or (point[5] is not None and point[5] >= min_fill_rate):
+                        candidates.append(point)
+            if (2 * ring + 1) ** 2 >= len(self._grid):
+                # 확인한 칸 수가 전체 칸 수를 넘으면(희소한 데이터/먼 기준점) 전체 순회로 마무리
+                candidates = [
+                    point for point in self._points.values()
+                    if min_fill_rate is None or (point[5] is not None and point[5] >= min_fill_rate)
+                ]
+                break
+            if len(candidates) >= k:
+                distances = haversine_km(
+                    lat, lng,
+                    np.fromiter((point[2] for point in candidates), dtype=np.float64, count=len(candidates)),
+                    np.fromiter((point[3] for point in candidates), dtype=np.float64, count=len(candidates)),
+                )
+                kth = np.partition(distances, k - 1)[k - 1]
+                lat_edge = min(89.0, abs(lat) + (ring + 1) * self.cell_deg)
+                reach_km = ring * cell_km * math.cos(math.radians(lat_edge))
+                if kth <= reach_km:
+                    break
+            ring += 1
+
+        if not candidates:
+            return []
+        distances = haversine_km(
+            lat, lng,
+            np.fromiter((point[2] for point in candidates), dtype=np.float64, count=len(candidates)),
+            np.fromiter((point[3] for point in candidates), dtype=np.float64, count=len(candidates)),
+        )
+        order = np.argsort(distances, kind="stable")[:k]
+        items = []
+        for index in order:
+            item = self._point_item(candidates[index])
+            item["distance_km"] = round(float(distances[index]), 3)
+            items.append(item)
+        return items
+
+    def stats(self) -> dict:
+        return {
+            "points": len(self._points),
+            "cells": len(self._grid),
+            "cell_deg": self.cell_deg,
+            "ttl_seconds": self.ttl,
+            "rebuilds": self.rebuilds,
+        }
+
+
+map_index = TrashcanGridIndex()
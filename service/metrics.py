@@ -0,0 +1,232 @@
+import logging
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes", "on")
+# 분위수 계산용으로 라우트별 최근 샘플만 유지
+METRICS_WINDOW_SIZE = int(os.getenv("METRICS_WINDOW_SIZE", "1024"))
+# 0이면 느린 쿼리 로그 비활성화
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "0"))
+
+QUANTILES = (0.5, 0.95, 0.99)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestContext:
+    __slots__ = ("scope", "queries", "db_time")
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+_current_request: ContextVar[RequestContext | None] = ContextVar("metrics_request", default=None)
+
+
+class Summary:
+    __slots__ = ("count", "total", "samples")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def quantiles(self) -> list[tuple[float, float]]:
+        if not self.samples:
+            return [(q, 0.0) for q in QUANTILES]
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return [(q, ordered[min(last, int(q * len(ordered)))]) for q in QUANTILES]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+
+
+class MetricsRegistry:
+    def __init__(self, window: int = METRICS_WINDOW_SIZE, slow_query_ms: float = SLOW_QUERY_MS):
+        self.window = window
+        self.slow_query_ms = slow_query_ms
+        # (method, route) -> Summary
+        self.latency: dict[tuple[str, str], Summary] = {}
+        self.queries_per_request: dict[tuple[str, str], Summary] = {}
+        # (method, route, status) -> count
+        self.requests: dict[tuple[str, str, int], int] = {}
+        # route -> [쿼리 수, DB 시간]
+        self.db: dict[str, list] = {}
+        self.slow_queries = 0
+        self.in_flight = 0
+
+    def observe_request(self, method: str, ctx: RequestContext, status: int, elapsed: float) -> None:
+        key = (method, ctx.route)
+        summary = self.latency.get(key)
+        if summary is None:
+            summary = self.latency[key] = Summary(self.window)
+            self.queries_per_request[key] = Summary(self.window)
+        summary.observe(elapsed)
+        self.queries_per_request[key].observe(ctx.queries)
+        status_key = (method, ctx.route, status)
+        self.requests[status_key] = self.requests.get(status_key, 0) + 1
+
+    def observe_query(self, statement: str, elapsed: float) -> None:
+        ctx = _current_request.get()
+        route = ctx.route if ctx is not None else "background"
+        if ctx is not None:
+            ctx.queries += 1
+            ctx.db_time += elapsed
+        totals = self.db.get(route)
+        if totals is None:
+            totals = self.db[route] = [0, 0.0]
+        totals[0] += 1
+        totals[1] += elapsed
+        if self.slow_query_ms and elapsed * 1000 >= self.slow_query_ms:
+            self.slow_queries += 1
+            logger.warning(
+                "slow query %.1fms route=%s sql=%s",
+                elapsed * 1000, route, " ".join(statement.split())[:500],
+            )
+
+    def render(
+        self,
+        extra_gauges: dict[str, float] | None = None,
+        extra_counters: dict[str, float] | None = None,
+    ) -> str:
+        # extra_counters: 프로세스 시작 이후 누적값(이름은 _total로 끝남), extra_gauges: 현재 수준
+        lines = [
+            "# HELP http_request_duration_seconds Request latency by route",
+            "# TYPE http_request_duration_seconds summary",
+        ]
+        for (method, route), summary in sorted(self.latency.items()):
+            for q, value in summary.quantiles():
+                lines.append(
+                    f"http_request_duration_seconds{{{_labels(method=method, route=route, quantile=q)}}} {value:.6f}"
+                )
+            labels = _labels(method=method, route=route)
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {summary.total:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {summary.count}")
+
+        lines += [
+            "# HELP http_requests_total Requests by route and status code",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{{{_labels(method=method, route=route, status=status)}}} {count}")
+
+        lines += [
+            "# HELP http_request_db_queries DB queries issued per request",
+            "# TYPE http_request_db_queries summary",
+        ]
+        for (method, route), summary in sorted(self.queries_per_request.items()):
+            for q, value in summary.quantiles():
+                lines.append(
+                    f"http_request_db_queries{{{_labels(method=method, route=route, quantile=q)}}} {value:g}"
+                )
+            labels = _labels(method=method, route=route)
+            lines.append(f"http_request_db_queries_sum{{{labels}}} {summary.total:g}")
+            lines.append(f"http_request_db_queries_count{{{labels}}} {summary.count}")
+
+        lines += [
+            "# HELP db_queries_total DB queries by issuing route",
+            "# TYPE db_queries_total counter",
+        ]
+        for route, (count, _) in sorted(self.db.items()):
+            lines.append(f"db_queries_total{{{_labels(route=route)}}} {count}")
+        lines += [
+            "# HELP db_query_seconds_total DB time by issuing route",
+            "# TYPE db_query_seconds_total counter",
+        ]
+        for route, (_, seconds) in sorted(self.db.items()):
+            lines.append(f"db_query_seconds_total{{{_labels(route=route)}}} {seconds:.6f}")
+
+        lines += [
+            "# TYPE db_slow_queries_total counter",
+            f"db_slow_queries_total {self.slow_queries}",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+        ]
+        for name, value in (extra_counters or {}).items():
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value:g}")
+        for name, value in (extra_gauges or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    # BaseHTTPMiddleware 대신 순수 ASGI 미들웨어로 구현해 오버헤드 최소화
+    def __init__(self, app, registry: MetricsRegistry = metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope)
+        token = _current_request.set(ctx)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        self.registry.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.registry.in_flight -= 1
+            self.registry.observe_request(scope["method"], ctx, status, time.perf_counter() - started)
+            _current_request.reset(token)
+
+
+def instrument_engine(engine, registry: MetricsRegistry = metrics_registry) -> None:
+    if not METRICS_ENABLED:
+        return
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("metrics_query_start")
+        if stack:
+            registry.observe_query(statement, time.perf_counter() - stack.pop())
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None:
+            stack = conn.info.get("metrics_query_start")
+            if stack:
+                stack.pop()
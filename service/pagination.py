@@ -0,0 +1,61 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _matches(value, expected: type) -> bool:
+    # JSON의 true/false는 숫자로 받지 않음, float 자리에는 정수도 허용
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def cursor_type(column) -> type:
+    # 커서에 담기는 정렬값의 타입 (Boolean 정렬값은 0/1 정수로 인코딩)
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return float
+    if python_type is bool:
+        return int
+    return python_type
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: tuple[type, ...]) -> list:
+    # types: 커서 값별 기대 타입, 형식/개수/타입이 맞지 않으면 400
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise _invalid_cursor()
+    if not isinstance(values, list) or len(values) != len(types):
+        raise _invalid_cursor()
+    if not all(_matches(value, expected) for value, expected in zip(values, types)):
+        raise _invalid_cursor()
+    return values
+
+
+def keyset_after(sort_expr, id_column, order: str, cursor_values: list):
+    # (정렬값, id) 기준 다음 페이지 조건. id는 항상 오름차순으로 동점 처리
+    if len(cursor_values) != 2:
+        raise _invalid_cursor()
+    last_value, last_id = cursor_values
+    if not _matches(last_value, cursor_type(sort_expr)) or not _matches(last_id, cursor_type(id_column)):
+        raise _invalid_cursor()
+    if order == "desc":
+        ahead = sort_expr < last_value
+    else:
+        ahead = sort_expr > last_value
+    return ahead | ((sort_expr == last_value) & (id_column > last_id))
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable
+
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "5"))
+# 디텍션 수신 후 무효화를 모아서 하는 간격(초), TTL 이상이면 TTL 만료에 맡김
+DASHBOARD_INVALIDATE_DELAY = float(os.getenv("DASHBOARD_INVALIDATE_DELAY", "1"))
+
+
+class CacheBackend(ABC):
+    # 여러 워커가 공유하는 백엔드(예: Redis)는 이 인터페이스를 구현해 추가
+    @abstractmethod
+    async def get(self, key: str) -> tuple[bool, Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def clear(self, prefix: str = "") -> None:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self):
+        self._items: dict[str, tuple[float, Any]] = {}
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        item = self._items.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            self._items.pop(key, None)
+            return False, None
+        return True, value
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self._items[key] = (time.monotonic() + ttl, value)
+
+    async def clear(self, prefix: str = "") -> None:
+        if not prefix:
+            self._items.clear()
+            return
+        for key in [key for key in self._items if key.startswith(prefix)]:
+            self._items.pop(key, None)
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, ttl: float, invalidate_delay: float = DASHBOARD_INVALIDATE_DELAY):
+        self.backend = backend
+        self.ttl = ttl
+        self.invalidate_delay = invalidate_delay
+        self._inflight: dict[str, asyncio.Future] = {}
+        # prefix별 예약된 무효화 task, 예약 중에 들어온 요청은 같은 무효화로 묶음
+        self._pending: dict[str, asyncio.Task] = {}
+        # 무효화된 prefix별 세대, 키의 세대는 그 키에 걸리는 prefix 세대의 합
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.ttl <= 0:
+            return await loader()
+        while True:
+            found, value = await self.backend.get(key)
+            if found:
+                self.hits += 1
+                return value
+
+            # 같은 키로 동시에 들어온 요청은 첫 요청의 조회 결과를 함께 사용
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 첫 요청이 취소된 경우(연결 끊김 등)에는 기다리던 요청이 직접 다시 조회
+                if not inflight.cancelled():
+                    raise
+                self.coalesced -= 1
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation_of(key)
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+        # 조회 중에 이 키가 무효화되었다면 오래된 값이므로 저장하지 않음 (다른 prefix 무효화는 무관)
+        if generation == self._generation_of(key):
+            await self.backend.set(key, value, self.ttl)
+        future.set_result(value)
+        return value
+
+    def _generation_of(self, key: str) -> int:
+        return sum(
+            generation for prefix, generation in self._generations.items() if key.startswith(prefix)
+        )
+
+    async def invalidate(self, prefix: str = "") -> None:
+        self._generations[prefix] = self._generations.get(prefix, 0) + 1
+        self.invalidations += 1
+        await self.backend.clear(prefix)
+
+    def invalidate_later(self, prefix: str = "") -> None:
+        # 잦은 쓰기(디텍션 수신)용: invalidate_delay 안에 들어온 요청을 한 번의 무효화로 묶음
+        # 첫 요청 기준으로 예약하므로 수신이 계속되어도 invalidate_delay마다 한 번은 비움
+        if self.ttl <= 0 or self.invalidate_delay >= self.ttl or prefix in self._pending:
+            return
+        self._pending[prefix] = asyncio.create_task(
+            self._invalidate_after(prefix), name=f"cache-invalidate:{prefix}"
+        )
+
+    async def _invalidate_after(self, prefix: str) -> None:
+        try:
+            await asyncio.sleep(self.invalidate_delay)
+        finally:
+            self._pending.pop(prefix, None)
+        await self.invalidate(prefix)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "invalidate_delay_seconds": self.invalidate_delay,
+            "pending_invalidations": len(self._pending),
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+dashboard_cache = ResponseCache(MemoryCacheBackend(), DASHBOARD_CACHE_TTL)
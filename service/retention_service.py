@@ -0,0 +1,387 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlmodel import select
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from db.db import SessionDep, async_session_factory, engine
+from db.entity import (
+    ArchivedTrashcanStats,
+    ArchivedTrashcanTypeStats,
+    Detection,
+    DetectionDetail,
+    TrashcanErrorLog,
+)
+from service.background_task import PeriodicTask
+from service.detection_packing import unpack_objects
+from service.fill_forecast_service import FORECAST_WINDOW_DAYS
+
+logger = logging.getLogger(__name__)
+
+# 0이면 백그라운드 정리 비활성 (수동 실행만)
+RETENTION_INTERVAL_SECONDS = int(os.getenv("RETENTION_INTERVAL_SECONDS", "0"))
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "180"))
+ERROR_LOG_RETENTION_DAYS = int(os.getenv("ERROR_LOG_RETENTION_DAYS", "90"))
+# 한 트랜잭션에서 옮기고 지우는 행 수, 배치 사이에는 쉬어서 수신 쓰기와 잠금 경합을 줄임
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "1000"))
+RETENTION_BATCH_PAUSE_SECONDS = float(os.getenv("RETENTION_BATCH_PAUSE_SECONDS", "0.5"))
+# 한 번 실행에서 테이블별 최대 배치 수, 남은 행은 다음 실행에서 처리
+RETENTION_MAX_BATCHES = int(os.getenv("RETENTION_MAX_BATCHES", "100"))
+RETENTION_ARCHIVE_DIR = os.getenv("RETENTION_ARCHIVE_DIR", "archive")
+
+
+class NdjsonArchive:
+    # <root>/<table>/<table>-YYYY-MM.ndjson.gz 월별 파일에 이어 씀 (gzip 멤버를 덧붙이므로 gzip.open으로 전체를 읽을 수 있음)
+    def __init__(self, root: str = RETENTION_ARCHIVE_DIR):
+        self.root = Path(root)
+
+    def path(self, table: str, month: str) -> Path:
+        return self.root / table / f"{table}-{month}.ndjson.gz"
+
+    def append(self, table: str, records_by_month: dict[str, list[dict]]) -> None:
+        for month, records in records_by_month.items():
+            path = self.path(table, month)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lines = "".join(
+                json.dumps(record, default=str, ensure_ascii=False) + "\n" for record in records
+            )
+            with open(path, "ab") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as out:
+                    out.write(lines.encode())
+                raw.flush()
+                # DB에서 지우기 전에 디스크에 반영
+                os.fsync(raw.fileno())
+
+
+class RetentionService:
+    # 보존 기간이 지난 detection/detection_detail/trashcan_error_log를 파일로 옮긴 뒤 작은 배치로 삭제
+    # dailystats, trashcan_stats 등 집계 테이블은 지우지 않으므로 대시보드/상세 통계는 그대로 유지
+    def __init__(
+        self,
+        interval: int = RETENTION_INTERVAL_SECONDS,
+        detection_days: int = RETENTION_DAYS,
+        error_log_days: int = ERROR_LOG_RETENTION_DAYS,
+        batch_size: int = RETENTION_BATCH_SIZE,
+        pause: float = RETENTION_BATCH_PAUSE_SECONDS,
+        max_batches: int = RETENTION_MAX_BATCHES,
+        archive: NdjsonArchive | None = None,
+    ):
+        # 가득 참 예측에 쓰는 기간의 detection은 남김
+        self.detection_days = max(detection_days, FORECAST_WINDOW_DAYS + 1)
+        self.error_log_days = error_log_days
+        self.batch_size = batch_size
+        self.pause = pause
+        self.max_batches = max_batches
+        self.archive = archive or NdjsonArchive()
+        self.task = PeriodicTask("retention", interval, self.run)
+        self._lock = asyncio.Lock()
+        # API로 시작한 수동 실행 (요청은 바로 응답하고 진행 상황은 stats()로 확인)
+        self._manual: asyncio.Task | None = None
+        self.progress: dict | None = None
+        self.last_error: str | None = None
+        self.runs = 0
+        self.archived_detections = 0
+        self.archived_details = 0
+        self.archived_error_logs = 0
+        self.last_run_at: datetime | None = None
+        self.last_run_ms = 0.0
+        self.last_result: dict | None = None
+
+    async def start(self) -> None:
+        await self.task.start()
+
+    async def stop(self) -> None:
+        await self.task.stop()
+        if self._manual is not None:
+            # 배치 단위 트랜잭션이므로 진행 중인 배치만 롤백되고 남은 행은 다음 실행에서 처리
+            self._manual.cancel()
+            try:
+                await self._manual
+            except asyncio.CancelledError:
+                pass
+            self._manual = None
+
+    @property
+    def in_progress(self) -> bool:
+        return self._lock.locked()
+
+    async def start_run(self) -> bool:
+        # 이미 실행 중(주기 실행 포함)이면 False
+        if self._lock.locked():
+            return False
+        # 잠금을 먼저 잡은 뒤 작업에 넘겨 시작 전에 다른 실행이 끼어들지 않게 함, 해제는 작업이 끝날 때(취소 포함)
+        await self._lock.acquire()
+        self._manual = asyncio.create_task(self._run_manual(), name="retention-manual")
+        self._manual.add_done_callback(lambda _: self._lock.release())
+        return True
+
+    async def _run_manual(self) -> None:
+        try:
+            await self._run()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("manual retention run failed")
+
+    async def run(self) -> dict:
+        if self._lock.locked():
+            return {"skipped": True, "reason": "already running"}
+        async with self._lock:
+            return await self._run()
+
+    async def _run(self) -> dict:
+        started = time.perf_counter()
+        now = datetime.now()
+        detection_cutoff = now - timedelta(days=self.detection_days)
+        error_log_cutoff = now - timedelta(days=self.error_log_days)
+        self.progress = {
+            "started_at": now,
+            "phase": "detection",
+            "batches": 0,
+            "detections": 0,
+            "details": 0,
+            "error_logs": 0,
+        }
+        try:
+            detections, details = await self._drain(
+                self._archive_detection_batch, detection_cutoff, "detections", "details"
+            )
+            self.progress["phase"] = "error_log"
+            error_logs, _ = await self._drain(self._archive_error_log_batch, error_log_cutoff, "error_logs")
+        except Exception as exc:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            self.progress = None
+        self.last_error = None
+        result = {
+            "skipped": False,
+            "detection_cutoff": detection_cutoff,
+            "error_log_cutoff": error_log_cutoff,
+            "detections": detections,
+            "details": details,
+            "error_logs": error_logs,
+        }
+        self.runs += 1
+        self.last_run_at = now
+        self.last_run_ms = (time.perf_counter() - started) * 1000
+        self.last_result = result
+        return result
+
+    async def _drain(
+        self,
+        archive_batch,
+        cutoff: datetime,
+        count_key: str,
+        children_key: str | None = None,
+    ) -> tuple[int, int]:
+        total = 0
+        total_children = 0
+        for batch in range(self.max_batches):
+            if batch and self.pause > 0:
+                await asyncio.sleep(self.pause)
+            # 배치마다 짧은 트랜잭션으로 끝내 수신 경로가 오래 기다리지 않게 함
+            async with async_session_factory() as db:
+                count, children = await archive_batch(db, cutoff)
+            total += count
+            total_children += children
+            self.progress["batches"] += 1
+            self.progress[count_key] = total
+            if children_key is not None:
+                self.progress[children_key] = total_children
+            if count < self.batch_size:
+                break
+        return total, total_children
+
+    async def _archive_detection_batch(self, db: SessionDep, cutoff: datetime) -> tuple[int, int]:
+        rows = (
+            await db.execute(
+                select(
+                    Detection.detection_id,
+                    Detection.trashcan_id,
+                    Detection.frame_id,
+                    Detection.image_name,
+                    Detection.image_path,
+                    Detection.detected_at,
+                    Detection.object_count,
+                    Detection.objects_blob,
+                )
+                .where(Detection.detected_at < cutoff)
+                .order_by(Detection.detected_at, Detection.detection_id)
+                .limit(self.batch_size)
+            )
+        ).all()
+        if not rows:
+            return 0, 0
+        detection_ids = [row.detection_id for row in rows]
+        detail_rows = (
+            await db.execute(
+                select(
+                    DetectionDetail.detail_id,
+                    DetectionDetail.detection_id,
+                    DetectionDetail.waste_type_id,
+                    DetectionDetail.confidence,
+                    DetectionDetail.bbox_x1,
+                    DetectionDetail.bbox_y1,
+                    DetectionDetail.bbox_x2,
+                    DetectionDetail.bbox_y2,
+                )
+                .where(DetectionDetail.detection_id.in_(detection_ids))
+            )
+        ).all()
+        details_by_detection = defaultdict(list)
+        for detail in detail_rows:
+            details_by_detection[detail.detection_id].append(detail._asdict())
+
+        # 한 줄에 detection 하나와 그 detection_detail 목록
+        records_by_month = defaultdict(list)
+        totals = {}
+        type_counts = Counter()
+        for row in rows:
+            details = details_by_detection.get(row.detection_id, [])
+            record = row._asdict()
+            # packed 모드 행은 blob을 풀어 detection_detail과 같은 형식으로 기록
+            blob = record.pop("objects_blob")
+            if blob is not None:
+                details = unpack_objects(blob).to_details()
+            record["details"] = details
+            records_by_month[row.detected_at.strftime("%Y-%m")].append(record)
+            collected, events, last_detected_at = totals.get(row.trashcan_id, (0, 0, row.detected_at))
+            totals[row.trashcan_id] = (
+                collected + (row.object_count or 0),
+                events + 1,
+                max(last_detected_at, row.detected_at),
+            )
+            for detail in details:
+                type_counts[(row.trashcan_id, detail["waste_type_id"])] += 1
+        await asyncio.to_thread(self.archive.append, "detection", records_by_month)
+
+        try:
+            totals_stmt = mysql_insert(ArchivedTrashcanStats).values(
+                [
+                    {
+                        "trashcan_id": trashcan_id,
+                        "total_collected": collected,
+                        "total_events": events,
+                        "last_detected_at": last_detected_at,
+                    }
+                    for trashcan_id, (collected, events, last_detected_at) in totals.items()
+                ]
+            )
+            totals_stmt = totals_stmt.on_duplicate_key_update(
+                total_collected=ArchivedTrashcanStats.total_collected + totals_stmt.inserted.total_collected,
+                total_events=ArchivedTrashcanStats.total_events + totals_stmt.inserted.total_events,
+                last_detected_at=func.greatest(
+                    func.coalesce(ArchivedTrashcanStats.last_detected_at, totals_stmt.inserted.last_detected_at),
+                    totals_stmt.inserted.last_detected_at,
+                ),
+            )
+            await db.execute(totals_stmt)
+            if type_counts:
+                type_stmt = mysql_insert(ArchivedTrashcanTypeStats).values(
+                    [
+                        {
+                            "trashcan_id": trashcan_id,
+                            "waste_type_id": waste_type_id,
+                            "detection_count": count,
+                        }
+                        for (trashcan_id, waste_type_id), count in type_counts.items()
+                    ]
+                )
+                type_stmt = type_stmt.on_duplicate_key_update(
+                    detection_count=ArchivedTrashcanTypeStats.detection_count
+                    + type_stmt.inserted.detection_count
+                )
+                await db.execute(type_stmt)
+            await db.execute(delete(DetectionDetail).where(DetectionDetail.detection_id.in_(detection_ids)))
+            await db.execute(delete(Detection).where(Detection.detection_id.in_(detection_ids)))
+            await db.commit()
+        except Exception:
+            # 파일에는 이미 기록되었으므로 다음 실행에서 같은 행이 다시 기록될 수 있음 (detection_id로 중복 제거)
+            await db.rollback()
+            raise
+        self.archived_detections += len(rows)
+        self.archived_details += len(detail_rows)
+        return len(rows), len(detail_rows)
+
+    async def _archive_error_log_batch(self, db: SessionDep, cutoff: datetime) -> tuple[int, int]:
+        rows = (
+            await db.execute(
+                select(
+                    TrashcanErrorLog.id,
+                    TrashcanErrorLog.trashcan_id,
+                    TrashcanErrorLog.camera_id,
+                    TrashcanErrorLog.status_code,
+                    TrashcanErrorLog.message,
+                    TrashcanErrorLog.occurred_at,
+                    TrashcanErrorLog.last_occurred_at,
+                    TrashcanErrorLog.repeat_count,
+                    TrashcanErrorLog.created_at,
+                )
+                .where(TrashcanErrorLog.created_at < cutoff)
+                .order_by(TrashcanErrorLog.created_at, TrashcanErrorLog.id)
+                .limit(self.batch_size)
+            )
+        ).all()
+        if not rows:
+            return 0, 0
+        records_by_month = defaultdict(list)
+        for row in rows:
+            records_by_month[row.created_at.strftime("%Y-%m")].append(row._asdict())
+        await asyncio.to_thread(self.archive.append, "trashcan_error_log", records_by_month)
+        try:
+            await db.execute(
+                delete(TrashcanErrorLog).where(TrashcanErrorLog.id.in_([row.id for row in rows]))
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        self.archived_error_logs += len(rows)
+        return len(rows), 0
+
+    def stats(self) -> dict:
+        return {
+            "running": self.task.running,
+            "in_progress": self.in_progress,
+            "progress": self.progress,
+            "last_error": self.last_error,
+            "interval_seconds": self.task.interval,
+            "detection_days": self.detection_days,
+            "error_log_days": self.error_log_days,
+            "batch_size": self.batch_size,
+            "archive_dir": str(self.archive.root),
+            "runs": self.runs,
+            "archived_detections": self.archived_detections,
+            "archived_details": self.archived_details,
+            "archived_error_logs": self.archived_error_logs,
+            "last_run_at": self.last_run_at,
+            "last_run_ms": round(self.last_run_ms, 2),
+            "last_result": self.last_result,
+        }
+
+
+retention_service = RetentionService()
+
+
+async def _main() -> None:
+    result = await retention_service.run()
+    print(result)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    # python -m service.retention_service (cron 등에서 1회 실행)
+    if len(sys.argv) > 1:
+        print("usage: python -m service.retention_service")
+        sys.exit(2)
+    asyncio.run(_main())
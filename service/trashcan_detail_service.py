@@ -1,9 +1,17 @@
-from service.trashcan_status_utils import mark_offline_if_stale
+import json
+from contextlib import aclosing
+from datetime import datetime
+
+from service.detection_packing import unpack_objects
+from service.waste_type_registry import waste_type_registry
+from service.pagination import decode_cursor, encode_cursor
 
 from sqlmodel import select
-from sqlalchemy import func
-from db.entity import Trashcan, Detection, DetectionDetail, WasteType
-from db.db import SessionDep
+from sqlalchemy import and_, func, or_
+from db.entity import Trashcan, Detection, DetectionDetail, WasteType, TrashcanStats, TrashcanTypeStats
+from db.db import SessionDep, async_session_factory
+
+STREAM_BATCH_SIZE = 1000
 
 
 class TrashcanDetail:
@@ -11,7 +19,6 @@ class TrashcanDetail:
         pass
 
     async def get_trashcans_detail(self, trashcan_id: int, db: SessionDep):
-        await mark_offline_if_stale(db, minutes=5)
         trashcan_stmt = (
             select(Trashcan)
             .where(Trashcan.trashcan_id == trashcan_id)
@@ -26,35 +33,30 @@ class TrashcanDetail:
         current_volume = trashcan.current_volume or 0
         free_capacity = capacity - current_volume
 
-        total_stmt = (
-            select(func.coalesce(func.sum(Detection.object_count), 0))
-            .where(Detection.trashcan_id == trashcan_id)
-        )
-        total_collected = (await db.execute(total_stmt)).scalar() or 0
-        events_stmt = (
-            select(func.count(Detection.detection_id))
-            .where(Detection.trashcan_id == trashcan_id)
-        )
-        total_events = (await db.execute(events_stmt)).scalar() or 0
+        totals_stmt = select(
+            TrashcanStats.total_collected,
+            TrashcanStats.total_events,
+            TrashcanStats.cycle_events,
+            TrashcanStats.last_collected_at,
+            TrashcanStats.total_collections,
+            TrashcanStats.total_emptied_volume,
+        ).where(TrashcanStats.trashcan_id == trashcan_id)
+        totals = (await db.execute(totals_stmt)).first()
+        total_collected = totals.total_collected if totals else 0
+        total_events = totals.total_events if totals else 0
 
         type_stmt = (
             select(
                 WasteType.type_name,
-                func.count(DetectionDetail.detail_id).label("type_count"),
+                TrashcanTypeStats.detection_count.label("type_count"),
             )
-            .join(DetectionDetail, DetectionDetail.waste_type_id == WasteType.waste_type_id)
-            .join(Detection, Detection.detection_id == DetectionDetail.detection_id)
-            .where(Detection.trashcan_id == trashcan_id)
-            .group_by(WasteType.type_name)
+            .join(TrashcanTypeStats, TrashcanTypeStats.waste_type_id == WasteType.waste_type_id)
+            .where(TrashcanTypeStats.trashcan_id == trashcan_id)
             .order_by(WasteType.type_name.asc())
         )
         type_rows = (await db.execute(type_stmt)).all()
-        detect_items = {
-            "MetalCan": 0,
-            "PetBottle": 0,
-            "Plastic": 0,
-            "Styrofoam": 0,
-        }
+        await waste_type_registry.ensure_loaded(db)
+        detect_items = waste_type_registry.empty_counts()
         for row in type_rows:
             if row.type_name in detect_items:
                 detect_items[row.type_name] += int(row.type_count or 0)
@@ -73,27 +75,35 @@ class TrashcanDetail:
                 "total_events": int(total_events),
                 "data": detect_items,
             },
+            # 현재 주기(마지막 수거 이후)와 전체 수거 누적
+            "collection": {
+                "last_collected_at": totals.last_collected_at if totals else None,
+                "cycle_objects": current_volume,
+                "cycle_events": int(totals.cycle_events or 0) if totals else 0,
+                "total_collections": int(totals.total_collections or 0) if totals else 0,
+                "total_emptied_volume": int(totals.total_emptied_volume or 0) if totals else 0,
+            },
         }
 
-    async def get_waste_detail(self, trashcan_id: int, db: SessionDep):
+    async def trashcan_exists(self, trashcan_id: int, db: SessionDep) -> bool:
         trashcan_stmt = (
             select(Trashcan.trashcan_id)
             .where(Trashcan.trashcan_id == trashcan_id)
             .where(Trashcan.is_deleted == False)
         )
-        trashcan_exists = (await db.execute(trashcan_stmt)).first()
-        if not trashcan_exists:
-            return None
+        return (await db.execute(trashcan_stmt)).first() is not None
 
-        events_stmt = (
-            select(func.count(Detection.detection_id))
-            .where(Detection.trashcan_id == trashcan_id)
-        )
-        total_events = (await db.execute(events_stmt)).scalar() or 0
-
-        detail_stmt = (
+    def _waste_detail_stmt(
+        self,
+        trashcan_id: int,
+        waste_type_id: int | None,
+        start: datetime | None,
+        end: datetime | None,
+    ):
+        stmt = (
             select(
                 WasteType.type_name,
+                DetectionDetail.detail_id,
                 Detection.detection_id,
                 Detection.image_name,
                 Detection.image_path,
@@ -102,30 +112,198 @@ class TrashcanDetail:
             .join(DetectionDetail, DetectionDetail.waste_type_id == WasteType.waste_type_id)
             .join(Detection, Detection.detection_id == DetectionDetail.detection_id)
             .where(Detection.trashcan_id == trashcan_id)
-            .order_by(Detection.detected_at.desc())
+            .order_by(Detection.detection_id.desc(), DetectionDetail.detail_id.desc())
         )
-        detail_rows = (await db.execute(detail_stmt)).all()
+        if waste_type_id is not None:
+            stmt = stmt.where(DetectionDetail.waste_type_id == waste_type_id)
+        if start is not None:
+            stmt = stmt.where(Detection.detected_at >= start)
+        if end is not None:
+            stmt = stmt.where(Detection.detected_at < end)
+        return stmt
 
-        items_by_type = {
-            "MetalCan": [],
-            "PetBottle": [],
-            "Plastic": [],
-            "Styrofoam": [],
+    def _packed_detection_stmt(
+        self,
+        trashcan_id: int,
+        start: datetime | None,
+        end: datetime | None,
+    ):
+        stmt = (
+            select(
+                Detection.detection_id,
+                Detection.image_name,
+                Detection.image_path,
+                Detection.detected_at,
+                Detection.objects_blob,
+            )
+            .where(Detection.trashcan_id == trashcan_id)
+            .where(Detection.objects_blob.is_not(None))
+            .order_by(Detection.detection_id.desc())
+        )
+        if start is not None:
+            stmt = stmt.where(Detection.detected_at >= start)
+        if end is not None:
+            stmt = stmt.where(Detection.detected_at < end)
+        return stmt
+
+    async def _detail_rows(self, db: SessionDep, trashcan_id, waste_type_id, start, end, after, chunk):
+        # detection_detail 행을 (detection_id, detail_id) 내림차순으로 chunk개씩 keyset 조회
+        stmt = self._waste_detail_stmt(trashcan_id, waste_type_id, start, end)
+        while True:
+            page = stmt
+            if after is not None:
+                page = page.where(
+                    or_(
+                        Detection.detection_id < after[0],
+                        and_(Detection.detection_id == after[0], DetectionDetail.detail_id < after[1]),
+                    )
+                )
+            rows = (await db.execute(page.limit(chunk))).all()
+            for row in rows:
+                yield (row.detection_id, row.detail_id), row.type_name, row
+            if len(rows) < chunk:
+                return
+            after = (rows[-1].detection_id, rows[-1].detail_id)
+
+    async def _packed_rows(self, db: SessionDep, trashcan_id, waste_type_id, start, end, after, chunk):
+        # packed detection은 blob을 풀어 객체 순번을 detail_id 대신 위치로 사용
+        # (한 detection은 한 가지 형식으로만 저장되므로 detection_detail 행과 위치가 섞이지 않음)
+        # 행 조회와 같은 커서 조건/chunk 제한으로 blob을 chunk개씩만 읽음 (같은 detection 안의 위치는 풀어서 거름)
+        stmt = self._packed_detection_stmt(trashcan_id, start, end)
+        page = stmt if after is None else stmt.where(Detection.detection_id <= after[0])
+        while True:
+            rows = (await db.execute(page.limit(chunk))).all()
+            for row in rows:
+                waste_type_ids = unpack_objects(row.objects_blob).waste_type_ids.tolist()
+                for ordinal in range(len(waste_type_ids) - 1, -1, -1):
+                    if after is not None and row.detection_id == after[0] and ordinal >= after[1]:
+                        continue
+                    if waste_type_id is not None and waste_type_ids[ordinal] != waste_type_id:
+                        continue
+                    type_name = waste_type_registry.type_name(waste_type_ids[ordinal])
+                    if type_name is not None:
+                        yield (row.detection_id, ordinal), type_name, row
+            if len(rows) < chunk:
+                return
+            page = stmt.where(Detection.detection_id < rows[-1].detection_id)
+
+    async def _iter_waste_detail(
+        self,
+        db: SessionDep,
+        trashcan_id: int,
+        waste_type_id: int | None,
+        start: datetime | None,
+        end: datetime | None,
+        after: tuple[int, int] | None = None,
+        chunk: int = STREAM_BATCH_SIZE,
+    ):
+        # detection_detail 행과 packed blob 객체를 (detection_id, 위치) 내림차순으로 합쳐 (위치 키, 종류 이름, 행) 반환
+        # 저장 모드를 바꿔도 이전 형식으로 저장된 프레임이 빠지지 않도록 두 형식을 항상 함께 읽음
+        sources = [
+            self._detail_rows(db, trashcan_id, waste_type_id, start, end, after, chunk),
+            self._packed_rows(db, trashcan_id, waste_type_id, start, end, after, chunk),
+        ]
+        try:
+            heads = [await anext(source, None) for source in sources]
+            while True:
+                remaining = [index for index, head in enumerate(heads) if head is not None]
+                if not remaining:
+                    return
+                index = max(remaining, key=lambda index: heads[index][0])
+                yield heads[index]
+                heads[index] = await anext(sources[index], None)
+        finally:
+            for source in sources:
+                await source.aclose()
+
+    def _waste_detail_item(self, row) -> dict:
+        return {
+            "detection_id": row.detection_id,
+            "image_name": row.image_name,
+            "image_path": row.image_path,
+            "detected_at": row.detected_at,
         }
-        for row in detail_rows:
-            if row.type_name in items_by_type:
-                items_by_type[row.type_name].append(
-                    {
-                        "detection_id": row.detection_id,
-                        "image_name": row.image_name,
-                        "image_path": row.image_path,
-                        "detected_at": row.detected_at,
-                    }
+
+    async def get_waste_detail(
+        self,
+        trashcan_id: int,
+        db: SessionDep,
+        waste_type: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ):
+        # 종류별로 최신순 limit개씩, next_cursors로 다음 페이지 조회
+        if not await self.trashcan_exists(trashcan_id, db):
+            return None
+
+        if start is None and end is None:
+            totals_stmt = select(
+                TrashcanStats.total_collected,
+                TrashcanStats.total_events,
+            ).where(TrashcanStats.trashcan_id == trashcan_id)
+        else:
+            # 기간 필터가 있으면 누적 값 대신 기간 안의 탐지만 집계 (ix_detection_trashcan_detected_at 범위 조회)
+            totals_stmt = select(
+                func.coalesce(func.sum(Detection.object_count), 0).label("total_collected"),
+                func.count().label("total_events"),
+            ).where(Detection.trashcan_id == trashcan_id)
+            if start is not None:
+                totals_stmt = totals_stmt.where(Detection.detected_at >= start)
+            if end is not None:
+                totals_stmt = totals_stmt.where(Detection.detected_at < end)
+        totals = (await db.execute(totals_stmt)).first()
+
+        await waste_type_registry.ensure_loaded(db)
+        if waste_type is not None:
+            if waste_type_registry.waste_type_id(waste_type) is None:
+                raise ValueError(f"unknown waste_type: {waste_type}")
+            type_names = [waste_type]
+        else:
+            if cursor:
+                raise ValueError("cursor requires waste_type")
+            type_names = waste_type_registry.type_names
+
+        after = tuple(decode_cursor(cursor, (int, int))) if cursor else None
+        items_by_type = {}
+        next_cursors = {}
+        for type_name in type_names:
+            entries = []
+            async with aclosing(
+                self._iter_waste_detail(
+                    db, trashcan_id, waste_type_registry.waste_type_id(type_name), start, end, after, limit + 1
                 )
+            ) as source:
+                async for key, _, row in source:
+                    entries.append((key, row))
+                    if len(entries) > limit:
+                        break
+            has_more = len(entries) > limit
+            entries = entries[:limit]
+            items_by_type[type_name] = [self._waste_detail_item(row) for _, row in entries]
+            next_cursors[type_name] = encode_cursor(list(entries[-1][0])) if has_more else None
 
         return {
             "trashcan_id": trashcan_id,
-            "total_objects": len(detail_rows),
-            "total_events": int(total_events),
+            "total_objects": int(totals.total_collected) if totals else 0,
+            "total_events": int(totals.total_events) if totals else 0,
             "items_by_type": items_by_type,
+            "next_cursors": next_cursors,
         }
+
+    async def stream_waste_detail(
+        self,
+        trashcan_id: int,
+        waste_type_id: int | None,
+        start: datetime | None,
+        end: datetime | None,
+    ):
+        # STREAM_BATCH_SIZE개씩 keyset 조회하며 한 줄씩 NDJSON 전송 (응답 동안 별도 세션 사용)
+        async with async_session_factory() as db:
+            await waste_type_registry.ensure_loaded(db)
+            async with aclosing(self._iter_waste_detail(db, trashcan_id, waste_type_id, start, end)) as source:
+                async for _, type_name, row in source:
+                    item = self._waste_detail_item(row)
+                    item["type_name"] = type_name
+                    yield json.dumps(item, default=str, ensure_ascii=False) + "\n"
@@ -1,19 +1,27 @@
 from sqlmodel import select
 from sqlalchemy import func
-from db.entity import Trashcan, Detection
+from db.entity import Trashcan, TrashcanStats
 from db.db import SessionDep
-from service.trashcan_status_utils import mark_offline_if_stale
+from service.pagination import cursor_type, decode_cursor, encode_cursor, keyset_after
 
 class TrashcanList:
     def __init__(self):
         pass
 
-    async def get_trashcans_list(self, db: SessionDep, offset: int, limit: int):
-        await mark_offline_if_stale(db, minutes=5)
-        total_stmt = select(func.count(Trashcan.trashcan_id)).where(
-            Trashcan.is_deleted == False
-        )
-        total = (await db.execute(total_stmt)).scalar() or 0
+    async def get_trashcans_list(
+        self,
+        db: SessionDep,
+        offset: int,
+        limit: int,
+        cursor: str | None = None,
+        include_total: bool = True,
+    ):
+        total = None
+        if include_total:
+            total_stmt = select(func.count(Trashcan.trashcan_id)).where(
+                Trashcan.is_deleted == False
+            )
+            total = int((await db.execute(total_stmt)).scalar() or 0)
         fill_rate = (
             (func.coalesce(Trashcan.current_volume, 0) * 100.0)
             / func.nullif(Trashcan.trashcan_capacity, 0)
@@ -25,22 +33,20 @@ class TrashcanList:
                 Trashcan.address_detail,
                 Trashcan.is_online,
                 fill_rate,
-                func.coalesce(func.sum(Detection.object_count), 0).label("total_collected"),
+                func.coalesce(TrashcanStats.total_collected, 0).label("total_collected"),
             )
-            .join(Detection, Detection.trashcan_id == Trashcan.trashcan_id, isouter=True)
+            .join(TrashcanStats, TrashcanStats.trashcan_id == Trashcan.trashcan_id, isouter=True)
             .where(Trashcan.is_deleted == False)
-            .group_by(
-                Trashcan.trashcan_id,
-                Trashcan.trashcan_name,
-                Trashcan.address_detail,
-                Trashcan.is_online,
-                Trashcan.trashcan_capacity,
-                Trashcan.current_volume,
-            )
-            .offset(offset)
-            .limit(limit)
+            .order_by(Trashcan.trashcan_id.asc())
         )
-        rows = (await db.execute(stmt)).all()
+        if cursor:
+            last_id = decode_cursor(cursor, (int,))[0]
+            stmt = stmt.where(Trashcan.trashcan_id > last_id)
+        else:
+            stmt = stmt.offset(offset)
+        rows = (await db.execute(stmt.limit(limit + 1))).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
         items = [
             {
                 "trashcan_id": row.trashcan_id,
@@ -52,7 +58,8 @@ class TrashcanList:
             }
             for row in rows
         ]
-        return {"total": int(total), "items": items}
+        next_cursor = encode_cursor([rows[-1].trashcan_id]) if has_more else None
+        return {"total": total, "items": items, "next_cursor": next_cursor}
     
     async def sort_trashcans_list(
         self,
@@ -63,15 +70,14 @@ class TrashcanList:
         name: str | None,
         offset: int,
         limit: int,
+        cursor: str | None = None,
+        include_total: bool = True,
     ):
-        await mark_offline_if_stale(db, minutes=5)
-        total_collected = func.coalesce(func.sum(Detection.object_count), 0).label(
-            "total_collected"
-        )
+        total_collected = func.coalesce(TrashcanStats.total_collected, 0)
         free_capacity = (
             func.coalesce(Trashcan.trashcan_capacity, 0)
             - func.coalesce(Trashcan.current_volume, 0)
-        ).label("free_capacity")
+        )
         fill_rate = (
             (func.coalesce(Trashcan.current_volume, 0) * 100.0)
             / func.nullif(Trashcan.trashcan_capacity, 0)
@@ -81,8 +87,8 @@ class TrashcanList:
             "free_capacity": free_capacity,
             "is_online": Trashcan.is_online,
         }
-        sort_expr = sort_map.get(sort_by, total_collected)
-        sort_expr = sort_expr.desc() if order == "desc" else sort_expr.asc()
+        sort_key = sort_map.get(sort_by, total_collected)
+        sort_expr = sort_key.desc() if order == "desc" else sort_key.asc()
 
         stmt = (
             select(
@@ -90,11 +96,12 @@ class TrashcanList:
                 Trashcan.trashcan_name,
                 Trashcan.address_detail,
                 Trashcan.is_online,
-                total_collected,
-                free_capacity,
+                total_collected.label("total_collected"),
+                free_capacity.label("free_capacity"),
                 fill_rate,
+                sort_key.label("sort_value"),
             )
-            .join(Detection, Detection.trashcan_id == Trashcan.trashcan_id, isouter=True)
+            .join(TrashcanStats, TrashcanStats.trashcan_id == Trashcan.trashcan_id, isouter=True)
             .where(Trashcan.is_deleted == False)
         )
         if city:
@@ -102,29 +109,26 @@ class TrashcanList:
         if name:
             stmt = stmt.where(Trashcan.trashcan_name.ilike(f"%{name}%"))
 
-        total_stmt = select(func.count(Trashcan.trashcan_id)).where(
-            Trashcan.is_deleted == False
-        )
-        if city:
-            total_stmt = total_stmt.where(Trashcan.trashcan_city.ilike(f"%{city}%"))
-        if name:
-            total_stmt = total_stmt.where(Trashcan.trashcan_name.ilike(f"%{name}%"))
-        total = (await db.execute(total_stmt)).scalar() or 0
-
-        stmt = (
-            stmt.group_by(
-                Trashcan.trashcan_id,
-                Trashcan.trashcan_name,
-                Trashcan.address_detail,
-                Trashcan.is_online,
-                Trashcan.trashcan_capacity,
-                Trashcan.current_volume,
+        total = None
+        if include_total:
+            total_stmt = select(func.count(Trashcan.trashcan_id)).where(
+                Trashcan.is_deleted == False
             )
-            .order_by(sort_expr, Trashcan.trashcan_id.asc())
-            .offset(offset)
-            .limit(limit)
-        )
-        rows = (await db.execute(stmt)).all()
+            if city:
+                total_stmt = total_stmt.where(Trashcan.trashcan_city.ilike(f"%{city}%"))
+            if name:
+                total_stmt = total_stmt.where(Trashcan.trashcan_name.ilike(f"%{name}%"))
+            total = int((await db.execute(total_stmt)).scalar() or 0)
+
+        stmt = stmt.order_by(sort_expr, Trashcan.trashcan_id.asc())
+        if cursor:
+            cursor_values = decode_cursor(cursor, (cursor_type(sort_key), int))
+            stmt = stmt.where(keyset_after(sort_key, Trashcan.trashcan_id, order, cursor_values))
+        else:
+            stmt = stmt.offset(offset)
+        rows = (await db.execute(stmt.limit(limit + 1))).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
         items = [
             {
                 "trashcan_id": row.trashcan_id,
@@ -137,6 +141,8 @@ class TrashcanList:
             }
             for row in rows
         ]
-        return {"total": int(total), "items": items}
-        
-
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor([int(last.sort_value or 0), last.trashcan_id])
+        return {"total": total, "items": items, "next_cursor": next_cursor}
@@ -1,12 +1,12 @@
-import asyncio
-
 from sqlmodel import select
 from sqlalchemy import func
-from db.entity import Trashcan, Detection
+from db.entity import Trashcan, TrashcanStats
 from db.db import SessionDep
 from models.request import TrashcanModify
 from models.request import TrashcanCreate
-from service.connection_utils import ping_server
+from service.connection_utils import probe_server
+from service.response_cache import dashboard_cache
+from service.map_index import map_index
 
 class TrashcanManagementService:
     def __init__(self):
@@ -18,11 +18,10 @@ class TrashcanManagementService:
                 Trashcan.trashcan_id,
                 Trashcan.trashcan_name,
                 Trashcan.address_detail,
-                func.coalesce(func.sum(Detection.object_count), 0).label("total_collected"),
+                func.coalesce(TrashcanStats.total_collected, 0).label("total_collected"),
             )
-            .join(Detection, Detection.trashcan_id == Trashcan.trashcan_id, isouter=True)
+            .join(TrashcanStats, TrashcanStats.trashcan_id == Trashcan.trashcan_id, isouter=True)
             .where(Trashcan.is_deleted == False)
-            .group_by(Trashcan.trashcan_id, Trashcan.trashcan_name, Trashcan.address_detail)
         )
         rows = (await db.execute(stmt)).all()
         return [
@@ -49,6 +48,8 @@ class TrashcanManagementService:
         target.trashcan_longitude = trashcan.trashcan_longitude
         await db.commit()
         await db.refresh(target)
+        await dashboard_cache.invalidate("dashboard:trashcans_full")
+        map_index.invalidate()
         return {"updated": True, "trashcan_id": target.trashcan_id, "message": "Trashcan updated successfully"}
 
     async def delete_trashcan(self, trashcan_id: int, db: SessionDep):
@@ -59,6 +60,8 @@ class TrashcanManagementService:
         
         target.is_deleted = True
         await db.commit()
+        await dashboard_cache.invalidate("dashboard:trashcans_full")
+        map_index.invalidate()
         return {"deleted": True, "trashcan_id": target.trashcan_id, "message": "Trashcan deleted successfully"}
     
     async def recover_trashcan(self, trashcan_id: int, db: SessionDep):
@@ -69,11 +72,13 @@ class TrashcanManagementService:
         
         target.is_deleted = False
         await db.commit()
+        await dashboard_cache.invalidate("dashboard:trashcans_full")
+        map_index.invalidate()
         return {"recovered": True, "trashcan_id": target.trashcan_id, "message": "Trashcan recovered successfully"}
 
     async def create_trashcan(self, trashcan: TrashcanCreate, db: SessionDep):
         try:
-            reachable = await asyncio.to_thread(ping_server, trashcan.server_url)
+            reachable = await probe_server(trashcan.server_url)
         except Exception:
             return {"created": False, "message": "Failed to connect to server"}
 
@@ -94,6 +99,8 @@ class TrashcanManagementService:
         )
         db.add(new_trashcan)
         await db.commit()
+        await dashboard_cache.invalidate("dashboard:trashcans_full")
+        map_index.invalidate()
         await db.refresh(new_trashcan)
         return {
             "created": True,
@@ -107,11 +114,10 @@ class TrashcanManagementService:
                 Trashcan.trashcan_id,
                 Trashcan.trashcan_name,
                 Trashcan.address_detail,
-                func.coalesce(func.sum(Detection.object_count), 0).label("total_collected"),
+                func.coalesce(TrashcanStats.total_collected, 0).label("total_collected"),
             )
-            .join(Detection, Detection.trashcan_id == Trashcan.trashcan_id, isouter=True)
+            .join(TrashcanStats, TrashcanStats.trashcan_id == Trashcan.trashcan_id, isouter=True)
             .where(Trashcan.is_deleted == True) 
-            .group_by(Trashcan.trashcan_id, Trashcan.trashcan_name, Trashcan.address_detail)
         )
         rows = (await db.execute(stmt)).all()
         return [
@@ -1,6 +1,7 @@
 from sqlmodel import select
 from db.entity import Trashcan
 from db.db import SessionDep
+from service.map_index import map_index
 
 class TrashcanMapService:
     def __init__(self):
@@ -29,4 +30,18 @@ class TrashcanMapService:
                 deleted.append(item)
             else:
                 active.append(item)
-        return {"active": active, "deleted": deleted}
\ No newline at end of file
+        return {"active": active, "deleted": deleted}
+
+    async def get_trashcans_viewport(
+        self,
+        db: SessionDep,
+        min_lat: float,
+        min_lng: float,
+        max_lat: float,
+        max_lng: float,
+        zoom: int,
+    ):
+        if min_lat > max_lat or min_lng > max_lng:
+            raise ValueError("Invalid bounding box")
+        await map_index.ensure_loaded(db)
+        return map_index.query(min_lat, min_lng, max_lat, max_lng, zoom)
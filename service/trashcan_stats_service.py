@@ -0,0 +1,336 @@
+import asyncio
+import logging
+import sys
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+from sqlmodel import select
+from sqlalchemy import delete, func, insert, or_, union_all, update
+
+from db.db import SessionDep, async_session_factory, engine
+from db.entity import (
+    ArchivedTrashcanStats,
+    ArchivedTrashcanTypeStats,
+    CollectionEvent,
+    Detection,
+    DetectionDetail,
+    TrashcanStats,
+    TrashcanTypeStats,
+)
+from service.detection_packing import unpack_many
+
+PACKED_SCAN_BATCH_SIZE = 5000
+
+logger = logging.getLogger(__name__)
+
+
+class TrashcanStatsService:
+    def __init__(self):
+        # API로 시작한 재계산 (요청은 바로 응답하고 결과는 rebuild_status()로 확인), 한 번에 하나만 실행
+        self._lock = asyncio.Lock()
+        self._rebuild: asyncio.Task | None = None
+        self.last_rebuild: dict | None = None
+        self.last_rebuild_at: datetime | None = None
+        self.last_error: str | None = None
+
+    @property
+    def rebuild_in_progress(self) -> bool:
+        return self._lock.locked()
+
+    async def start_rebuild(self) -> bool:
+        # 이미 실행 중이면 False
+        if self._lock.locked():
+            return False
+        # 잠금을 먼저 잡은 뒤 작업에 넘겨 시작 전에 다른 실행이 끼어들지 않게 함, 해제는 작업이 끝날 때(취소 포함)
+        await self._lock.acquire()
+        self._rebuild = asyncio.create_task(self._run_rebuild(), name="stats-rebuild")
+        self._rebuild.add_done_callback(lambda _: self._lock.release())
+        return True
+
+    async def _run_rebuild(self) -> None:
+        # 요청 세션은 응답과 함께 닫히므로 별도 세션 사용
+        try:
+            async with async_session_factory() as db:
+                self.last_rebuild = await self.rebuild(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            logger.exception("stats rebuild failed")
+            return
+        self.last_error = None
+        self.last_rebuild_at = datetime.now()
+
+    async def stop(self) -> None:
+        if self._rebuild is not None:
+            # 재계산은 한 트랜잭션이므로 취소하면 롤백되어 기존 누적 값이 그대로 남음
+            self._rebuild.cancel()
+            try:
+                await self._rebuild
+            except asyncio.CancelledError:
+                pass
+            self._rebuild = None
+
+    def rebuild_status(self) -> dict:
+        return {
+            "in_progress": self.rebuild_in_progress,
+            "last_result": self.last_rebuild,
+            "last_rebuild_at": self.last_rebuild_at,
+            "last_error": self.last_error,
+        }
+
+    def _detection_totals_stmt(self):
+        # 남아 있는 detection 합계 + 보존 정리로 삭제된 detection 합계
+        hot = select(
+            Detection.trashcan_id,
+            func.coalesce(func.sum(Detection.object_count), 0).label("total_collected"),
+            func.count(Detection.detection_id).label("total_events"),
+            func.max(Detection.detected_at).label("last_detected_at"),
+        ).group_by(Detection.trashcan_id)
+        archived = select(
+            ArchivedTrashcanStats.trashcan_id,
+            ArchivedTrashcanStats.total_collected,
+            ArchivedTrashcanStats.total_events,
+            ArchivedTrashcanStats.last_detected_at,
+        )
+        merged = union_all(hot, archived).subquery()
+        return select(
+            merged.c.trashcan_id,
+            func.sum(merged.c.total_collected).label("total_collected"),
+            func.sum(merged.c.total_events).label("total_events"),
+            func.max(merged.c.last_detected_at).label("last_detected_at"),
+        ).group_by(merged.c.trashcan_id)
+
+    def _detail_totals_stmt(self):
+        hot = (
+            select(
+                Detection.trashcan_id,
+                DetectionDetail.waste_type_id,
+                func.count(DetectionDetail.detail_id).label("detection_count"),
+            )
+            .join(Detection, Detection.detection_id == DetectionDetail.detection_id)
+            .group_by(Detection.trashcan_id, DetectionDetail.waste_type_id)
+        )
+        archived = select(
+            ArchivedTrashcanTypeStats.trashcan_id,
+            ArchivedTrashcanTypeStats.waste_type_id,
+            ArchivedTrashcanTypeStats.detection_count,
+        )
+        merged = union_all(hot, archived).subquery()
+        return select(
+            merged.c.trashcan_id,
+            merged.c.waste_type_id,
+            func.sum(merged.c.detection_count).label("detection_count"),
+        ).group_by(merged.c.trashcan_id, merged.c.waste_type_id)
+
+    async def _packed_type_totals(self, db: SessionDep) -> Counter:
+        # packed 모드로 저장된 detection은 detection_detail 행이 없으므로 blob을 풀어 종류별로 셈
+        totals = Counter()
+        stmt = (
+            select(Detection.trashcan_id, Detection.objects_blob)
+            .where(Detection.objects_blob.is_not(None))
+            .execution_options(yield_per=PACKED_SCAN_BATCH_SIZE)
+        )
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            index, objects = unpack_many([row.objects_blob for row in rows])
+            if not len(objects):
+                continue
+            trashcan_ids = np.array([row.trashcan_id for row in rows], dtype=np.int64)[index]
+            keys = trashcan_ids * 256 + objects.waste_type_ids
+            unique_keys, counts = np.unique(keys, return_counts=True)
+            for key, count in zip(unique_keys.tolist(), counts.tolist()):
+                totals[(key // 256, key % 256)] += count
+        return totals
+
+    async def _type_totals(self, db: SessionDep) -> Counter:
+        totals = Counter(
+            {
+                (row.trashcan_id, row.waste_type_id): int(row.detection_count or 0)
+                for row in (await db.execute(self._detail_totals_stmt())).all()
+            }
+        )
+        totals.update(await self._packed_type_totals(db))
+        return totals
+
+    async def rebuild(self, db: SessionDep) -> dict:
+        # detection 이력 전체로 누적 테이블을 다시 만듦 (수신을 멈춘 상태에서 실행 권장)
+        await db.execute(delete(TrashcanTypeStats))
+        await db.execute(delete(TrashcanStats))
+        totals = self._detection_totals_stmt().subquery()
+        await db.execute(
+            insert(TrashcanStats).from_select(
+                ["trashcan_id", "total_collected", "total_events", "last_detected_at"],
+                select(
+                    totals.c.trashcan_id,
+                    totals.c.total_collected,
+                    totals.c.total_events,
+                    totals.c.last_detected_at,
+                ),
+            )
+        )
+        await self._rebuild_collection_counters(db)
+        type_totals = await self._type_totals(db)
+        if type_totals:
+            await db.execute(
+                insert(TrashcanTypeStats),
+                [
+                    {"trashcan_id": trashcan_id, "waste_type_id": waste_type_id, "detection_count": count}
+                    for (trashcan_id, waste_type_id), count in type_totals.items()
+                ],
+            )
+        await db.commit()
+        trashcans = (await db.execute(select(func.count(TrashcanStats.trashcan_id)))).scalar() or 0
+        return {"rebuilt": True, "trashcans": int(trashcans)}
+
+    async def _rebuild_collection_counters(self, db: SessionDep) -> None:
+        # 수거 누적은 collection_event에서, 현재 주기 이벤트 수는 마지막 수거 이후 detection에서 다시 계산
+        collections = (
+            select(
+                CollectionEvent.trashcan_id,
+                func.max(CollectionEvent.collected_at).label("last_collected_at"),
+                func.count(CollectionEvent.id).label("total_collections"),
+                func.coalesce(func.sum(CollectionEvent.volume_collected), 0).label("total_emptied_volume"),
+            )
+            .group_by(CollectionEvent.trashcan_id)
+            .subquery()
+        )
+        collection_rows = (await db.execute(select(collections))).all()
+        cycle_stmt = (
+            select(
+                Detection.trashcan_id,
+                func.count(Detection.detection_id).label("cycle_events"),
+            )
+            .join(collections, collections.c.trashcan_id == Detection.trashcan_id, isouter=True)
+            .where(
+                or_(
+                    collections.c.last_collected_at.is_(None),
+                    Detection.detected_at > collections.c.last_collected_at,
+                )
+            )
+            .group_by(Detection.trashcan_id)
+        )
+        values = {
+            row.trashcan_id: {"trashcan_id": row.trashcan_id, "cycle_events": int(row.cycle_events)}
+            for row in (await db.execute(cycle_stmt)).all()
+        }
+        for row in collection_rows:
+            values.setdefault(row.trashcan_id, {"trashcan_id": row.trashcan_id, "cycle_events": 0}).update(
+                last_collected_at=row.last_collected_at,
+                total_collections=int(row.total_collections),
+                total_emptied_volume=int(row.total_emptied_volume),
+            )
+        if not values:
+            return
+        existing = set((await db.execute(select(TrashcanStats.trashcan_id))).scalars().all())
+        # 디텍션 없이 수거 이력만 있는 쓰레기통
+        missing = [
+            {"trashcan_id": trashcan_id, "total_collected": 0, "total_events": 0}
+            for trashcan_id in values.keys() - existing
+        ]
+        if missing:
+            await db.execute(insert(TrashcanStats), missing)
+        rows = [
+            {
+                "trashcan_id": trashcan_id,
+                "cycle_events": value["cycle_events"],
+                "last_collected_at": value.get("last_collected_at"),
+                "total_collections": value.get("total_collections", 0),
+                "total_emptied_volume": value.get("total_emptied_volume", 0),
+            }
+            for trashcan_id, value in values.items()
+        ]
+        await db.execute(update(TrashcanStats), rows)
+
+    async def backfill_if_empty(self, db: SessionDep) -> bool:
+        has_stats = (await db.execute(select(TrashcanStats.trashcan_id).limit(1))).first()
+        if has_stats:
+            return False
+        has_history = (await db.execute(select(Detection.detection_id).limit(1))).first()
+        if not has_history:
+            return False
+        await self.rebuild(db)
+        return True
+
+    async def check_consistency(self, db: SessionDep) -> dict:
+        expected = {
+            row.trashcan_id: (int(row.total_collected or 0), int(row.total_events or 0))
+            for row in (await db.execute(self._detection_totals_stmt())).all()
+        }
+        stored = {
+            row.trashcan_id: (int(row.total_collected or 0), int(row.total_events or 0))
+            for row in (
+                await db.execute(
+                    select(
+                        TrashcanStats.trashcan_id,
+                        TrashcanStats.total_collected,
+                        TrashcanStats.total_events,
+                    )
+                )
+            ).all()
+        }
+        expected_types = dict(await self._type_totals(db))
+        stored_types = {
+            (row.trashcan_id, row.waste_type_id): int(row.detection_count or 0)
+            for row in (
+                await db.execute(
+                    select(
+                        TrashcanTypeStats.trashcan_id,
+                        TrashcanTypeStats.waste_type_id,
+                        TrashcanTypeStats.detection_count,
+                    )
+                )
+            ).all()
+        }
+
+        mismatches = []
+        for trashcan_id in sorted(expected.keys() | stored.keys()):
+            want = expected.get(trashcan_id, (0, 0))
+            have = stored.get(trashcan_id, (0, 0))
+            if want != have:
+                mismatches.append(
+                    {
+                        "trashcan_id": trashcan_id,
+                        "expected": {"total_collected": want[0], "total_events": want[1]},
+                        "stored": {"total_collected": have[0], "total_events": have[1]},
+                    }
+                )
+        for key in sorted(expected_types.keys() | stored_types.keys()):
+            want = expected_types.get(key, 0)
+            have = stored_types.get(key, 0)
+            if want != have:
+                mismatches.append(
+                    {
+                        "trashcan_id": key[0],
+                        "waste_type_id": key[1],
+                        "expected": want,
+                        "stored": have,
+                    }
+                )
+        return {"consistent": not mismatches, "mismatches": mismatches}
+
+
+trashcan_stats_service = TrashcanStatsService()
+
+
+async def _main(command: str) -> None:
+    service = trashcan_stats_service
+    async with async_session_factory() as db:
+        if command == "rebuild":
+            result = await service.rebuild(db)
+        else:
+            result = await service.check_consistency(db)
+        print(result)
+    await engine.dispose()
+    if command == "check" and not result["consistent"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # python -m service.trashcan_stats_service rebuild|check
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+    if command not in ("rebuild", "check"):
+        print("usage: python -m service.trashcan_stats_service rebuild|check")
+        sys.exit(2)
+    asyncio.run(_main(command))
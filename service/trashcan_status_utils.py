@@ -1,19 +1,84 @@
+import os
 from datetime import datetime, timedelta
 
-from sqlmodel import update
+from sqlmodel import select, update
 
-from db.db import SessionDep
+from db.db import SessionDep, async_session_factory
 from db.entity import Trashcan
+from service.background_task import PeriodicTask
+from service.event_bus import event_bus
 
+LIVENESS_INTERVAL_SECONDS = int(os.getenv("LIVENESS_INTERVAL_SECONDS", "30"))
+LIVENESS_STALE_MINUTES = int(os.getenv("LIVENESS_STALE_MINUTES", "5"))
 
-async def mark_offline_if_stale(db: SessionDep, minutes: int = 5) -> None:
+
+async def mark_offline_if_stale(db: SessionDep, minutes: int = LIVENESS_STALE_MINUTES) -> int:
     cutoff = datetime.now() - timedelta(minutes=minutes)
-    stmt = (
+    conditions = (
+        Trashcan.is_online == True,
+        Trashcan.last_connected_at != None,
+        Trashcan.last_connected_at < cutoff,
+    )
+    if not event_bus.has_subscribers:
+        result = await db.execute(update(Trashcan).where(*conditions).values(is_online=False))
+        await db.commit()
+        return result.rowcount or 0
+
+    # 실시간 구독자가 있으면 오프라인으로 바뀌는 쓰레기통을 먼저 조회해 이벤트로 알림
+    stale_ids = (await db.execute(select(Trashcan.trashcan_id).where(*conditions))).scalars().all()
+    if not stale_ids:
+        return 0
+    result = await db.execute(
         update(Trashcan)
-        .where(Trashcan.is_online == True)
-        .where(Trashcan.last_connected_at != None)
-        .where(Trashcan.last_connected_at < cutoff)
+        .where(Trashcan.trashcan_id.in_(stale_ids))
+        .where(*conditions)
         .values(is_online=False)
     )
-    await db.execute(stmt)
     await db.commit()
+    for trashcan_id in stale_ids:
+        event_bus.publish("status", {"trashcan_id": trashcan_id, "is_online": False})
+    return result.rowcount or 0
+
+
+class LivenessMonitor:
+    # 읽기 API 대신 백그라운드에서 주기적으로 오프라인 처리
+    def __init__(
+        self,
+        interval: int = LIVENESS_INTERVAL_SECONDS,
+        minutes: int = LIVENESS_STALE_MINUTES,
+    ):
+        self.minutes = minutes
+        self.task = PeriodicTask("liveness-monitor", interval, self.sweep)
+        self.sweeps = 0
+        self.last_flipped = 0
+        self.total_flipped = 0
+        self.last_sweep_at: datetime | None = None
+
+    async def start(self) -> None:
+        await self.task.start()
+
+    async def stop(self) -> None:
+        await self.task.stop()
+
+    async def sweep(self) -> int:
+        async with async_session_factory() as db:
+            flipped = await mark_offline_if_stale(db, self.minutes)
+        self.sweeps += 1
+        self.last_flipped = flipped
+        self.total_flipped += flipped
+        self.last_sweep_at = datetime.now()
+        return flipped
+
+    def stats(self) -> dict:
+        return {
+            "running": self.task.running,
+            "interval_seconds": self.task.interval,
+            "stale_minutes": self.minutes,
+            "sweeps": self.sweeps,
+            "last_flipped": self.last_flipped,
+            "total_flipped": self.total_flipped,
+            "last_sweep_at": self.last_sweep_at,
+        }
+
+
+liveness_monitor = LivenessMonitor()
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import time
+
+from sqlmodel import select
+
+from db.db import SessionDep
+from db.entity import WasteType
+
+# wastetype.class_id가 비어있는 기존 데이터용 기본 YOLO 클래스 매핑
+DEFAULT_CLASS_NAMES = {
+    0: "MetalCan",
+    1: "PetBottle",
+    2: "Plastic",
+    3: "Styrofoam",
+}
+
+WASTE_TYPE_CACHE_TTL = int(os.getenv("WASTE_TYPE_CACHE_TTL", "300"))
+
+
+class WasteTypeRegistry:
+    def __init__(self, ttl: int = WASTE_TYPE_CACHE_TTL):
+        self.ttl = ttl
+        self._by_class_id: dict[int, tuple[int, str]] = {}
+        self._by_name: dict[str, int] = {}
+        self._by_id: dict[int, str] = {}
+        self._type_names: list[str] = []
+        self._loaded_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        if self.ttl <= 0:
+            return True
+        return time.monotonic() - self._loaded_at < self.ttl
+
+    async def ensure_loaded(self, db: SessionDep) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            await self.refresh(db)
+
+    async def refresh(self, db: SessionDep) -> None:
+        stmt = select(
+            WasteType.waste_type_id,
+            WasteType.type_name,
+            WasteType.class_id,
+        ).order_by(WasteType.waste_type_id.asc())
+        rows = (await db.execute(stmt)).all()
+
+        default_class_ids = {name: class_id for class_id, name in DEFAULT_CLASS_NAMES.items()}
+        by_class_id = {}
+        by_name = {}
+        by_id = {}
+        type_names = []
+        for row in rows:
+            type_names.append(row.type_name)
+            by_name[row.type_name] = row.waste_type_id
+            by_id[row.waste_type_id] = row.type_name
+            class_id = row.class_id
+            if class_id is None:
+                class_id = default_class_ids.get(row.type_name)
+            if class_id is not None:
+                by_class_id[class_id] = (row.waste_type_id, row.type_name)
+
+        self._by_class_id = by_class_id
+        self._by_name = by_name
+        self._by_id = by_id
+        self._type_names = type_names
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def resolve(self, class_id: int | None) -> tuple[int, str] | None:
+        if class_id is None:
+            return None
+        return self._by_class_id.get(class_id)
+
+    def waste_type_id(self, type_name: str) -> int | None:
+        return self._by_name.get(type_name)
+
+    def type_name(self, waste_type_id: int) -> str | None:
+        return self._by_id.get(waste_type_id)
+
+    @property
+    def type_names(self) -> list[str]:
+        return list(self._type_names)
+
+    def empty_counts(self) -> dict[str, int]:
+        return {name: 0 for name in self._type_names}
+
+    def empty_lists(self) -> dict[str, list]:
+        return {name: [] for name in self._type_names}
+
+
+waste_type_registry = WasteTypeRegistry()
@@ -0,0 +1,169 @@
+import os
+
+# db.db는 import 시점에 MySQL 접속 정보를 확인하므로 테스트/벤치마크에서는 더미 값을 채움 (실제 접속은 하지 않음)
+for _name, _value in (
+    ("DB_USER", "test"),
+    ("DB_PW", "test"),
+    ("DB_IP", "127.0.0.1"),
+    ("DB_PORT", "3306"),
+    ("DB_NAME", "test"),
+):
+    os.environ.setdefault(_name, _value)
+
+import tempfile
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import sqlmodel.sql.sqltypes as sqlmodel_types
+from sqlalchemy import event, literal_column
+from sqlalchemy.dialects.mysql.dml import OnDuplicateClause
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.functions import Function
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# 서비스는 naive datetime(서버 로컬 시각)을 그대로 저장함
+# 최신 sqlmodel의 UTCDateTime은 naive 값을 거부하므로 MySQL DATETIME처럼 그대로 통과시킴
+if hasattr(sqlmodel_types, "UTCDateTime"):
+    sqlmodel_types.UTCDateTime.process_bind_param = lambda self, value, dialect: value
+    sqlmodel_types.UTCDateTime.process_result_value = lambda self, value, dialect: value
+
+
+@compiles(OnDuplicateClause, "sqlite")
+def _on_duplicate_as_upsert(clause, compiler, **kw):
+    # MySQL ON DUPLICATE KEY UPDATE -> SQLite ON CONFLICT DO UPDATE (inserted.<col> -> excluded.<col>)
+    inserted = clause.inserted_alias
+
+    def replace(element, **_):
+        if getattr(element, "table", None) is inserted:
+            return literal_column(f"excluded.{element.name}")
+        return None
+
+    assignments = []
+    for key, value in clause.update.items():
+        name = key if isinstance(key, str) else key.name
+        value = visitors.replacement_traverse(value, {}, replace)
+        assignments.append(f"{compiler.preparer.quote(name)} = {compiler.process(value, **kw)}")
+    return "ON CONFLICT DO UPDATE SET " + ", ".join(assignments)
+
+
+# MySQL TIMESTAMPDIFF(unit, a, b) -> julianday 차이 (MySQL처럼 0 방향으로 버림)
+_TIMESTAMPDIFF_UNITS = {"SECOND": 86400, "MINUTE": 1440, "HOUR": 24, "DAY": 1}
+
+
+@compiles(Function, "sqlite")
+def _timestampdiff(element, compiler, **kw):
+    if element.name.lower() != "timestampdiff":
+        return compiler.visit_function(element, **kw)
+    unit, start, end = element.clauses.clauses
+    factor = _TIMESTAMPDIFF_UNITS[str(unit).upper()]
+    return (
+        f"CAST((julianday({compiler.process(end, **kw)}) - julianday({compiler.process(start, **kw)}))"
+        f" * {factor} AS INTEGER)"
+    )
+
+
+def _register_functions(dbapi_connection, connection_record) -> None:
+    dbapi_connection.create_function(
+        "greatest", -1, lambda *values: max((value for value in values if value is not None), default=None)
+    )
+    dbapi_connection.create_function("last_insert_id", 1, lambda value: value)
+
+
+def create_test_engine(path: str | None = None):
+    if path is None:
+        path = tempfile.mktemp(suffix=".db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    event.listen(engine.sync_engine, "connect", _register_functions)
+    return engine
+
+
+def _add_foreign_key_indexes(conn) -> None:
+    # MySQL(InnoDB)은 FK 컬럼으로 시작하는 인덱스가 없으면 자동으로 만듦, 실행 계획을 맞추려고 SQLite에도 같은 인덱스 생성
+    for table in SQLModel.metadata.sorted_tables:
+        leading = {index.columns[0].name for index in table.indexes}
+        leading |= {
+            constraint.columns[0].name
+            for constraint in table.constraints
+            if len(constraint.columns) and constraint.__visit_name__ in ("primary_key_constraint", "unique_constraint")
+        }
+        for foreign_key in table.foreign_keys:
+            column = foreign_key.parent.name
+            if column in leading:
+                continue
+            conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS fk_{table.name}_{column} ON {table.name} ({column})")
+            leading.add(column)
+
+
+async def create_schema(engine) -> None:
+    import db.entity  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_add_foreign_key_indexes)
+
+
+def create_session_factory(engine):
+    return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class StatementCounter:
+    # 엔진에서 실행된 SQL 문 (DB 왕복 횟수), session_factory.kw["bind"]로 테스트 엔진을 넘길 수 있음
+    def __init__(self, engine):
+        self.engine = engine.sync_engine
+        self.statements: list[str] = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+    def close(self) -> None:
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, *args) -> None:
+        self.statements.append(statement)
+
+
+@asynccontextmanager
+async def sqlite_database(path: str | None = None):
+    # 스키마를 만든 SQLite DB의 세션 팩토리, 블록이 끝나면 엔진 정리
+    engine = create_test_engine(path)
+    try:
+        await create_schema(engine)
+        yield create_session_factory(engine)
+    finally:
+        await engine.dispose()
+
+
+async def seed(session_factory, trashcan_ids=(1,), city: str | None = "Seoul", capacity: int = 100) -> None:
+    from db.entity import Trashcan, WasteType
+    from service.waste_type_registry import DEFAULT_CLASS_NAMES
+
+    async with session_factory() as db:
+        for class_id, type_name in DEFAULT_CLASS_NAMES.items():
+            db.add(WasteType(waste_type_id=class_id + 1, type_name=type_name, class_id=class_id))
+        for trashcan_id in trashcan_ids:
+            db.add(
+                Trashcan(
+                    trashcan_id=trashcan_id,
+                    trashcan_name=f"trashcan-{trashcan_id}",
+                    trashcan_capacity=capacity,
+                    current_volume=0,
+                    trashcan_city=city,
+                    address_detail="",
+                    trashcan_latitude=37.5 + trashcan_id * 0.001,
+                    trashcan_longitude=127.0 + trashcan_id * 0.001,
+                    is_online=False,
+                    is_deleted=False,
+                    last_connected_at=datetime.now(),
+                    server_url=None,
+                )
+            )
+        await db.commit()
@@ -0,0 +1,133 @@
+from types import SimpleNamespace
+
+import numpy as np
+from sqlalchemy import update
+
+from tests.sqlite_compat import seed, sqlite_database
+from tests.test_detections_service import run
+
+from db.entity import Trashcan
+from service.collection_route_service import CollectionRouteService, nearest_neighbour_route, plan_route, two_opt
+from service.geo_utils import haversine_km, haversine_matrix_km
+from service.map_index import TrashcanGridIndex
+
+
+def tour_length(distances: np.ndarray, route: np.ndarray) -> float:
+    return float(distances[route[:-1], route[1:]].sum())
+
+
+def test_two_opt_is_never_longer_than_nearest_neighbour():
+    rng = np.random.default_rng(7)
+    for count in (2, 3, 5, 40, 200):
+        lats = 37.5 + rng.uniform(-0.05, 0.05, count)
+        lngs = 127.0 + rng.uniform(-0.05, 0.05, count)
+        distances = haversine_matrix_km(lats, lngs)
+        start = nearest_neighbour_route(distances)
+        improved, _, converged = two_opt(distances, start.copy(), float("inf"))
+        assert converged
+        assert tour_length(distances, improved) <= tour_length(distances, start) + 1e-9
+        # 차고지에서 출발해 모든 지점을 한 번씩 방문하고 차고지로 복귀
+        assert improved[0] == improved[-1] == 0
+        assert sorted(improved[:-1].tolist()) == list(range(count))
+
+    # 시간 한도가 이미 지났으면 초기 경로 그대로 반환
+    route, legs, passes, converged = plan_route(lats, lngs, budget_ms=-1)
+    assert not converged
+    assert np.array_equal(route, nearest_neighbour_route(distances))
+    assert np.isclose(legs.sum(), tour_length(distances, route))
+
+
+def test_route_includes_only_bins_over_threshold(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1, 2, 3, 4))
+            async with session_factory() as db:
+                for trashcan_id, volume in ((1, 95), (2, 80), (3, 79), (4, 100)):
+                    await db.execute(
+                        update(Trashcan).where(Trashcan.trashcan_id == trashcan_id).values(current_volume=volume)
+                    )
+                await db.commit()
+
+                service = CollectionRouteService()
+                result = await service.get_collection_route(db, 37.5, 127.0, 80)
+                assert result["count"] == 3
+                assert sorted(item["trashcan_id"] for item in result["items"]) == [1, 2, 4]
+                assert [item["order"] for item in result["items"]] == [1, 2, 3]
+                assert np.isclose(
+                    result["total_distance_km"],
+                    sum(item["leg_distance_km"] for item in result["items"]) + result["return_distance_km"],
+                    atol=0.01,
+                )
+                # 적재율 높은 순으로 limit개만 포함
+                limited = await service.get_collection_route(db, 37.5, 127.0, 80, limit=1)
+                assert [item["trashcan_id"] for item in limited["items"]] == [4]
+
+                empty = await service.get_collection_route(db, 37.5, 127.0, 101)
+                assert (empty["count"], empty["items"], empty["total_distance_km"]) == (0, [], 0.0)
+
+    run(scenario)
+
+
+def grid_rows(points: list[tuple[float, float, float | None]]):
+    return [
+        SimpleNamespace(
+            trashcan_id=index + 1,
+            trashcan_name=f"trashcan-{index + 1}",
+            trashcan_latitude=lat,
+            trashcan_longitude=lng,
+            is_online=True,
+            fill_rate=rate,
+        )
+        for index, (lat, lng, rate) in enumerate(points)
+    ]
+
+
+def brute_force(points, lat, lng, k, min_fill_rate=None) -> list[tuple[int, float]]:
+    candidates = [
+        (index + 1, float(haversine_km(lat, lng, point_lat, point_lng)))
+        for index, (point_lat, point_lng, rate) in enumerate(points)
+        if min_fill_rate is None or (rate is not None and rate >= min_fill_rate)
+    ]
+    return sorted(candidates, key=lambda item: item[1])[:k]
+
+
+def test_nearest_matches_brute_force_haversine():
+    rng = np.random.default_rng(3)
+    # 서울 부근 밀집 + 먼 곳 몇 개, 같은 칸 경계에 걸친 점 포함
+    points = [
+        (float(lat), float(lng), float(rate))
+        for lat, lng, rate in zip(
+            37.5 + rng.uniform(-0.08, 0.08, 400), 127.0 + rng.uniform(-0.08, 0.08, 400), rng.uniform(0, 100, 400)
+        )
+    ]
+    points += [(35.1, 129.0, 90.0), (33.4, 126.5, None), (37.55, 127.0, 50.0), (37.56, 127.01, 50.0)]
+    index = TrashcanGridIndex(cell_deg=0.01, ttl=0)
+    index.build(grid_rows(points))
+
+    queries = [(37.5, 127.0), (37.55, 127.0), (37.5499999, 126.9999999), (37.56, 127.01), (37.7, 127.2), (36.0, 128.0)]
+    queries += [
+        (float(lat), float(lng))
+        for lat, lng in zip(37.5 + rng.uniform(-0.1, 0.1, 30), 127.0 + rng.uniform(-0.1, 0.1, 30))
+    ]
+    for lat, lng in queries:
+        for k, min_fill_rate in ((1, None), (7, None), (25, 60.0), (len(points) + 5, None), (3, 95.0)):
+            expected = brute_force(points, lat, lng, k, min_fill_rate)
+            found = index.nearest(lat, lng, k, min_fill_rate)
+            assert [item["distance_km"] for item in found] == [round(distance, 3) for _, distance in expected]
+            assert [item["trashcan_id"] for item in found] == [trashcan_id for trashcan_id, _ in expected]
+
+
+def test_nearest_on_ring_boundary_and_empty_index():
+    # 기준점 칸 바로 옆 칸의 점이 같은 칸의 먼 점보다 가까운 경우
+    points = [(37.5099, 127.0001, 80.0), (37.5101, 127.0001, 80.0), (37.5001, 127.0001, 80.0)]
+    index = TrashcanGridIndex(cell_deg=0.01, ttl=0)
+    index.build(grid_rows(points))
+    found = index.nearest(37.5098, 127.0001, 2)
+    assert [item["trashcan_id"] for item in found] == [1, 2]
+    # 적재율 조건에 맞는 점이 없으면 빈 목록
+    assert index.nearest(37.5098, 127.0001, 2, min_fill_rate=90) == []
+
+    empty = TrashcanGridIndex(cell_deg=0.01, ttl=0)
+    empty.build([])
+    assert empty.nearest(37.5, 127.0, 5) == []
+    assert index.nearest(37.5, 127.0, 0) == []
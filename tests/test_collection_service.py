@@ -0,0 +1,93 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+
+from tests.sqlite_compat import seed, sqlite_database
+from tests.test_detections_service import make_payload, run
+
+from db.entity import CollectionEvent, Trashcan, TrashcanStats
+from models.request import CollectionEventCreate
+from service.collection_service import CollectionService
+from service.detections_service import DetectionService
+
+
+async def trashcan_state(session_factory, trashcan_id: int = 1) -> tuple:
+    async with session_factory() as db:
+        volume = (
+            await db.execute(select(Trashcan.current_volume).where(Trashcan.trashcan_id == trashcan_id))
+        ).scalar_one()
+        stats = (
+            await db.execute(select(TrashcanStats).where(TrashcanStats.trashcan_id == trashcan_id))
+        ).scalar_one()
+        return volume, stats.cycle_events, stats.total_collections, stats.total_emptied_volume
+
+
+def test_collection_resets_current_volume_and_starts_new_cycle(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1, 2))
+            detections = DetectionService()
+            collections = CollectionService()
+            async with session_factory() as db:
+                await detections.save_detections(
+                    [make_payload(1, "a", [1, 2]), make_payload(1, "b", [1, 2, 3]), make_payload(2, "c", [1])],
+                    db,
+                )
+            assert await trashcan_state(session_factory) == (5, 2, 0, 0)
+
+            first_at = datetime(2026, 10, 1, 13, 0)
+            async with session_factory() as db:
+                first = await collections.record_collection(
+                    1, CollectionEventCreate(collected_at=first_at, collected_by="crew-1"), db
+                )
+            assert first["volume_collected"] == 5
+            assert first["cycle_events"] == 2
+            assert first["cycle_started_at"] is None
+            assert await trashcan_state(session_factory) == (0, 0, 1, 5)
+            # 다른 쓰레기통은 그대로
+            assert (await trashcan_state(session_factory, 2))[:2] == (1, 1)
+
+            # 수거 후 들어온 디텍션은 0부터 다시 쌓임
+            async with session_factory() as db:
+                await detections.save_detections([make_payload(1, "d", [4])], db)
+            assert await trashcan_state(session_factory) == (1, 1, 1, 5)
+
+            async with session_factory() as db:
+                second = await collections.record_collection(
+                    1, CollectionEventCreate(collected_at=datetime(2026, 10, 2, 9, 0)), db
+                )
+                with pytest.raises(ValueError):
+                    await collections.record_collection(1, CollectionEventCreate(collected_at=first_at), db)
+            assert second["cycle_started_at"] == first_at
+            assert (second["volume_collected"], second["cycle_events"]) == (1, 1)
+            assert await trashcan_state(session_factory) == (0, 0, 2, 6)
+
+            async with session_factory() as db:
+                events = (
+                    await db.execute(
+                        select(
+                            CollectionEvent.id,
+                            CollectionEvent.volume_collected,
+                            CollectionEvent.cycle_events,
+                            CollectionEvent.cycle_started_at,
+                            CollectionEvent.collected_by,
+                        ).order_by(CollectionEvent.id)
+                    )
+                ).all()
+            assert [tuple(event) for event in events] == [
+                (first["id"], 5, 2, None, "crew-1"),
+                (second["id"], 1, 1, first_at, None),
+            ]
+
+    run(scenario)
+
+
+def test_collection_of_unknown_trashcan_returns_none(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1,))
+            async with session_factory() as db:
+                assert await CollectionService().record_collection(99, CollectionEventCreate(), db) is None
+
+    run(scenario)
@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from tests.sqlite_compat import seed, sqlite_database
+
+from db.entity import Trashcan
+from service import connection_utils
+
+
+def test_fleet_health_probes_outside_transaction(tmp_path, monkeypatch):
+    async def scenario():
+        accepted = []
+
+        async def handle(reader, writer):
+            accepted.append(writer.get_extra_info("peername"))
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1, 2, 3))
+            async with session_factory() as db:
+                await db.execute(update(Trashcan).where(Trashcan.trashcan_id == 1).values(server_url=f"http://127.0.0.1:{port}"))
+                # 해석되지 않는 호스트 -> 연결 실패
+                await db.execute(
+                    update(Trashcan).where(Trashcan.trashcan_id == 2).values(server_url="http://unreachable.invalid", is_online=True)
+                )
+                await db.commit()
+
+            in_transaction = []
+            real_probe = connection_utils.probe_server
+            async with session_factory() as db:
+
+                async def probe(url, timeout=connection_utils.HEALTH_CHECK_TIMEOUT):
+                    in_transaction.append(db.in_transaction())
+                    return await real_probe(url, timeout)
+
+                monkeypatch.setattr(connection_utils, "probe_server", probe)
+                result = await connection_utils.check_fleet_health(db, timeout=1)
+
+            assert in_transaction == [False, False]
+            assert result["checked"] == 2
+            assert {item["trashcan_id"]: item["status"] for item in result["items"]} == {1: "ok", 2: "error"}
+            async with session_factory() as db:
+                rows = dict((await db.execute(select(Trashcan.trashcan_id, Trashcan.is_online))).all())
+            assert rows == {1: True, 2: False, 3: False}
+        server.close()
+        await server.wait_closed()
+        assert accepted
+
+    asyncio.run(scenario())
+
+
+def test_fleet_health_updates_only_changed_rows(tmp_path, monkeypatch):
+    async def scenario():
+        # 포트를 열었다 닫아 연결 거부(RST)가 나는 주소를 만듦
+        server = await asyncio.start_server(lambda reader, writer: writer.close(), "127.0.0.1", 0)
+        refused_port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        assert not await connection_utils.probe_server(f"http://127.0.0.1:{refused_port}", 1)
+
+        ingested_at = datetime(2026, 1, 1, 9, 0)
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1, 2, 3, 4))
+            async with session_factory() as db:
+                # 1: 온라인 유지, 2: 오프라인 -> 온라인, 3: 응답 없음 -> 오프라인, 4: 응답 없지만 점검 중 디텍션 수신
+                for trashcan_id, is_online in ((1, True), (2, False), (3, True), (4, True)):
+                    await db.execute(
+                        update(Trashcan)
+                        .where(Trashcan.trashcan_id == trashcan_id)
+                        .values(server_url=f"http://bin-{trashcan_id}", is_online=is_online, last_connected_at=ingested_at)
+                    )
+                await db.commit()
+
+            async def probe(url, timeout=connection_utils.HEALTH_CHECK_TIMEOUT):
+                if url == "http://bin-4":
+                    async with session_factory() as other:
+                        await other.execute(
+                            update(Trashcan).where(Trashcan.trashcan_id == 4).values(last_connected_at=datetime.now())
+                        )
+                        await other.commit()
+                return url in ("http://bin-1", "http://bin-2")
+
+            monkeypatch.setattr(connection_utils, "probe_server", probe)
+            async with session_factory() as db:
+                result = await connection_utils.check_fleet_health(db, timeout=1)
+            assert (result["online"], result["offline"]) == (2, 2)
+
+            async with session_factory() as db:
+                rows = {
+                    row.trashcan_id: row
+                    for row in (
+                        await db.execute(select(Trashcan.trashcan_id, Trashcan.is_online, Trashcan.last_connected_at))
+                    ).all()
+                }
+            assert rows[1].is_online and rows[1].last_connected_at == ingested_at
+            assert rows[2].is_online and rows[2].last_connected_at > ingested_at
+            assert not rows[3].is_online and rows[3].last_connected_at == ingested_at
+            assert rows[4].is_online
+
+    asyncio.run(scenario())
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import tests.sqlite_compat  # noqa: F401
+
+from db.db import TimedAsyncQueuePool, pool_wait_stats
+
+
+def test_only_pool_timeouts_are_counted(tmp_path):
+    async def scenario():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'db.sqlite'}",
+            poolclass=TimedAsyncQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        broken = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'db.sqlite'}",
+            poolclass=TimedAsyncQueuePool,
+        )
+        try:
+            before = pool_wait_stats.timeouts
+            async with engine.connect() as held:
+                await held.execute(text("SELECT 1"))
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+            assert pool_wait_stats.timeouts == before + 1
+
+            # 연결 자체가 실패하면 원래 예외가 그대로 올라오고 timeout으로 세지 않음
+            with pytest.raises(exc.OperationalError):
+                async with broken.connect():
+                    pass
+            assert pool_wait_stats.timeouts == before + 1
+        finally:
+            await engine.dispose()
+            await broken.dispose()
+
+    asyncio.run(scenario())
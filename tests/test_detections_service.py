@@ -0,0 +1,278 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import event, func, select
+
+from tests.sqlite_compat import StatementCounter, seed, sqlite_database
+
+from db.entity import DailyStats, Detection, DetectionDetail, Trashcan, TrashcanStats
+from models.request import BBox, DetectionCreate, DetectionObject
+from service.detections_service import DetectionService
+from service.event_bus import event_bus
+from service.frame_dedup import recent_frames
+
+
+def make_payload(trashcan_id: int, frame_id: str | None, waste_type_ids: list[int]) -> DetectionCreate:
+    objects = [
+        DetectionObject(
+            waste_type_id=waste_type_id,
+            type_name=f"type-{waste_type_id}",
+            confidence=0.5 + index / 100,
+            box=BBox(x1=index, y1=index + 1, x2=index + 2, y2=index + 3),
+        )
+        for index, waste_type_id in enumerate(waste_type_ids)
+    ]
+    return DetectionCreate(
+        trashcan_id=trashcan_id,
+        frame_id=frame_id,
+        filename=None,
+        saved_path=None,
+        object_count=len(objects),
+        objects=objects,
+        detected_at=datetime(2026, 10, 1, 12, 0),
+    )
+
+
+def run(scenario) -> None:
+    recent_frames._keys.clear()
+    asyncio.run(scenario())
+
+
+def test_batch_maps_details_to_their_detection(tmp_path):
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1, 2))
+            payloads = [
+                make_payload(2, "a", [1, 2]),
+                make_payload(1, "b", [3]),
+                make_payload(2, None, []),
+                make_payload(1, "c", [4, 4, 1]),
+            ]
+            async with session_factory() as db:
+                assert await DetectionService().save_detections(payloads, db) == [True] * 4
+                detections = (
+                    await db.execute(select(Detection).order_by(Detection.detection_id))
+                ).scalars().all()
+                assert [(d.trashcan_id, d.frame_id, d.object_count) for d in detections] == [
+                    (2, "a", 2),
+                    (1, "b", 1),
+                    (2, None, 0),
+                    (1, "c", 3),
+                ]
+                details = (
+                    await db.execute(select(DetectionDetail).order_by(DetectionDetail.detail_id))
+                ).scalars().all()
+                by_detection = {}
+                for detail in details:
+                    by_detection.setdefault(detail.detection_id, []).append(detail.waste_type_id)
+                assert [by_detection.get(d.detection_id, []) for d in detections] == [[1, 2], [3], [], [4, 4, 1]]
+                volumes = dict((await db.execute(select(Trashcan.trashcan_id, Trashcan.current_volume))).all())
+                assert volumes == {1: 4, 2: 2}
+                events = dict((await db.execute(select(TrashcanStats.trashcan_id, TrashcanStats.total_events))).all())
+                assert events == {1: 2, 2: 2}
+                daily = (await db.execute(select(DailyStats.detection_count))).scalars().all()
+                assert sum(daily) == 6
+
+    run(scenario)
+
+
+def test_trashcan_lock_is_taken_before_detection_insert(tmp_path):
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1, 2))
+            counter = StatementCounter(session_factory.kw["bind"])
+            async with session_factory() as db:
+                await DetectionService().save_detections(
+                    [make_payload(1, "a", [1]), make_payload(2, "b", [2])], db
+                )
+            counter.close()
+            statements = [" ".join(statement.split()) for statement in counter.statements]
+            assert statements[0].startswith("SELECT trashcan.trashcan_id")
+            assert "FROM trashcan" in statements[0]
+            first_insert = next(
+                index for index, statement in enumerate(statements) if statement.startswith("INSERT INTO detection ")
+            )
+            assert all(not statement.startswith(("INSERT", "UPDATE")) for statement in statements[:first_insert])
+
+    run(scenario)
+
+
+def test_statement_count_does_not_grow_with_batch_size(tmp_path):
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1, 2, 3))
+            counter = StatementCounter(session_factory.kw["bind"])
+            counts = []
+            async with session_factory() as db:
+                for size in (2, 20, 80):
+                    counter.reset()
+                    await DetectionService().save_detections(
+                        [make_payload(index % 3 + 1, f"{size}-{index}", [1, 2]) for index in range(size)], db
+                    )
+                    counts.append(counter.count)
+            counter.close()
+            assert len(set(counts)) == 1
+
+    run(scenario)
+
+
+def test_trashcan_without_city_accumulates_one_daily_row(tmp_path):
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1,), city=None)
+            async with session_factory() as db:
+                service = DetectionService()
+                await service.save_detections([make_payload(1, "a", [1, 1])], db)
+                await service.save_detections([make_payload(1, "b", [1])], db)
+                rows = (await db.execute(select(DailyStats.trashcan_city, DailyStats.detection_count))).all()
+            assert [tuple(row) for row in rows] == [("", 3)]
+
+    run(scenario)
+
+
+def test_batch_upload_inserts_all_frames_in_one_statement(tmp_path):
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1, 2))
+            items = [
+                {
+                    "data": {
+                        "camera_id": index % 2 + 1,
+                        "frame_id": f"f-{index}",
+                        "detections": [{"class_id": 0, "bbox": [0, 0, 1, 1], "score": 0.9}],
+                    },
+                    "filename": None,
+                    "saved_path": None,
+                    "received_at": datetime(2026, 10, 1, 12, 0),
+                }
+                for index in range(30)
+            ]
+            items.append({"data": {"camera_id": 99, "frame_id": "x"}, "filename": None, "saved_path": None})
+            counter = StatementCounter(session_factory.kw["bind"])
+            async with session_factory() as db:
+                results = await DetectionService().save_detection_batch_results(items, db)
+                count = (await db.execute(select(func.count()).select_from(Detection))).scalar_one()
+            counter.close()
+            assert [result["status"] for result in results] == ["saved"] * 30 + ["unknown_trashcan"]
+            assert count == 30
+            inserts = [statement for statement in counter.statements if statement.startswith("INSERT INTO detection ")]
+            assert len(inserts) == 1
+
+    run(scenario)
+
+
+def test_duplicate_submissions_are_idempotent(tmp_path):
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1,))
+            service = DetectionService()
+            async with session_factory() as db:
+                assert await service.save_detections([make_payload(1, "a", [1, 2])], db) == [True]
+                # 같은 묶음 안의 재전송
+                assert await service.save_detections(
+                    [make_payload(1, "b", [1]), make_payload(1, "b", [1])], db
+                ) == [True, False]
+                # LRU가 비워진 뒤(재시작 등) 다시 온 재전송은 DB에서 걸러짐
+                recent_frames._keys.clear()
+                assert await service.save_detections(
+                    [make_payload(1, "a", [1, 2]), make_payload(1, "c", [3])], db
+                ) == [False, True]
+                count = (await db.execute(select(func.count()).select_from(Detection))).scalar_one()
+                volume = (await db.execute(select(Trashcan.current_volume))).scalar_one()
+                events = (await db.execute(select(TrashcanStats.total_events))).scalar_one()
+            assert (count, volume, events) == (3, 4, 3)
+
+    run(scenario)
+
+
+def test_duplicate_that_races_past_the_check_is_skipped(tmp_path):
+    # 중복 확인 이후 같은 frame이 저장된 경우: INSERT의 ON DUPLICATE KEY UPDATE로 넘어가고 저장되지 않은 것으로 반환
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1,))
+            engine = session_factory.kw["bind"].sync_engine
+
+            def insert_racing_row(conn, cursor, statement, parameters, context, executemany):
+                if statement.startswith("SELECT max(detection.detection_id)"):
+                    cursor.execute("INSERT INTO detection (trashcan_id, frame_id, object_count) VALUES (1, 'race', 0)")
+
+            event.listen(engine, "before_cursor_execute", insert_racing_row)
+            async with session_factory() as db:
+                applied = await DetectionService().save_detections(
+                    [make_payload(1, "x", [1]), make_payload(1, "race", [2]), make_payload(1, None, [3])], db
+                )
+                event.remove(engine, "before_cursor_execute", insert_racing_row)
+                rows = (
+                    await db.execute(select(Detection.frame_id, Detection.object_count).order_by(Detection.detection_id))
+                ).all()
+                details = (
+                    await db.execute(
+                        select(Detection.frame_id, DetectionDetail.waste_type_id)
+                        .join(Detection, Detection.detection_id == DetectionDetail.detection_id)
+                        .order_by(DetectionDetail.detail_id)
+                    )
+                ).all()
+                volume = (await db.execute(select(Trashcan.current_volume))).scalar_one()
+            assert applied == [True, False, True]
+            assert [tuple(row) for row in rows] == [("race", 0), ("x", 1), (None, 1)]
+            assert [tuple(row) for row in details] == [("x", 1), (None, 3)]
+            assert volume == 2
+
+    run(scenario)
+
+
+
+def test_single_frame_skips_read_back_and_detects_raced_duplicate(tmp_path):
+    # 단건은 INSERT 결과의 id로 판단, 중복 확인 이후 저장된 같은 frame은 저장되지 않은 것으로 반환
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1,))
+            engine = session_factory.kw["bind"]
+            counter = StatementCounter(engine)
+            async with session_factory() as db:
+                assert await DetectionService().save_detections([make_payload(1, "a", [1])], db) == [True]
+            assert counter.count == 9
+
+            def insert_racing_row(conn, cursor, statement, parameters, context, executemany):
+                if statement.startswith("SELECT max(detection.detection_id)"):
+                    cursor.execute("INSERT INTO detection (trashcan_id, frame_id, object_count) VALUES (1, 'race', 0)")
+
+            event.listen(engine.sync_engine, "before_cursor_execute", insert_racing_row)
+            async with session_factory() as db:
+                applied = await DetectionService().save_detections([make_payload(1, "race", [2])], db)
+                event.remove(engine.sync_engine, "before_cursor_execute", insert_racing_row)
+                rows = (
+                    await db.execute(select(Detection.frame_id, Detection.object_count).order_by(Detection.detection_id))
+                ).all()
+                volume = (await db.execute(select(Trashcan.current_volume))).scalar_one()
+            assert applied == [False]
+            assert [tuple(row) for row in rows] == [("a", 1), ("race", 0)]
+            assert volume == 1
+
+    run(scenario)
+
+
+def test_events_skip_trashcan_whose_frames_were_all_duplicates(tmp_path):
+    # 구독자가 있을 때, 묶음 안에서 프레임이 모두 중복인 쓰레기통은 이벤트 없이 넘어감
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1, 2))
+            async with session_factory() as db:
+                await DetectionService().save_detections([make_payload(1, "a", [1])], db)
+            # 수신 캐시가 아닌 DB에서 중복을 찾도록 비움
+            recent_frames._keys.clear()
+            subscriber = event_bus.subscribe({"detection"})
+            try:
+                async with session_factory() as db:
+                    applied = await DetectionService().save_detections(
+                        [make_payload(1, "a", [1]), make_payload(2, "b", [2])], db
+                    )
+            finally:
+                event_bus.unsubscribe(subscriber)
+            assert applied == [False, True]
+            events = []
+            while not subscriber.queue.empty():
+                events.append(subscriber.queue.get_nowait())
+            assert [(event["data"]["trashcan_id"], event["data"]["events"]) for event in events] == [(2, 1)]
+
+    run(scenario)
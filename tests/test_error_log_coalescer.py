@@ -0,0 +1,104 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from tests.sqlite_compat import seed, sqlite_database
+
+import service.error_log_coalescer as coalescer_module
+from db.entity import TrashcanErrorLog
+from service.error_log_coalescer import ErrorLogCoalescer
+
+
+def occurred(minutes: int) -> str:
+    return (datetime(2026, 10, 1, 12, 0) + timedelta(minutes=minutes)).isoformat()
+
+
+async def error_logs(session_factory) -> list[tuple[int, int]]:
+    async with session_factory() as db:
+        rows = await db.execute(
+            select(TrashcanErrorLog.trashcan_id, TrashcanErrorLog.repeat_count).order_by(TrashcanErrorLog.id)
+        )
+        return [tuple(row) for row in rows]
+
+
+def block_lookup(coalescer: ErrorLogCoalescer) -> tuple[asyncio.Event, asyncio.Event]:
+    # flush가 첫 DB 조회 중에 멈추도록 해서 그 사이의 동시 호출/취소를 재현
+    started, release = asyncio.Event(), asyncio.Event()
+    original = coalescer._continuable_row_id
+
+    async def blocked(entry, db):
+        started.set()
+        await release.wait()
+        return await original(entry, db)
+
+    coalescer._continuable_row_id = blocked
+    return started, release
+
+
+def test_concurrent_flushes_write_each_entry_once(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1,))
+            coalescer = ErrorLogCoalescer(interval=0)
+            coalescer.record(1, 1, 500, "boom", occurred(0))
+            coalescer.record(1, 1, 500, "boom", occurred(0))
+
+            async with session_factory() as first, session_factory() as second:
+                await asyncio.gather(coalescer.flush(first), coalescer.flush(second))
+
+            assert await error_logs(session_factory) == [(1, 2)]
+            assert coalescer.inserted == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_flush_keeps_closed_entries(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1,))
+            coalescer = ErrorLogCoalescer(interval=0)
+            coalescer.record(1, 1, 500, "boom", occurred(0))
+            # 1분 구간을 벗어난 반복으로 앞 구간이 closed로 넘어감
+            coalescer.record(1, 1, 500, "boom", occurred(5))
+            started, release = block_lookup(coalescer)
+
+            async with session_factory() as db:
+                flush = asyncio.create_task(coalescer.flush(db))
+                await started.wait()
+                flush.cancel()
+                await asyncio.gather(flush, return_exceptions=True)
+
+            assert len(coalescer._closed) == 1
+            release.set()
+            async with session_factory() as db:
+                await coalescer.flush(db)
+            assert await error_logs(session_factory) == [(1, 1), (1, 1)]
+
+    asyncio.run(scenario())
+
+
+def test_stop_waits_for_in_progress_flush(tmp_path, monkeypatch):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1,))
+            monkeypatch.setattr(coalescer_module, "async_session_factory", session_factory)
+            coalescer = ErrorLogCoalescer(interval=0.01)
+            coalescer.record(1, 1, 500, "boom", occurred(0))
+            coalescer.record(1, 1, 500, "boom", occurred(5))
+            started, release = block_lookup(coalescer)
+            await coalescer.start()
+            await started.wait()
+
+            stop = asyncio.create_task(coalescer.stop())
+            await asyncio.sleep(0.05)
+            # 저장 중인 flush를 끊지 않고 기다림
+            assert not stop.done()
+            release.set()
+            await stop
+
+            assert not coalescer.enabled
+            assert coalescer.inserted == 2
+            assert await error_logs(session_factory) == [(1, 1), (1, 1)]
+
+    asyncio.run(scenario())
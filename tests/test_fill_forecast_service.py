@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from tests.sqlite_compat import seed, sqlite_database
+from tests.test_detections_service import make_payload, run
+
+from service.detections_service import DetectionService
+from service.fill_forecast_service import FillForecaster
+
+
+def test_reload_buckets_detections_in_window(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1, 2, 3))
+            now = datetime.now()
+            # (쓰레기통, 몇 시간 전, 객체 수), 창(14일) 밖의 탐지는 제외
+            frames = [(1, 0, 3), (1, 5, 2), (2, 30, 4), (1, 400, 9)]
+            payloads = []
+            for index, (trashcan_id, hours, count) in enumerate(frames):
+                payload = make_payload(trashcan_id, f"frame-{index}", [1] * count)
+                payload.detected_at = now - timedelta(hours=hours)
+                payloads.append(payload)
+            async with session_factory() as db:
+                await DetectionService().save_detections(payloads, db)
+                forecaster = FillForecaster(window_days=14, bucket_minutes=60)
+                await forecaster.reload(db)
+
+            counts = forecaster._counts
+            rows = forecaster._rows
+            assert set(rows) == {1, 2, 3}
+            assert counts.shape == (3, 14 * 24)
+            assert counts[rows[1]].sum() == 5 and counts[rows[1], -1] == 3 and counts[rows[1], -6] == 2
+            assert counts[rows[2]].sum() == 4 and counts[rows[2], -31] == 4
+            assert counts[rows[3]].sum() == 0
+            rates = forecaster.rates_per_hour()
+            assert rates[1] > 0 and rates[3] == 0
+
+    run(scenario)
@@ -0,0 +1,58 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from tests.sqlite_compat import seed, sqlite_database
+from tests.test_detections_service import run
+
+import routers.detections_router as detections_router
+from service.detection_ingest_queue import DetectionIngestQueue
+
+
+def test_failed_batch_is_counted_as_dropped():
+    async def scenario():
+        queue = DetectionIngestQueue(enabled=True)
+
+        async def broken_batch(items, db):
+            raise RuntimeError("db down")
+
+        queue._service.save_detection_batch = broken_batch
+        await queue._flush([{"data": {}}, {"data": {}}])
+        stats = queue.stats()
+        assert (stats["failed_batches"], stats["dropped"], stats["failed"], stats["saved"]) == (1, 2, 2, 0)
+
+    asyncio.run(scenario())
+
+
+def test_queue_mode_rejects_unknown_camera_before_saving_image(tmp_path, monkeypatch):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1,))
+            queue = DetectionIngestQueue(enabled=True)
+            queue._queue = asyncio.Queue()
+            monkeypatch.setattr(detections_router, "ingest_queue", queue)
+            saved = []
+
+            async def save(file, trashcan_id, captured_at=None):
+                saved.append(trashcan_id)
+                return SimpleNamespace(path=f"img/{trashcan_id}.jpg")
+
+            monkeypatch.setattr(detections_router.image_storage, "save", save)
+            upload = SimpleNamespace(filename="frame.jpg")
+            async with session_factory() as db:
+                with pytest.raises(HTTPException) as exc_info:
+                    await detections_router.receive_detection(
+                        db, upload, json.dumps({"camera_id": 99, "frame_id": "x"})
+                    )
+                assert exc_info.value.status_code == 400
+                assert saved == []
+                assert queue.enqueued == 0
+
+                await detections_router.receive_detection(db, upload, json.dumps({"camera_id": 1, "frame_id": "y"}))
+                assert saved == [1]
+                assert queue.enqueued == 1
+
+    run(scenario)
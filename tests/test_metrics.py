@@ -0,0 +1,35 @@
+import asyncio
+
+import tests.sqlite_compat  # noqa: F401
+
+from routers.metrics_router import get_metrics
+
+
+def _types(body: str) -> dict[str, str]:
+    return {
+        line.split()[2]: line.split()[3]
+        for line in body.splitlines()
+        if line.startswith("# TYPE ")
+    }
+
+
+def test_cumulative_metrics_are_counters_with_total_suffix():
+    response = asyncio.run(get_metrics())
+    types = _types(response.body.decode())
+    for name, metric_type in types.items():
+        if metric_type == "counter":
+            assert name.endswith("_total"), name
+    for name in (
+        "db_pool_checkouts_total",
+        "db_pool_timeouts_total",
+        "ingest_queue_rejected_total",
+        "ingest_queue_failed_total",
+        "ingest_queue_failed_batches_total",
+        "ingest_queue_dropped_total",
+        "event_dropped_subscribers_total",
+    ):
+        assert types[name] == "counter"
+    for name in ("db_pool_checked_out", "ingest_queue_depth", "event_subscribers"):
+        assert types[name] == "gauge"
+    assert "db_pool_checkouts" not in types
+    assert "ingest_queue_rejected" not in types
@@ -0,0 +1,94 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import select, text
+
+from tests.sqlite_compat import create_schema, create_test_engine
+
+from db import migrations
+from db.entity import DailyStats, WasteType
+
+
+def test_migrations_apply_once_on_fresh_schema(tmp_path):
+    async def scenario():
+        engine = create_test_engine(str(tmp_path / "db.sqlite"))
+        try:
+            await create_schema(engine)
+            applied = await migrations.run_migrations(engine)
+            assert applied == [version for version, _, _ in migrations.MIGRATIONS]
+            assert await migrations.run_migrations(engine) == []
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_each_migration_is_recorded_in_its_own_transaction(tmp_path, monkeypatch):
+    def fail(conn):
+        raise RuntimeError("boom")
+
+    async def scenario():
+        engine = create_test_engine(str(tmp_path / "db.sqlite"))
+        try:
+            await create_schema(engine)
+            monkeypatch.setattr(
+                migrations,
+                "MIGRATIONS",
+                [migrations.MIGRATIONS[0], (99, "failing", fail), migrations.MIGRATIONS[1]],
+            )
+            with pytest.raises(RuntimeError):
+                await migrations.run_migrations(engine)
+            async with engine.connect() as conn:
+                recorded = (await conn.execute(select(migrations.schema_migrations.c.version))).scalars().all()
+            assert recorded == [1]
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_dailystats_null_city_rows_are_merged(tmp_path):
+    async def scenario():
+        engine = create_test_engine(str(tmp_path / "db.sqlite"))
+        try:
+            await create_schema(engine)
+            async with engine.begin() as conn:
+                # 이전 스키마: trashcan_city NULL 허용 (NULL끼리는 유니크 키에 걸리지 않음)
+                await conn.execute(text("DROP TABLE dailystats"))
+                await conn.execute(text("""
+                    CREATE TABLE dailystats (
+                        stats_id INTEGER PRIMARY KEY,
+                        stats_date DATE NOT NULL,
+                        trashcan_city VARCHAR(255),
+                        waste_type_id INTEGER NOT NULL,
+                        detection_count INTEGER,
+                        CONSTRAINT uq_dailystats_date_city_type UNIQUE (stats_date, trashcan_city, waste_type_id)
+                    )
+                """))
+                await conn.execute(WasteType.__table__.insert().values(waste_type_id=1, type_name="PetBottle", class_id=1))
+                await conn.execute(
+                    text(
+                        "INSERT INTO dailystats (stats_date, trashcan_city, waste_type_id, detection_count) VALUES "
+                        "('2026-10-01', NULL, 1, 3), ('2026-10-01', NULL, 1, 2), ('2026-10-01', '', 1, 4), "
+                        "('2026-10-01', 'Seoul', 1, 7), ('2026-10-02', NULL, 1, 1)"
+                    )
+                )
+            async with engine.begin() as conn:
+                await conn.run_sync(migrations._dailystats_city_not_null)
+            async with engine.connect() as conn:
+                rows = (
+                    await conn.execute(
+                        select(DailyStats.stats_date, DailyStats.trashcan_city, DailyStats.detection_count)
+                        .order_by(DailyStats.stats_date, DailyStats.trashcan_city)
+                    )
+                ).all()
+            assert [tuple(row) for row in rows] == [
+                (date(2026, 10, 1), "", 9),
+                (date(2026, 10, 1), "Seoul", 7),
+                (date(2026, 10, 2), "", 1),
+            ]
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from tests.sqlite_compat import seed, sqlite_database
+
+from db.entity import Trashcan
+from service.pagination import decode_cursor, encode_cursor, keyset_after
+from service.trashcan_list_service import TrashcanList
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-base64!",
+        encode_cursor([1]),
+        encode_cursor([1, 2, 3]),
+        encode_cursor(["10", 2]),
+        encode_cursor([True, 2]),
+        encode_cursor([1.5, 2]),
+        encode_cursor([{"x": 1}, 2]),
+        encode_cursor([1, None]),
+    ],
+)
+def test_decode_cursor_rejects_malformed_values(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor, (int, int))
+    assert exc_info.value.status_code == 400
+
+
+def test_keyset_after_checks_against_sort_column():
+    with pytest.raises(HTTPException) as exc_info:
+        keyset_after(Trashcan.trashcan_capacity, Trashcan.trashcan_id, "desc", ["full", 3])
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException):
+        keyset_after(Trashcan.trashcan_capacity, Trashcan.trashcan_id, "desc", [1])
+    keyset_after(Trashcan.trashcan_capacity, Trashcan.trashcan_id, "desc", [10, 3])
+
+
+def test_sorted_list_cursor_walks_every_row_once(tmp_path):
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, range(1, 26))
+            service = TrashcanList()
+            async with session_factory() as db:
+                seen = []
+                cursor = None
+                while True:
+                    page = await service.sort_trashcans_list(
+                        db, "free_capacity", "asc", None, None, 0, 7, cursor, False
+                    )
+                    seen += [item["trashcan_id"] for item in page["items"]]
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+                assert seen == list(range(1, 26))
+                with pytest.raises(HTTPException):
+                    await service.sort_trashcans_list(
+                        db, "free_capacity", "asc", None, None, 0, 7, encode_cursor(["x", 1]), False
+                    )
+
+    asyncio.run(scenario())
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import re
+from datetime import datetime, timedelta
+
+import pytest
+import sqlalchemy
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
+
+from tests.sqlite_compat import create_session_factory, seed, sqlite_database
+from tests.test_detections_service import make_payload
+
+from models.request import CollectionEventCreate
+from service.collection_service import CollectionService
+from service.dashboard_service import DashboardService
+from service.detections_service import DetectionService
+from service.error_log_coalescer import ErrorLogCoalescer
+from service.frame_dedup import recent_frames
+from service.retention_service import RetentionService
+from service.trashcan_detail_service import TrashcanDetail
+from service.trashcan_list_service import TrashcanList
+from service.trashcan_status_utils import mark_offline_if_stale
+
+# 행 수가 계속 늘어나는 테이블, 이 테이블을 인덱스 없이 전체 스캔하는 조회는 회귀로 봄
+GROWING_TABLES = ("detection", "detection_detail", "trashcan_error_log", "collection_event")
+FULL_SCAN = re.compile(rf"^SCAN ({'|'.join(GROWING_TABLES)})(?: AS \w+)?$")
+
+
+async def hot_path_statements(session_factory, tmp_path) -> list[tuple[str, tuple]]:
+    # 주요 서비스 조회를 실행하며 실제로 나간 SQL과 파라미터를 모음
+    recent_frames._keys.clear()
+    await seed(session_factory, (1, 2, 3))
+    engine = session_factory.kw["bind"].sync_engine
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            captured.append((statement, parameters))
+
+    sqlalchemy.event.listen(engine, "before_cursor_execute", capture)
+    async with session_factory() as db:
+        detections = DetectionService()
+        await detections.save_detections([make_payload(1, "a", [1, 2])], db)
+        await detections.save_detections([make_payload(index % 3 + 1, f"b-{index}", [1, 3]) for index in range(5)], db)
+        coalescer = ErrorLogCoalescer(interval=0)
+        coalescer.record(1, 1, 500, "boom", None)
+        await coalescer.flush(db)
+        coalescer.record(1, 1, 500, "boom", None)
+        await coalescer.flush(db)
+
+        dashboard = DashboardService()
+        await dashboard.get_total_detection(db)
+        await dashboard.get_stats_charts(db, "week")
+        await dashboard.get_stats_series(db, "month", None, True)
+        await dashboard.get_unconnected_trashcans_list(db)
+        await dashboard.get_trashcan_error_logs(1, 20, db)
+
+        detail = TrashcanDetail()
+        await detail.get_trashcans_detail(1, db)
+        await detail.get_waste_detail(1, db, None, 10, None, None, None)
+        # 커서 다음 페이지(행/blob 조회 모두)도 확인
+        page = await detail.get_waste_detail(1, db, "MetalCan", 1, None, None, None)
+        await detail.get_waste_detail(1, db, "MetalCan", 1, page["next_cursors"]["MetalCan"], None, None)
+
+        listing = TrashcanList()
+        await listing.get_trashcans_list(db, 0, 10, None, True)
+        await listing.sort_trashcans_list(db, "collected", "desc", "Seoul", None, 0, 10, None, True)
+
+        collections = CollectionService()
+        await collections.record_collection(1, CollectionEventCreate(), db)
+        await collections.get_collection_events(1, db, 10, None)
+
+        await mark_offline_if_stale(db, 5)
+        retention = RetentionService(archive=None, pause=0)
+        retention.archive.root = tmp_path / "archive"
+        await retention._archive_detection_batch(db, datetime.now() + timedelta(days=1))
+        await retention._archive_error_log_batch(db, datetime.now() - timedelta(days=1))
+    sqlalchemy.event.remove(engine, "before_cursor_execute", capture)
+    return [
+        (statement, parameters)
+        for statement, parameters in captured
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH"))
+    ]
+
+
+def test_hot_path_queries_use_indexes(tmp_path):
+    async def scenario():
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            statements = await hot_path_statements(session_factory, tmp_path)
+            assert len(statements) > 20
+            full_scans = []
+            async with session_factory.kw["bind"].connect() as conn:
+                for statement, parameters in statements:
+                    plan = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+                    for row in plan:
+                        if FULL_SCAN.match(row[-1]):
+                            full_scans.append((row[-1], " ".join(statement.split())))
+            assert full_scans == []
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.skipif(not os.getenv("EXPLAIN_DATABASE_URL"), reason="EXPLAIN_DATABASE_URL not set")
+def test_hot_path_queries_use_indexes_on_mysql(tmp_path):
+    # 비어 있는 검증용 MySQL DB에서 같은 시나리오를 실행하고 EXPLAIN 확인 (테이블을 지우고 다시 만듦)
+    # 행이 적으면 옵티마이저가 전체 스캔을 고를 수 있으므로, 쓸 수 있는 인덱스가 아예 없는 경우(possible_keys 없음)만 실패로 봄
+    async def scenario():
+        import db.entity  # noqa: F401
+
+        engine = create_async_engine(os.environ["EXPLAIN_DATABASE_URL"])
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(SQLModel.metadata.drop_all)
+                await conn.run_sync(SQLModel.metadata.create_all)
+            statements = await hot_path_statements(create_session_factory(engine), tmp_path)
+            full_scans = []
+            async with engine.connect() as conn:
+                for statement, parameters in statements:
+                    plan = (await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)).mappings().all()
+                    for row in plan:
+                        if row["table"] in GROWING_TABLES and row["type"] == "ALL" and not row["possible_keys"]:
+                            full_scans.append((row["table"], " ".join(statement.split())))
+        finally:
+            await engine.dispose()
+        assert full_scans == []
+
+    asyncio.run(scenario())
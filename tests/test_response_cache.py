@@ -0,0 +1,139 @@
+import asyncio
+
+from tests.sqlite_compat import seed, sqlite_database
+from tests.test_detections_service import make_payload
+
+import service.detections_service as detections_module
+from service.dashboard_service import DashboardService
+from service.detections_service import DetectionService
+from service.frame_dedup import recent_frames
+from service.response_cache import MemoryCacheBackend, ResponseCache
+
+
+def test_dashboard_cache_keeps_hitting_while_detections_arrive(tmp_path, monkeypatch):
+    async def scenario():
+        recent_frames._keys.clear()
+        # 저장마다 무효화를 요청하지만 예약 간격 안의 요청은 한 번으로 묶임
+        cache = ResponseCache(MemoryCacheBackend(), ttl=60, invalidate_delay=30)
+        monkeypatch.setattr(detections_module, "dashboard_cache", cache)
+        async with sqlite_database(str(tmp_path / "db.sqlite")) as session_factory:
+            await seed(session_factory, (1, 2))
+            dashboard = DashboardService()
+            loads = 0
+
+            async def load_detections(db):
+                nonlocal loads
+                loads += 1
+                return await dashboard.get_total_detection(db)
+
+            async def writer():
+                async with session_factory() as db:
+                    for index in range(100):
+                        await DetectionService().save_detections([make_payload(index % 2 + 1, f"w-{index}", [1, 2])], db)
+                        await asyncio.sleep(0)
+
+            async def reader():
+                async with session_factory() as db:
+                    for _ in range(100):
+                        await cache.get_or_load("dashboard:detections", lambda: load_detections(db))
+                        await asyncio.sleep(0)
+
+            await asyncio.gather(writer(), reader(), reader())
+
+        stats = cache.stats()
+        assert loads == 1
+        assert stats["hits"] + stats["coalesced"] == 199
+        assert stats["invalidations"] == 0
+        assert stats["pending_invalidations"] == 1
+        # 예약된 무효화가 실행되면 다음 조회는 새로 읽음
+        cache._pending["dashboard:"].cancel()
+        cache._pending.clear()
+        await cache.invalidate("dashboard:")
+        assert await cache.get_or_load("dashboard:detections", lambda: asyncio.sleep(0, "fresh")) == "fresh"
+
+    asyncio.run(scenario())
+
+
+def test_ingest_invalidation_is_coalesced_and_delayed():
+    async def scenario():
+        cache = ResponseCache(MemoryCacheBackend(), ttl=60, invalidate_delay=0.05)
+        await cache.get_or_load("dashboard:detections", lambda: asyncio.sleep(0, "old"))
+        for _ in range(50):
+            cache.invalidate_later("dashboard:")
+        assert cache.stats()["pending_invalidations"] == 1
+        assert await cache.get_or_load("dashboard:detections", lambda: asyncio.sleep(0, "new")) == "old"
+
+        await asyncio.sleep(0.1)
+        assert cache.stats()["invalidations"] == 1
+        assert cache.stats()["pending_invalidations"] == 0
+        assert await cache.get_or_load("dashboard:detections", lambda: asyncio.sleep(0, "new")) == "new"
+
+        # TTL이 더 짧으면 TTL 만료에 맡김
+        short = ResponseCache(MemoryCacheBackend(), ttl=0.5, invalidate_delay=1)
+        short.invalidate_later("dashboard:")
+        assert short.stats()["pending_invalidations"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiters_reload_when_first_request_is_cancelled():
+    async def scenario():
+        cache = ResponseCache(MemoryCacheBackend(), ttl=60)
+        started = asyncio.Event()
+        loads = []
+
+        async def load(value):
+            loads.append(value)
+            started.set()
+            if value == "first":
+                await asyncio.Event().wait()
+            return value
+
+        first = asyncio.create_task(cache.get_or_load("dashboard:detections", lambda: load("first")))
+        await started.wait()
+        waiters = [
+            asyncio.create_task(cache.get_or_load("dashboard:detections", lambda: load("retry")))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await asyncio.gather(*waiters) == ["retry"] * 3
+        assert first.cancelled()
+        # 기다리던 요청 중 하나만 다시 조회하고 나머지는 그 결과를 함께 사용
+        assert loads == ["first", "retry"]
+        stats = cache.stats()
+        assert (stats["misses"], stats["hits"] + stats["coalesced"]) == (2, 2)
+
+    asyncio.run(scenario())
+
+
+def test_invalidating_one_prefix_does_not_block_other_keys():
+    async def scenario():
+        cache = ResponseCache(MemoryCacheBackend(), ttl=60)
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_load(value):
+            started.set()
+            await release.wait()
+            return value
+
+        # 다른 prefix 무효화: 조회 결과 저장
+        load = asyncio.create_task(cache.get_or_load("dashboard:detections", lambda: slow_load("a")))
+        await started.wait()
+        await cache.invalidate("dashboard:trashcans_full")
+        release.set()
+        assert await load == "a"
+        assert await cache.get_or_load("dashboard:detections", lambda: slow_load("b")) == "a"
+
+        # 같은 prefix 무효화: 오래된 조회 결과는 저장하지 않음
+        started.clear()
+        release.clear()
+        load = asyncio.create_task(cache.get_or_load("dashboard:charts:week", lambda: slow_load("old")))
+        await started.wait()
+        await cache.invalidate("dashboard:")
+        release.set()
+        assert await load == "old"
+        assert await cache.get_or_load("dashboard:charts:week", lambda: slow_load("new")) == "new"
+
+    asyncio.run(scenario())
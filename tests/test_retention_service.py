@@ -0,0 +1,73 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from tests.sqlite_compat import seed, sqlite_database
+from tests.test_detections_service import make_payload, run
+
+import service.retention_service as retention_module
+from db.entity import Detection
+from service.detections_service import DetectionService
+from service.retention_service import NdjsonArchive, RetentionService
+
+
+def test_manual_run_starts_in_background_and_reports_progress(tmp_path, monkeypatch):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1,))
+            monkeypatch.setattr(retention_module, "async_session_factory", session_factory)
+            payloads = [make_payload(1, f"old-{index}", [1]) for index in range(3)]
+            for index, payload in enumerate(payloads):
+                payload.detected_at = datetime(2020, 1, 1, 12, index)
+            async with session_factory() as db:
+                await DetectionService().save_detections(payloads, db)
+
+            retention = RetentionService(batch_size=1, pause=0.05, archive=NdjsonArchive(tmp_path / "archive"))
+            assert await retention.start_run()
+            # 실행 중에는 다시 시작하지 않음
+            assert not await retention.start_run()
+            assert (await retention.run())["skipped"]
+
+            while retention.progress is None or retention.progress["batches"] == 0:
+                await asyncio.sleep(0.01)
+            stats = retention.stats()
+            assert stats["in_progress"]
+            assert stats["progress"]["phase"] == "detection"
+            assert stats["progress"]["detections"] >= 1
+
+            await retention._manual
+            stats = retention.stats()
+            assert not stats["in_progress"]
+            assert stats["progress"] is None
+            assert stats["last_error"] is None
+            assert stats["last_result"]["detections"] == 3
+            async with session_factory() as db:
+                assert (await db.execute(select(func.count()).select_from(Detection))).scalar_one() == 0
+
+    run(scenario)
+
+
+def test_stop_cancels_manual_run(tmp_path, monkeypatch):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1,))
+            monkeypatch.setattr(retention_module, "async_session_factory", session_factory)
+            async with session_factory() as db:
+                payloads = [make_payload(1, f"old-{index}", [1]) for index in range(3)]
+                for payload in payloads:
+                    payload.detected_at = datetime(2020, 1, 1)
+                await DetectionService().save_detections(payloads, db)
+
+            retention = RetentionService(batch_size=1, pause=10, archive=NdjsonArchive(tmp_path / "archive"))
+            assert await retention.start_run()
+            while retention.progress is None or retention.progress["batches"] == 0:
+                await asyncio.sleep(0.01)
+            await retention.stop()
+            assert not retention.in_progress
+            assert retention.progress is None
+            async with session_factory() as db:
+                # 끝난 배치만 지워지고 나머지는 다음 실행에서 처리
+                assert (await db.execute(select(func.count()).select_from(Detection))).scalar_one() == 2
+
+    run(scenario)
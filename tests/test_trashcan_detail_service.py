@@ -0,0 +1,129 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from tests.sqlite_compat import seed, sqlite_database
+from tests.test_detections_service import make_payload, run
+
+import service.detections_service as detections_module
+import service.trashcan_detail_service as detail_module
+from db.entity import Detection, DetectionDetail
+from service.detections_service import DetectionService
+from service.frame_dedup import recent_frames
+from service.trashcan_detail_service import TrashcanDetail
+
+# 프레임별 객체 종류(waste_type_id), 같은 프레임 안에 같은 종류가 여러 개인 경우 포함
+FRAMES = [[1, 2, 1], [3], [2, 2, 4, 1], [], [1], [4, 4], [2, 1, 3]]
+
+
+async def waste_detail_outputs(tmp_path, monkeypatch, mode: str) -> dict:
+    monkeypatch.setattr(detections_module, "DETECTION_STORAGE_MODE", mode)
+    # 두 모드가 같은 frame_id를 쓰므로 수신 중복 캐시를 비움
+    recent_frames._keys.clear()
+    async with sqlite_database(tmp_path / f"{mode}.db") as session_factory:
+        monkeypatch.setattr(detail_module, "async_session_factory", session_factory)
+        await seed(session_factory, (1, 2))
+        async with session_factory() as db:
+            await DetectionService().save_detections(
+                [make_payload(1, f"frame-{index}", waste_type_ids) for index, waste_type_ids in enumerate(FRAMES)]
+                + [make_payload(2, "other", [1, 2])],
+                db,
+            )
+            blobs = (
+                await db.execute(select(func.count()).select_from(Detection).where(Detection.objects_blob.is_not(None)))
+            ).scalar_one()
+            details = (await db.execute(select(func.count()).select_from(DetectionDetail))).scalar_one()
+
+            service = TrashcanDetail()
+            first_page = await service.get_waste_detail(1, db, None, 100)
+            # 종류 하나를 limit 2로 끝까지 따라감
+            pages = []
+            cursor = None
+            while True:
+                page = await service.get_waste_detail(1, db, "MetalCan", 2, cursor)
+                pages.append(page["items_by_type"]["MetalCan"])
+                cursor = page["next_cursors"]["MetalCan"]
+                if cursor is None:
+                    break
+
+        streamed = [json.loads(line) async for line in service.stream_waste_detail(1, None, None, None)]
+        streamed_type = [json.loads(line) async for line in service.stream_waste_detail(1, 2, None, None)]
+    return {
+        "storage": (blobs, details),
+        "all_types": first_page["items_by_type"],
+        "pages": pages,
+        "stream": streamed,
+        "stream_type": streamed_type,
+    }
+
+
+def test_waste_detail_is_the_same_for_rows_and_packed_storage(tmp_path, monkeypatch):
+    async def scenario():
+        rows = await waste_detail_outputs(tmp_path, monkeypatch, "rows")
+        packed = await waste_detail_outputs(tmp_path, monkeypatch, "packed")
+
+        object_count = sum(len(waste_type_ids) for waste_type_ids in FRAMES) + 2
+        assert rows.pop("storage") == (0, object_count)
+        # 객체가 없는 프레임은 blob 없이 저장
+        packed_frames = sum(1 for waste_type_ids in FRAMES if waste_type_ids) + 1
+        assert packed.pop("storage") == (packed_frames, 0)
+        assert packed == rows
+
+        assert [len(rows["all_types"][name]) for name in ("MetalCan", "PetBottle", "Plastic", "Styrofoam")] == [5, 4, 2, 3]
+        # 최신 detection부터, 같은 detection 안의 같은 종류 객체는 객체 수만큼
+        assert [[item["detection_id"] for item in page] for page in rows["pages"]] == [[7, 5], [3, 1], [1]]
+        assert len(rows["stream"]) == object_count - 2
+        assert [item["detection_id"] for item in rows["stream_type"]] == [7, 3, 3, 1]
+
+    run(scenario)
+
+
+def test_waste_detail_keeps_frames_saved_before_storage_mode_switch(tmp_path, monkeypatch):
+    # packed로 저장한 뒤 rows로 되돌려도 두 형식의 프레임이 최신순으로 함께 나옴
+    async def scenario():
+        async with sqlite_database(tmp_path / "mixed.db") as session_factory:
+            await seed(session_factory, (1,))
+            for mode, frames in (("packed", FRAMES[:4]), ("rows", FRAMES[4:])):
+                monkeypatch.setattr(detections_module, "DETECTION_STORAGE_MODE", mode)
+                async with session_factory() as db:
+                    await DetectionService().save_detections(
+                        [make_payload(1, f"{mode}-{index}", waste_type_ids) for index, waste_type_ids in enumerate(frames)],
+                        db,
+                    )
+
+            service = TrashcanDetail()
+            async with session_factory() as db:
+                pages = []
+                cursor = None
+                while True:
+                    page = await service.get_waste_detail(1, db, "MetalCan", 2, cursor)
+                    pages.append([item["detection_id"] for item in page["items_by_type"]["MetalCan"]])
+                    cursor = page["next_cursors"]["MetalCan"]
+                    if cursor is None:
+                        break
+            assert pages == [[7, 5], [3, 1], [1]]
+
+    run(scenario)
+
+
+def test_waste_detail_totals_follow_time_window(tmp_path):
+    async def scenario():
+        async with sqlite_database(tmp_path / "window.db") as session_factory:
+            await seed(session_factory, (1,))
+            payloads = [make_payload(1, f"day-{day}", [1] * day) for day in (1, 2, 3)]
+            for day, payload in zip((1, 2, 3), payloads):
+                payload.detected_at = datetime(2026, 10, day, 12, 0)
+            async with session_factory() as db:
+                await DetectionService().save_detections(payloads, db)
+
+                service = TrashcanDetail()
+                lifetime = await service.get_waste_detail(1, db)
+                window = await service.get_waste_detail(1, db, start=datetime(2026, 10, 2), end=datetime(2026, 10, 3))
+                empty = await service.get_waste_detail(1, db, start=datetime(2026, 11, 1))
+            assert (lifetime["total_objects"], lifetime["total_events"]) == (6, 3)
+            assert (window["total_objects"], window["total_events"]) == (2, 1)
+            assert len(window["items_by_type"]["MetalCan"]) == 2
+            assert (empty["total_objects"], empty["total_events"]) == (0, 0)
+
+    run(scenario)
@@ -0,0 +1,52 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+
+from tests.sqlite_compat import seed, sqlite_database
+from tests.test_detections_service import make_payload, run
+
+import routers.trashcan_management_router as management_router
+import service.trashcan_stats_service as stats_module
+from db.entity import TrashcanStats
+from service.detections_service import DetectionService
+from service.trashcan_stats_service import TrashcanStatsService
+
+
+def test_rebuild_runs_in_background_one_at_a_time(tmp_path, monkeypatch):
+    async def scenario():
+        async with sqlite_database(tmp_path / "app.db") as session_factory:
+            await seed(session_factory, (1, 2))
+            monkeypatch.setattr(stats_module, "async_session_factory", session_factory)
+            async with session_factory() as db:
+                await DetectionService().save_detections(
+                    [make_payload(1, "a", [1, 2]), make_payload(2, "b", [3])], db
+                )
+                await db.execute(delete(TrashcanStats))
+                await db.commit()
+
+            service = TrashcanStatsService()
+            monkeypatch.setattr(management_router, "trashcan_stats_service", service)
+            assert await management_router.rebuild_trashcan_stats() == {"started": True}
+            # 실행 중에는 다시 시작하지 않음
+            with pytest.raises(HTTPException) as exc_info:
+                await management_router.rebuild_trashcan_stats()
+            assert exc_info.value.status_code == 409
+            assert (await management_router.get_trashcan_stats_rebuild())["in_progress"]
+
+            await service._rebuild
+            status = service.rebuild_status()
+            assert not status["in_progress"]
+            assert status["last_result"] == {"rebuilt": True, "trashcans": 2}
+            assert status["last_error"] is None
+            async with session_factory() as db:
+                totals = dict(
+                    (await db.execute(select(TrashcanStats.trashcan_id, TrashcanStats.total_collected))).all()
+                )
+            assert totals == {1: 2, 2: 1}
+
+            # 끝난 뒤에는 다시 시작할 수 있음
+            assert await service.start_rebuild()
+            await service.stop()
+            assert not service.rebuild_in_progress
+
+    run(scenario)